@@ -0,0 +1,71 @@
+"""Benchmark CSV parsing per delimiter: trial parses vs. dialect sniffing
+
+Usage: python benchmarks/csv_dialect.py [rows]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.services.data_processing import DataProcessingService
+
+
+def legacy_parse(file_path: Path, encoding: str) -> pd.DataFrame:
+    """The previous strategy: one full parse per candidate delimiter"""
+    for delim in [',', ';', '\t', '|']:
+        try:
+            df = pd.read_csv(file_path, encoding=encoding, delimiter=delim, on_bad_lines='skip', low_memory=False)
+            if len(df.columns) > 1:
+                return df
+        except Exception:
+            continue
+    return df
+
+
+def write_sample(directory: Path, delimiter: str, rows: int) -> Path:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'id': np.arange(rows),
+        'amount': rng.normal(100, 15, rows).round(2),
+        'category': rng.choice(['alpha', 'beta', 'gamma'], rows),
+        'created_at': pd.date_range('2023-01-01', periods=rows, freq='min').astype(str)
+    })
+    file_path = directory / f"sample_{ord(delimiter)}.csv"
+    df.to_csv(file_path, sep=delimiter, index=False)
+    return file_path
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print(f"{'delimiter':>10} {'before (s)':>12} {'after (s)':>12} {'speedup':>8}")
+        for delimiter in [',', ';', '\t', '|']:
+            file_path = write_sample(Path(temp_dir), delimiter, rows)
+            before = best_of(lambda: legacy_parse(file_path, 'utf-8'))
+            after = best_of(lambda: pd.read_csv(
+                file_path,
+                encoding='utf-8',
+                delimiter=DataProcessingService.sniff_dialect(file_path, 'utf-8')['delimiter'],
+                on_bad_lines='skip',
+                low_memory=False
+            ))
+            print(f"{repr(delimiter):>10} {before:>12.3f} {after:>12.3f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
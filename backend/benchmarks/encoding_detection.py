@@ -0,0 +1,109 @@
+"""Benchmark encoding detection speed and accuracy over a corpus of encodings
+
+Each case is a CSV file in one encoding, once with non-ASCII text from the
+first row and once after an ASCII-only prefix larger than the old 10KB
+chardet sample. A detection counts as correct when it decodes the file to
+the original text.
+
+Usage: python benchmarks/encoding_detection.py [rows]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import chardet
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.services.data_processing import DataProcessingService
+
+VOCABULARY = {
+    'western': "José São Paulo François Zürich Renée Besançon Müller Straße café naïve Ångström Peña Ærø".split(),
+    'central': "Łódź Kraków Gdańsk Brno Plzeň Žilina Košice Győr Pécs Szczecin Wrocław Poznań".split(),
+    'cyrillic': "Москва Санкт-Петербург Новосибирск Екатеринбург Казань Челябинск Самара Омск".split(),
+    'greek': "Αθήνα Θεσσαλονίκη Πάτρα Ηράκλειο Λάρισα Βόλος Ιωάννινα Χανιά".split(),
+    'japanese': "東京 大阪 名古屋 札幌 福岡 神戸 京都 川崎 さいたま 広島".split(),
+    'chinese': "北京 上海 广州 深圳 天津 重庆 成都 武汉 杭州 南京".split()
+}
+
+CASES = [
+    ('utf-8', 'western'), ('utf-8', 'japanese'), ('utf-8-sig', 'western'), ('utf-16', 'cyrillic'),
+    ('latin-1', 'western'), ('cp1252', 'western'), ('iso-8859-2', 'central'), ('cp1250', 'central'),
+    ('cp1251', 'cyrillic'), ('koi8-r', 'cyrillic'), ('iso-8859-7', 'greek'),
+    ('shift_jis', 'japanese'), ('euc-jp', 'japanese'), ('gb2312', 'chinese')
+]
+
+# Rows of ASCII before the first non-ASCII row in the 'late' variant
+ASCII_PREFIX_ROWS = 2000
+
+
+def make_text(vocabulary: str, rows: int, ascii_rows: int) -> str:
+    rng = random.Random(0)
+    lines = ["id,name,city,amount"]
+    lines += [f"{i},item{i},ref{i},{rng.random() * 100:.2f}" for i in range(ascii_rows)]
+    words = VOCABULARY[vocabulary]
+    lines += [
+        f"{i},{rng.choice(words)},{rng.choice(words)},{rng.random() * 100:.2f}"
+        for i in range(ascii_rows, ascii_rows + rows)
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def legacy_detect(path: Path) -> str:
+    """The previous detector, chardet over the first 10,000 bytes"""
+    with open(path, 'rb') as file:
+        return chardet.detect(file.read(10000))['encoding'] or 'utf-8'
+
+
+def decodes(path: Path, encoding: str, text: str) -> bool:
+    try:
+        return path.read_bytes().decode(encoding) == text
+    except (LookupError, UnicodeDecodeError):
+        return False
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    totals = {'chardet': [0, 0.0], 'tiered': [0, 0.0]}
+    cases = 0
+
+    print(f"{'encoding':<11} {'text':<9} {'start':<6} {'chardet':>24} {'tiered':>32}")
+    with tempfile.TemporaryDirectory() as directory:
+        for encoding, vocabulary in CASES:
+            for variant, ascii_rows in (('early', 0), ('late', ASCII_PREFIX_ROWS)):
+                text = make_text(vocabulary, rows, ascii_rows)
+                path = Path(directory) / f"{encoding}_{variant}.csv"
+                path.write_bytes(text.encode(encoding))
+                cases += 1
+
+                legacy, legacy_seconds = timed(legacy_detect, path)
+                tiered, tiered_seconds = timed(DataProcessingService.detect_encoding_details, path)
+
+                legacy_ok = decodes(path, legacy, text)
+                tiered_ok = decodes(path, tiered['encoding'], text)
+                totals['chardet'][0] += legacy_ok
+                totals['chardet'][1] += legacy_seconds
+                totals['tiered'][0] += tiered_ok
+                totals['tiered'][1] += tiered_seconds
+
+                print(
+                    f"{encoding:<11} {vocabulary:<9} {variant:<6} "
+                    f"{legacy:>12} {'ok' if legacy_ok else 'BAD':>3} {legacy_seconds * 1000:>6.1f}ms "
+                    f"{tiered['encoding']:>12} {'ok' if tiered_ok else 'BAD':>3} {tiered_seconds * 1000:>6.1f}ms "
+                    f"{tiered['method']:>7.7}"
+                )
+
+    for name, (correct, seconds) in totals.items():
+        print(f"{name}: {correct}/{cases} correct, {seconds * 1000:.0f}ms total")
+
+
+if __name__ == "__main__":
+    main()
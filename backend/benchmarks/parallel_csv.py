@@ -0,0 +1,67 @@
+"""Benchmark CSV parsing throughput from 1 to N worker processes
+
+Usage: python benchmarks/parallel_csv.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.services.data_processing import DataProcessingService
+from src.services.parallel_csv import ParallelCSVParser
+from src.services.row_index import RowIndexService
+
+
+def make_csv(path: Path, rows: int) -> None:
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        'id': np.arange(rows),
+        'amount': rng.normal(100, 15, rows).round(2),
+        'quantity': rng.integers(0, 500, rows),
+        'category': rng.choice(['alpha', 'beta', 'gamma', 'delta'], rows),
+        'comment': rng.choice(['ok', 'late, "again"', 'multi\nline', ''], rows),
+        'ratio': rng.random(rows)
+    }).to_csv(path, index=False)
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'benchmark.csv'
+        make_csv(path, rows)
+        size_mb = path.stat().st_size / 1024 / 1024
+
+        scan = best_of(lambda: RowIndexService.build_index(path), repeat=1)
+        index = RowIndexService.build_index(path)
+        single = best_of(lambda: DataProcessingService.parse_csv_file(path))
+
+        print(f"{size_mb:.0f}MB, {rows} rows, {os.cpu_count()} CPUs")
+        print(f"index scan {scan:.2f}s, parse_csv_file {single:.2f}s")
+        print(f"{'workers':>8} {'seconds':>8} {'MB/s':>7} {'speedup':>8}")
+
+        baseline = None
+        workers = 1
+        while workers <= max(os.cpu_count() or 1, 2):
+            elapsed = best_of(lambda: ParallelCSVParser(workers).parse(path, index))
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>8.2f} {size_mb / elapsed:>7.1f} {baseline / elapsed:>7.1f}x")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
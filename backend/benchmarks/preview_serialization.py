@@ -0,0 +1,68 @@
+"""Benchmark preview serialization: iterrows vs. column-wise conversion
+
+Usage: python benchmarks/preview_serialization.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.services.data_processing import DataProcessingService
+
+
+def legacy_serialize(df: pd.DataFrame) -> list:
+    """The previous strategy: iterrows and a type check per cell"""
+    preview_data = []
+    for _, row in df.iterrows():
+        row_dict = {}
+        for col in df.columns:
+            row_dict[col] = DataProcessingService.convert_numpy_types(row[col])
+        preview_data.append(row_dict)
+    return preview_data
+
+
+def make_frame(rows: int, columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {}
+    for i in range(columns):
+        kind = i % 5
+        if kind == 0:
+            values = rng.integers(0, 1000, rows)
+        elif kind == 1:
+            values = rng.normal(0, 1, rows)
+            values[rng.random(rows) < 0.1] = np.nan
+        elif kind == 2:
+            values = rng.choice(['alpha', 'beta', None], rows)
+        elif kind == 3:
+            values = pd.date_range('2023-01-01', periods=rows, freq='h')
+        else:
+            values = rng.random(rows) < 0.5
+        data[f"col_{i}"] = values
+    return pd.DataFrame(data)
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    print(f"{'shape':>12} {'iterrows (s)':>13} {'records (s)':>12} {'columns (s)':>12} {'speedup':>8}")
+    for rows, columns in [(100, 500), (10_000, 50)]:
+        df = make_frame(rows, columns)
+        before = best_of(lambda: legacy_serialize(df))
+        records = best_of(lambda: DataProcessingService.serialize_dataframe(df, orient='records'))
+        column_wise = best_of(lambda: DataProcessingService.serialize_dataframe(df, orient='columns'))
+        print(f"{f'{rows}x{columns}':>12} {before:>13.3f} {records:>12.3f} {column_wise:>12.3f} {before / records:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,7 +35,22 @@ class Settings:
     
     # File Upload
     UPLOAD_DIRECTORY: str = os.getenv("UPLOAD_DIRECTORY", "uploads")
-    
+    MAX_UPLOAD_SIZE_BYTES: int = int(
+        os.getenv("MAX_UPLOAD_SIZE_BYTES", 10 * 1024 * 1024)
+    )
+
+    # Data processing
+    DATASET_CACHE_MAX_BYTES: int = int(
+        os.getenv("DATASET_CACHE_MAX_BYTES", 512 * 1024 * 1024)
+    )
+    RESULT_CACHE_MAX_BYTES: int = int(
+        os.getenv("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    )
+    PROCESSING_WORKERS: int = int(os.getenv("PROCESSING_WORKERS", 2))
+    CSV_PARSE_WORKERS: int = int(os.getenv("CSV_PARSE_WORKERS", 1))
+    SQL_QUERY_TIMEOUT_SECONDS: float = float(os.getenv("SQL_QUERY_TIMEOUT_SECONDS", 30))
+    SQL_MEMORY_LIMIT: str = os.getenv("SQL_MEMORY_LIMIT", "1GB")
+
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = [
         "http://localhost:5173",
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -8,15 +9,27 @@ import os
 from .config import settings
 from .database.connection import test_connection
 from .api.v1.api import api_router
+from .services.dataset_cache import dataset_cache
+from .services.processing_jobs import processing_queue
+from .services.result_cache import result_cache
 
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Stop the background processing workers on shutdown"""
+    yield
+    processing_queue.shutdown()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Jabiru API",
     description="AI-powered analytics platform backend",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -48,7 +61,10 @@ async def health_check():
         "status": "healthy",
         "service": "jabiru-backend",
         "version": "0.1.0",
-        "database": db_status
+        "database": db_status,
+        "dataset_cache": dataset_cache.get_stats(),
+        "result_cache": result_cache.get_stats(),
+        "processing": processing_queue.get_stats()
     }
 
 
@@ -2,6 +2,8 @@
 from .user import User
 from .project import Project
 from .file import File
+from .file_profile import FileProfile
+from .processing_job import ProcessingJob
 from .canvas import Canvas
 
-__all__ = ["User", "Project", "File", "Canvas"]
\ No newline at end of file
+__all__ = ["User", "Project", "File", "FileProfile", "ProcessingJob", "Canvas"]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.database.connection import Base
@@ -14,12 +14,22 @@ class File(Base):
     path = Column(String(500), nullable=False, unique=True)
     size = Column(Integer, nullable=False)
     mime_type = Column(String(100), nullable=True)
+    columnar_path = Column(String(500), nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)
+    # Parse hints detected by the processing job, reused on later reads
+    encoding = Column(String(64), nullable=True)
+    encoding_confidence = Column(Float, nullable=True)
+    dialect = Column(JSON, nullable=True)
+    column_dtypes = Column(JSON, nullable=True)
+    parse_overrides = Column(JSON, nullable=True)
     project_id = Column(GUID, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     uploaded_by = Column(GUID, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     project = relationship("Project", back_populates="files")
     uploader = relationship("User", back_populates="uploaded_files")
+    profile = relationship("FileProfile", back_populates="file", uselist=False, cascade="all, delete-orphan")
+    processing_jobs = relationship("ProcessingJob", back_populates="file", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<File {self.filename}>"
\ No newline at end of file
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, ForeignKey, DateTime, JSON
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from src.database.connection import Base
+from src.database.types import GUID
+import uuid
+
+
+class FileProfile(Base):
+    __tablename__ = "file_profiles"
+    
+    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+    file_id = Column(GUID, ForeignKey("files.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    profile = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    file = relationship("File", back_populates="profile")
+    
+    def __repr__(self):
+        return f"<FileProfile for file {self.file_id}>"
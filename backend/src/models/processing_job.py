@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Float, BigInteger
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from src.database.connection import Base
+from src.database.types import GUID
+import uuid
+
+
+class ProcessingJob(Base):
+    __tablename__ = "processing_jobs"
+    
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    
+    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+    file_id = Column(GUID, ForeignKey("files.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(String(20), nullable=False, default=QUEUED)
+    error = Column(Text, nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    peak_memory_bytes = Column(BigInteger, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    file = relationship("File", back_populates="processing_jobs")
+    
+    def __repr__(self):
+        return f"<ProcessingJob {self.status} for file {self.file_id}>"
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, ConfigDict, validator
+import codecs
+from pydantic import BaseModel, ConfigDict, Field, validator
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 
 
@@ -16,6 +17,8 @@ class FileUploadResponse(FileBase):
     project_id: str
     uploaded_by: str
     created_at: datetime
+    # Column sparklines from the file profile, once it has been computed
+    sparklines: Optional[Dict[str, List[int]]] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -29,3 +32,49 @@ class FileUploadResponse(FileBase):
 class FileListResponse(BaseModel):
     files: list[FileUploadResponse]
     total: int
+
+
+class ProcessingJobResponse(BaseModel):
+    id: str
+    file_id: str
+    status: str
+    error: Optional[str] = None
+    duration_seconds: Optional[float] = None
+    peak_memory_bytes: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @validator('id', 'file_id', pre=True)
+    def convert_uuid_to_str(cls, v):
+        if isinstance(v, UUID):
+            return str(v)
+        return v
+
+
+class ParseHintsUpdate(BaseModel):
+    """Per-file overrides of the detected parse hints, unset fields are detected"""
+    encoding: Optional[str] = None
+    delimiter: Optional[str] = Field(None, min_length=1, max_length=1)
+    quotechar: Optional[str] = Field(None, min_length=1, max_length=1)
+    has_header: Optional[bool] = None
+    column_dtypes: Optional[Dict[str, str]] = Field(None, description="pandas dtype names by column")
+    parse_dates: Optional[List[str]] = Field(None, description="Columns to parse as datetimes")
+    engine: Optional[Literal['c', 'python']] = None
+
+    @validator('encoding')
+    def validate_encoding(cls, v):
+        if v is not None:
+            try:
+                codecs.lookup(v)
+            except LookupError:
+                raise ValueError(f"Unknown encoding '{v}'")
+        return v
+
+
+class ParseHintsResponse(BaseModel):
+    detected: Dict[str, Any]
+    overrides: Dict[str, Any]
+    effective: Dict[str, Any]
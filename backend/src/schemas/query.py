@@ -0,0 +1,79 @@
+"""Dataset query schemas for API endpoints"""
+from pydantic import BaseModel, Field
+from typing import Annotated, Any, List, Literal, Optional, Union
+
+
+class QueryFilter(BaseModel):
+    """Predicate on a single column"""
+    column: str
+    op: Literal['eq', 'ne', 'lt', 'le', 'gt', 'ge', 'in', 'not_in', 'is_null', 'not_null', 'contains']
+    value: Optional[Any] = Field(None, description="Comparison value, a list for 'in' and 'not_in'")
+
+
+class QuerySort(BaseModel):
+    """Sort key"""
+    column: str
+    descending: bool = False
+
+
+class DatasetQuery(BaseModel):
+    """Declarative query over the rows of an uploaded dataset"""
+    columns: Optional[List[str]] = Field(None, description="Columns to return, all when omitted")
+    filters: List[QueryFilter] = Field(default=[], description="Predicates combined with AND")
+    sort: List[QuerySort] = Field(default=[], description="Sort keys in priority order")
+    offset: int = Field(0, ge=0)
+    limit: int = Field(100, ge=1, le=10000)
+    orient: Literal['records', 'columns'] = 'records'
+
+
+class AggregationMetric(BaseModel):
+    """Aggregate of one column, or the row count when column is omitted"""
+    func: Literal['sum', 'avg', 'count', 'min', 'max']
+    column: Optional[str] = None
+
+
+class AggregationQuery(BaseModel):
+    """Grouped aggregation over an uploaded dataset"""
+    group_by: List[str] = Field(..., min_length=1, description="Columns to group by")
+    metrics: List[AggregationMetric] = Field(default=[AggregationMetric(func='count')], min_length=1)
+    max_groups: int = Field(50, ge=1, le=1000, description="Largest groups kept, the rest form an 'Other' group")
+    order_by: Literal['count', 'key'] = 'count'
+
+
+class SQLQuery(BaseModel):
+    """Read-only SQL over the files of a project"""
+    sql: str = Field(..., min_length=1, description="A single SELECT statement")
+    max_rows: int = Field(10000, ge=1, le=1000000)
+
+
+class SeriesQuery(BaseModel):
+    """Downsampled x/y series for a chart of a given size in pixels"""
+    x: str
+    y: List[str] = Field(..., min_length=1, max_length=10)
+    mode: Literal['lttb', 'minmax', 'sample', 'bins'] = 'lttb'
+    width: int = Field(1000, ge=10, le=4000, description="Chart width in pixels")
+    height: int = Field(500, ge=10, le=2000, description="Chart height in pixels, used by 'bins'")
+    max_points: int = Field(2000, ge=10, le=5000, description="Target sample size of 'sample', most grid cells of 'bins'")
+
+
+class ResampleQuery(BaseModel):
+    """Value columns aggregated into regular time buckets of a datetime column"""
+    time_column: str
+    value_columns: List[str] = Field(..., min_length=1, max_length=10)
+    frequency: Literal['hour', 'day', 'week', 'month'] = 'day'
+    func: Literal['sum', 'avg', 'count', 'min', 'max'] = 'avg'
+
+
+class ColumnStatsQuery(BaseModel):
+    """Statistics of several columns computed from one read of the file"""
+    columns: Union[Literal['all'], Annotated[List[str], Field(min_length=1)]] = Field(
+        'all', description="Column names, or 'all'"
+    )
+
+
+class CorrelationQuery(BaseModel):
+    """Correlation matrix over the numeric columns of a dataset"""
+    method: Literal['pearson', 'spearman'] = 'pearson'
+    columns: Optional[List[str]] = Field(None, min_length=2, description="Numeric columns, all by default")
+    max_rows: int = Field(200000, ge=100, le=10000000, description="Rows sampled from taller files")
+    top_k: int = Field(10, ge=1, le=100, description="Strongest pairs to return")
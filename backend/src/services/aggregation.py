@@ -0,0 +1,128 @@
+"""Grouped aggregations over uploaded datasets"""
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from src.schemas.query import AggregationMetric, AggregationQuery
+from src.services.data_processing import DataProcessingService
+
+
+class AggregationService:
+    OTHER_LABEL = 'Other'
+    ROWS_COLUMN = '__rows'
+
+    @staticmethod
+    def metric_name(metric: AggregationMetric) -> str:
+        return metric.func if metric.column is None else f"{metric.func}_{metric.column}"
+
+    @staticmethod
+    def touched_columns(query: AggregationQuery) -> List[str]:
+        columns = list(query.group_by)
+        for metric in query.metrics:
+            if metric.column is not None and metric.column not in columns:
+                columns.append(metric.column)
+        return columns
+
+    @staticmethod
+    def _is_text(series: pd.Series) -> bool:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.cat.categories.to_series()
+        return pd.api.types.infer_dtype(series, skipna=True) == 'string'
+
+    @staticmethod
+    def _partial_aggregations(
+        df: pd.DataFrame,
+        query: AggregationQuery
+    ) -> Dict[str, Tuple[str, str]]:
+        """Named aggregations whose results can be merged across groups.
+
+        Averages are computed from a sum and a count so the groups folded
+        into the 'Other' bucket still average correctly.
+        """
+        partials = {AggregationService.ROWS_COLUMN: (query.group_by[0], 'size')}
+
+        for metric in query.metrics:
+            column = metric.column
+            if column is None:
+                if metric.func != 'count':
+                    raise ValueError(f"'{metric.func}' requires a column")
+                continue
+            if column not in df.columns:
+                raise ValueError(f"Column '{column}' not found in dataframe")
+
+            if metric.func in ('sum', 'avg'):
+                if not pd.api.types.is_numeric_dtype(df[column]):
+                    raise ValueError(f"Cannot compute '{metric.func}' of non-numeric column '{column}'")
+                partials[f"__sum_{column}"] = (column, 'sum')
+            if metric.func in ('count', 'avg'):
+                partials[f"__count_{column}"] = (column, 'count')
+            if metric.func in ('min', 'max'):
+                partials[f"__{metric.func}_{column}"] = (column, metric.func)
+
+        return partials
+
+    @staticmethod
+    def aggregate(df: pd.DataFrame, query: AggregationQuery) -> Dict[str, Any]:
+        """Group, aggregate and cap the number of groups.
+
+        Groups are ranked by row count; all but the largest max_groups are
+        folded into a single group labelled 'Other' in every key column.
+        Missing key values form their own group.
+        """
+        for column in query.group_by:
+            if column not in df.columns:
+                raise ValueError(f"Column '{column}' not found in dataframe")
+
+        partials = AggregationService._partial_aggregations(df, query)
+
+        # Compacted text columns are unordered categoricals, which have no min
+        # or max, and object columns cannot compare text with missing values
+        ranked = {
+            metric.column for metric in query.metrics
+            if metric.func in ('min', 'max') and AggregationService._is_text(df[metric.column])
+        }
+        if ranked:
+            df = df.assign(**{column: df[column].astype('string') for column in ranked})
+
+        grouped = df.groupby(query.group_by, observed=True, sort=False, dropna=False).agg(**partials)
+        grouped = grouped.sort_values(AggregationService.ROWS_COLUMN, ascending=False, kind='stable')
+
+        total_groups = len(grouped)
+        top = grouped.iloc[:query.max_groups].reset_index()
+        rest = grouped.iloc[query.max_groups:]
+
+        if query.order_by == 'key':
+            top = top.sort_values(query.group_by, na_position='last', kind='stable')
+
+        if len(rest):
+            other = {column: AggregationService.OTHER_LABEL for column in query.group_by}
+            for name in partials:
+                if name.startswith('__min_'):
+                    other[name] = rest[name].min()
+                elif name.startswith('__max_'):
+                    other[name] = rest[name].max()
+                else:
+                    other[name] = rest[name].sum()
+            top = pd.concat([top.astype({c: object for c in query.group_by}), pd.DataFrame([other])], ignore_index=True)
+
+        result = top[query.group_by].copy()
+        for metric in query.metrics:
+            name = AggregationService.metric_name(metric)
+            column = metric.column
+            if column is None:
+                result[name] = top[AggregationService.ROWS_COLUMN]
+            elif metric.func == 'avg':
+                counts = top[f"__count_{column}"]
+                result[name] = top[f"__sum_{column}"] / counts.where(counts > 0)
+            elif metric.func == 'count':
+                result[name] = top[f"__count_{column}"]
+            else:
+                result[name] = top[f"__{metric.func}_{column}"]
+
+        return {
+            'group_by': query.group_by,
+            'metrics': [AggregationService.metric_name(metric) for metric in query.metrics],
+            'data': DataProcessingService.serialize_dataframe(result),
+            'total_groups': int(total_groups),
+            'other_groups': int(len(rest))
+        }
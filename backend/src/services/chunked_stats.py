@@ -0,0 +1,488 @@
+"""Mergeable streaming statistics for datasets larger than memory
+
+Every accumulator can be updated with one chunk at a time and merged with
+another accumulator of the same kind, so a file can be profiled in bounded
+memory with read_csv(chunksize=...) and partial results from parallel
+workers can be combined.
+
+Error bounds of the approximate statistics:
+
+- count, missing values, mean, variance, min and max are exact (up to
+  floating point rounding).
+- quantiles come from a merging t-digest. With the default compression of
+  200 the rank error is typically below 0.5% around the median and smaller
+  towards the tails.
+- distinct counts come from a HyperLogLog sketch with 2^14 registers, a
+  relative standard error of 1.04 / sqrt(2^14), about 0.8%.
+- top values come from a Misra-Gries summary with 100 counters. Reported
+  counts never exceed the true count and undercount it by at most
+  n / (capacity + 1), reported per column as 'top_values_max_error'.
+- histograms of numeric and date columns are read off the t-digest CDF,
+  so bin counts carry the same rank error as the quantiles.
+"""
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextFileReader
+
+from src.services.data_processing import DataProcessingService
+
+
+class RunningMoments:
+    """Count, mean, variance, min and max merged with Chan's parallel update"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def update(self, values: np.ndarray) -> None:
+        if len(values) == 0:
+            return
+
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        self._combine(len(values), mean, m2, float(values.min()), float(values.max()))
+
+    def merge(self, other: "RunningMoments") -> None:
+        if other.count == 0:
+            return
+
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _combine(self, count: int, mean: float, m2: float, minimum: float, maximum: float) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min = minimum if self.min is None else min(self.min, minimum)
+        self.max = maximum if self.max is None else max(self.max, maximum)
+
+    @property
+    def std(self) -> Optional[float]:
+        """Sample standard deviation, matching pandas' ddof=1"""
+        if self.count < 2:
+            return None
+        return math.sqrt(self.m2 / (self.count - 1))
+
+
+class TDigest:
+    """Merging t-digest for approximate quantiles.
+
+    Centroids are formed by grouping sorted points whose cumulative rank maps
+    to the same unit interval of the arcsine scale function, which keeps
+    centroids small near the tails and bounds their number by about
+    compression / 2.
+    """
+
+    def __init__(self, compression: int = 200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values: np.ndarray) -> None:
+        if len(values) == 0:
+            return
+
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(
+            np.concatenate([self.means, values.astype(float)]),
+            np.concatenate([self.weights, np.ones(len(values))])
+        )
+
+    def merge(self, other: "TDigest") -> None:
+        if len(other.means) == 0:
+            return
+
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights])
+        )
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        order = np.argsort(means, kind='mergesort')
+        means = means[order]
+        weights = weights[order]
+
+        total = weights.sum()
+        midpoints = (np.cumsum(weights) - weights / 2) / total
+        scale = self.compression / (2 * np.pi) * np.arcsin(2 * midpoints - 1)
+        _, buckets = np.unique(np.floor(scale), return_inverse=True)
+
+        self.weights = np.bincount(buckets, weights=weights)
+        self.means = np.bincount(buckets, weights=weights * means) / self.weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        if len(self.means) == 0:
+            return None
+        if len(self.means) == 1:
+            return float(self.means[0])
+
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        ranks = np.concatenate([[0.0], centers, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q * total, ranks, values))
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        """Approximate number of points at or below each of the given values"""
+        total = self.weights.sum()
+        if len(self.means) == 1:
+            return np.where(x >= self.means[0], total, 0.0)
+
+        centers = np.cumsum(self.weights) - self.weights / 2
+        ranks = np.concatenate([[0.0], centers, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(x, values, ranks, left=0.0, right=total)
+
+    def histograms(self, bins: int) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Approximate equal-width and equal-frequency histograms.
+
+        Returns the equal-width edges and counts followed by the
+        equal-frequency edges and counts, with counts rounded from the
+        interpolated CDF, or None when the digest is empty.
+        """
+        if len(self.means) == 0:
+            return None
+
+        # Same default range as numpy.histogram for a single distinct value
+        low, high = (self.min, self.max) if self.max > self.min else (self.min - 0.5, self.max + 0.5)
+        edges = np.linspace(low, high, bins + 1)
+
+        quantile_edges = np.unique([self.quantile(q) for q in np.linspace(0, 1, bins + 1)])
+        if len(quantile_edges) < 2:
+            quantile_edges = edges[[0, -1]]
+
+        def counts(bin_edges: np.ndarray) -> np.ndarray:
+            cumulative = np.round(self.cdf(bin_edges))
+            cumulative[0], cumulative[-1] = 0.0, round(self.count)
+            return np.diff(cumulative).astype(np.int64)
+
+        return edges, counts(edges), quantile_edges, counts(quantile_edges)
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter over 64-bit pandas value hashes"""
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values: pd.Series) -> None:
+        if len(values) == 0:
+            return
+
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+        remaining_bits = 64 - self.precision
+
+        index = (hashes >> np.uint64(remaining_bits)).astype(np.int64)
+        remaining = hashes & np.uint64((1 << remaining_bits) - 1)
+
+        # Rank is the position of the leftmost set bit in the remaining bits
+        bit_length = np.where(remaining > 0, np.frexp(remaining.astype(np.float64))[1], 0)
+        rank = (remaining_bits - bit_length + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+
+        # Linear counting is more accurate for small cardinalities
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * math.log(m / zeros)
+
+        return int(round(estimate))
+
+
+class MisraGries:
+    """Misra-Gries heavy hitters summary with a fixed number of counters"""
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.counters = pd.Series(dtype='int64')
+        self.total = 0
+
+    def update(self, values: pd.Series) -> None:
+        self._merge_counts(values.value_counts(), len(values))
+
+    def merge(self, other: "MisraGries") -> None:
+        self._merge_counts(other.counters, other.total)
+
+    def _merge_counts(self, counts: pd.Series, total: int) -> None:
+        self.total += total
+        combined = self.counters.add(counts, fill_value=0).astype('int64')
+
+        if len(combined) > self.capacity:
+            threshold = combined.nlargest(self.capacity + 1).iloc[-1]
+            combined = combined[combined > threshold] - threshold
+
+        self.counters = combined
+
+    @property
+    def max_error(self) -> int:
+        """Upper bound on how much any reported count undercounts"""
+        return self.total // (self.capacity + 1)
+
+    def top(self, limit: int) -> pd.Series:
+        return self.counters.sort_values(ascending=False, kind='mergesort').head(limit)
+
+
+class ColumnAccumulator:
+    """Streaming statistics for one column.
+
+    Whether the column is numeric or holds dates is decided from the first
+    chunk; later chunks of numeric columns are coerced to numbers and values
+    that fail to parse are counted as missing. Dates are summarized by a
+    t-digest of their timestamps for the histograms.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        numeric: bool,
+        compression: int = 200,
+        hll_precision: int = 14,
+        top_k_capacity: int = 100,
+        datetime: bool = False
+    ):
+        self.name = name
+        self.numeric = numeric
+        self.datetime = datetime and not numeric
+        self.total = 0
+        self.missing = 0
+        self.dtypes: List[np.dtype] = []
+        self.distinct = HyperLogLog(hll_precision)
+
+        if numeric:
+            self.moments = RunningMoments()
+            self.digest = TDigest(compression)
+        else:
+            self.frequent = MisraGries(top_k_capacity)
+            if self.datetime:
+                self.timestamps = TDigest(compression)
+
+    def update(self, series: pd.Series) -> None:
+        self.total += len(series)
+
+        if self.numeric:
+            if not pd.api.types.is_numeric_dtype(series):
+                series = pd.to_numeric(series, errors='coerce')
+            self.dtypes.append(series.dtype)
+            values = series.dropna().astype('float64')
+            self.missing += len(series) - len(values)
+            self.moments.update(values.to_numpy())
+            self.digest.update(values.to_numpy())
+            self.distinct.update(values)
+        else:
+            self.dtypes.append(series.dtype)
+            values = series.dropna()
+            self.missing += len(series) - len(values)
+            if self.datetime:
+                parsed = pd.to_datetime(values, errors='coerce', format='mixed', utc=True).dropna()
+                self.timestamps.update(
+                    parsed.dt.tz_localize(None).to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+                )
+            values = values.astype(str)
+            self.frequent.update(values)
+            self.distinct.update(values)
+
+    def merge(self, other: "ColumnAccumulator") -> None:
+        self.total += other.total
+        self.missing += other.missing
+        self.dtypes.extend(other.dtypes)
+        self.distinct.merge(other.distinct)
+
+        if self.numeric:
+            self.moments.merge(other.moments)
+            self.digest.merge(other.digest)
+        else:
+            self.frequent.merge(other.frequent)
+            if self.datetime:
+                self.timestamps.merge(other.timestamps)
+
+    def result(self, top_values_limit: int = 10, histogram_bins: int = 32) -> Dict[str, Any]:
+        non_missing = self.total - self.missing
+        stats = {
+            'column': self.name,
+            'total_values': int(self.total),
+            'missing_values': int(self.missing),
+            'unique_values': min(self.distinct.count(), non_missing),
+            'data_type': str(np.result_type(*self.dtypes)) if self.numeric and self.dtypes else 'object'
+        }
+
+        if self.numeric:
+            stats.update({
+                'mean': self.moments.mean if self.moments.count else None,
+                'median': self.digest.quantile(0.5),
+                'std': self.moments.std,
+                'min': self.moments.min,
+                'max': self.moments.max,
+                'quartiles': {
+                    'q1': self.digest.quantile(0.25),
+                    'q2': self.digest.quantile(0.5),
+                    'q3': self.digest.quantile(0.75)
+                }
+            })
+        else:
+            top_values = self.frequent.top(top_values_limit)
+            stats.update({
+                'top_values': {str(k): int(v) for k, v in top_values.items()},
+                'mode': str(top_values.index[0]) if not top_values.empty else None,
+                'top_values_max_error': int(self.frequent.max_error)
+            })
+
+        if self.numeric or self.datetime:
+            histograms = (self.digest if self.numeric else self.timestamps).histograms(histogram_bins)
+            if histograms is None:
+                stats.update({'histogram': None, 'quantile_histogram': None, 'sparkline': None})
+            else:
+                stats.update(DataProcessingService.format_histograms(*histograms, is_datetime=self.datetime))
+
+        return stats
+
+
+class ChunkedStatisticsEngine:
+    """Profile CSV files chunk by chunk with bounded memory"""
+
+    DEFAULT_CHUNK_ROWS = 100_000
+
+    def __init__(
+        self,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        compression: int = 200,
+        hll_precision: int = 14,
+        top_k_capacity: int = 100
+    ):
+        self.chunk_rows = chunk_rows
+        self.compression = compression
+        self.hll_precision = hll_precision
+        self.top_k_capacity = top_k_capacity
+
+    def profile_csv(
+        self,
+        file_path: Path,
+        encoding: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        dialect: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Profile a CSV file, optionally only the given columns.
+
+        A known dialect, e.g. from the parse hints of the file, is completed
+        rather than sniffed again.
+        """
+        with self.read_chunks(file_path, encoding, delimiter, columns, dialect) as reader:
+            return self.profile_chunks(reader)
+
+    def read_chunks(
+        self,
+        file_path: Path,
+        encoding: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        dialect: Optional[Dict[str, Any]] = None
+    ) -> TextFileReader:
+        """Open a CSV file as a reader of chunk_rows sized DataFrames"""
+        if not encoding:
+            encoding = DataProcessingService.detect_encoding(file_path)
+
+        dialect = DataProcessingService.resolve_dialect(file_path, encoding, delimiter, dialect)
+
+        read_options = {}
+        if not dialect['has_header']:
+            read_options['header'] = None
+            read_options['names'] = [
+                f"column_{i + 1}" for i in range(dialect['field_count'])
+            ]
+        if columns is not None:
+            read_options['usecols'] = columns
+
+        return pd.read_csv(
+            file_path,
+            encoding=encoding,
+            delimiter=dialect['delimiter'],
+            quotechar=dialect['quotechar'],
+            on_bad_lines='skip',
+            chunksize=self.chunk_rows,
+            **read_options
+        )
+
+    def profile_chunks(self, chunks: Iterable[pd.DataFrame]) -> Dict[str, Any]:
+        """Profile a stream of DataFrame chunks sharing the same columns"""
+        accumulators: Dict[str, ColumnAccumulator] = {}
+        total_rows = 0
+
+        for chunk in chunks:
+            if not accumulators:
+                accumulators = {
+                    column: self._create_accumulator(column, chunk[column])
+                    for column in chunk.columns
+                }
+
+            total_rows += len(chunk)
+            for column, accumulator in accumulators.items():
+                accumulator.update(chunk[column])
+
+        return self.build_profile(accumulators, total_rows)
+
+    def build_profile(
+        self,
+        accumulators: Dict[str, ColumnAccumulator],
+        total_rows: int
+    ) -> Dict[str, Any]:
+        return {
+            'total_rows': int(total_rows),
+            'total_columns': len(accumulators),
+            'columns': {
+                column: accumulator.result(
+                    DataProcessingService.TOP_VALUES_LIMIT, DataProcessingService.HISTOGRAM_BINS
+                )
+                for column, accumulator in accumulators.items()
+            },
+            'approximate': True,
+            'error_bounds': {
+                'unique_values_relative_std_error': round(1.04 / math.sqrt(1 << self.hll_precision), 4),
+                'quantile_compression': self.compression,
+                'top_values_capacity': self.top_k_capacity
+            }
+        }
+
+    def _create_accumulator(self, column: str, series: pd.Series) -> ColumnAccumulator:
+        numeric = pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+        datetime = not numeric and DataProcessingService._infer_series_type(
+            series, DataProcessingService.TYPE_SAMPLE_SIZE
+        )['type'] == 'datetime'
+        return ColumnAccumulator(
+            column,
+            numeric,
+            compression=self.compression,
+            hll_precision=self.hll_precision,
+            top_k_capacity=self.top_k_capacity,
+            datetime=datetime
+        )
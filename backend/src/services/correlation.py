@@ -0,0 +1,119 @@
+"""Correlation matrices over the numeric columns of a dataset
+
+Pairwise-complete correlations are computed for all pairs at once with a
+few matrix products over the presence mask and the zero-filled values,
+instead of one pass per pair. Spearman correlations are Pearson
+correlations of the ranks; each column is ranked once over all its
+values, which matches per-pair ranking exactly when columns have no
+missing values.
+"""
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.schemas.query import CorrelationQuery
+
+
+class CorrelationService:
+    MIN_PAIR_ROWS = 3
+    SAMPLE_SEED = 0
+
+    @staticmethod
+    def numeric_columns(df: pd.DataFrame) -> List[str]:
+        return [
+            column for column in df.columns
+            if pd.api.types.is_numeric_dtype(df[column]) and not pd.api.types.is_bool_dtype(df[column])
+        ]
+
+    @staticmethod
+    def pairwise_pearson(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Pearson correlations of the columns of a matrix with missing values as NaN.
+
+        Each pair uses the rows where both columns are present. Returns the
+        correlation matrix, NaN where undefined, and the matrix of row counts.
+        """
+        present = ~np.isnan(values)
+        # Centering first keeps the sums small and avoids cancellation
+        centered = np.where(present, values - np.nanmean(values, axis=0), 0.0)
+        weights = present.astype(float)
+
+        counts = weights.T @ weights
+        sums = centered.T @ weights
+        squares = (centered * centered).T @ weights
+        products = centered.T @ centered
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # sums[i, j] is the sum of column i over the rows where j is present
+            covariance = products - sums * sums.T / counts
+            variance = squares - sums ** 2 / counts
+            matrix = covariance / np.sqrt(variance * variance.T)
+
+        matrix[counts < CorrelationService.MIN_PAIR_ROWS] = np.nan
+        return np.clip(matrix, -1.0, 1.0), counts.astype(np.int64)
+
+    @staticmethod
+    def top_pairs(
+        matrix: np.ndarray,
+        counts: np.ndarray,
+        columns: List[str],
+        k: int
+    ) -> List[Dict[str, Any]]:
+        """The k column pairs with the strongest correlation, in either direction"""
+        rows, cols = np.triu_indices(len(columns), k=1)
+        values = matrix[rows, cols]
+        defined = ~np.isnan(values)
+        rows, cols, values = rows[defined], cols[defined], values[defined]
+
+        order = np.argsort(-np.abs(values), kind='stable')[:k]
+        return [
+            {
+                'x': columns[rows[i]],
+                'y': columns[cols[i]],
+                'correlation': round(float(values[i]), 6),
+                'rows': int(counts[rows[i], cols[i]])
+            }
+            for i in order
+        ]
+
+    @staticmethod
+    def correlate(df: pd.DataFrame, query: CorrelationQuery) -> Dict[str, Any]:
+        """Correlation matrix and strongest pairs of the numeric columns"""
+        numeric_columns = CorrelationService.numeric_columns(df)
+        if query.columns is None:
+            columns = numeric_columns
+        else:
+            columns = list(dict.fromkeys(query.columns))
+            for column in columns:
+                if column not in df.columns:
+                    raise ValueError(f"Column '{column}' not found in dataframe")
+                if column not in numeric_columns:
+                    raise ValueError(f"Column '{column}' is not numeric")
+
+        source_rows = len(df)
+        sampled = source_rows > query.max_rows
+        if sampled:
+            rng = np.random.default_rng(CorrelationService.SAMPLE_SEED)
+            df = df.iloc[np.sort(rng.choice(source_rows, query.max_rows, replace=False))]
+
+        frame = df[columns]
+        if query.method == 'spearman':
+            frame = frame.rank(method='average')
+        values = frame.to_numpy(dtype=float, na_value=np.nan).reshape(len(frame), len(columns))
+
+        if columns:
+            matrix, counts = CorrelationService.pairwise_pearson(values)
+        else:
+            matrix, counts = np.empty((0, 0)), np.empty((0, 0), dtype=np.int64)
+
+        return {
+            'method': query.method,
+            'columns': columns,
+            'matrix': [
+                [None if np.isnan(value) else round(float(value), 6) for value in row]
+                for row in matrix
+            ],
+            'source_rows': int(source_rows),
+            'sampled_rows': int(len(df)) if sampled else None,
+            'top_pairs': CorrelationService.top_pairs(matrix, counts, columns, query.top_k)
+        }
@@ -1,21 +1,151 @@
+import codecs
+import csv
+import io
+import json
+import logging
+import re
+import time
+import warnings
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 import chardet
+import charset_normalizer
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 class DataProcessingService:
     PREVIEW_ROWS = 100
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB for processing
+    COLUMNAR_METADATA_KEY = b'jabiru'
+    COLUMNAR_ROW_GROUP_SIZE = 64 * 1024
+    SNIFF_SAMPLE_BYTES = 64 * 1024
+    SNIFF_MAX_ROWS = 200
+    CANDIDATE_DELIMITERS = [',', ';', '\t', '|']
+    DIALECT_KEYS = ('delimiter', 'quotechar', 'line_terminator', 'has_header', 'field_count')
+    ROW_COUNT_CHUNK_BYTES = 1024 * 1024
+    ENCODING_SAMPLE_BYTES = 10000
+    UTF8_VALIDATION_BYTES = 4 * 1024 * 1024
+    # UTF-32 first, its little-endian mark starts with the UTF-16 one
+    BYTE_ORDER_MARKS = [
+        (codecs.BOM_UTF32_LE, 'utf-32'),
+        (codecs.BOM_UTF32_BE, 'utf-32'),
+        (codecs.BOM_UTF8, 'utf-8-sig'),
+        (codecs.BOM_UTF16_LE, 'utf-16'),
+        (codecs.BOM_UTF16_BE, 'utf-16')
+    ]
+    # Tie-break between code pages that decode a sample equally well
+    PREFERRED_LEGACY_ENCODINGS = ('cp1252', 'cp1250', 'cp1251')
+    SERIALIZATION_ORIENTS = ('records', 'columns')
+    TOP_VALUES_LIMIT = 10
+    HISTOGRAM_BINS = 32
+    SPARKLINE_BINS = 8
+    TYPE_SAMPLE_SIZE = 1000
+    CATEGORY_MAX_UNIQUE_RATIO = 0.5
+    TYPE_CONFORMANCE_THRESHOLD = 0.98
+    TYPE_ESCALATION_THRESHOLD = 0.9
+    BOOLEAN_VALUES = ['true', 'false', '1', '0', 'yes', 'no', 't', 'f']
+    DATETIME_PATTERN = re.compile(
+        r'^(\d{4}[-/.]\d{1,2}[-/.]\d{1,2}'
+        r'|\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4}'
+        r'|\d{1,2}\s+[A-Za-z]{3,9}\.?,?\s+\d{2,4}'
+        r'|[A-Za-z]{3,9}\.?\s+\d{1,2},?\s+\d{2,4})'
+    )
 
     @staticmethod
     def detect_encoding(file_path: Path) -> str:
+        return DataProcessingService.detect_encoding_details(file_path)['encoding']
+
+    @staticmethod
+    def detect_encoding_details(file_path: Path) -> Dict[str, Any]:
+        """Detect the encoding of a file in tiers, cheapest first.
+
+        1. A byte order mark settles it.
+        2. Text that decodes as strict UTF-8 over the first
+           UTF8_VALIDATION_BYTES is UTF-8. ASCII is reported as UTF-8 too,
+           since non-ASCII text further down the file is far more often
+           UTF-8 than anything else.
+        3. Otherwise charset_normalizer guesses from a sample starting at
+           the line of the first invalid byte, so a long ASCII prefix does
+           not hide the evidence, and chardet is only consulted when it
+           finds no match.
+
+        Returns the codec name with the confidence and tier that produced it.
+        """
         with open(file_path, 'rb') as file:
-            raw_data = file.read(10000)
-            result = chardet.detect(raw_data)
-            return result['encoding'] or 'utf-8'
+            head = file.read(4)
+            for bom, encoding in DataProcessingService.BYTE_ORDER_MARKS:
+                if head.startswith(bom):
+                    return {'encoding': encoding, 'confidence': 1.0, 'method': 'bom'}
+
+            file.seek(0)
+            decoder = codecs.getincrementaldecoder('utf-8')('strict')
+            sample, non_ascii, complete = None, False, False
+            read = 0
+            while read < DataProcessingService.UTF8_VALIDATION_BYTES:
+                chunk = file.read(DataProcessingService.ROW_COUNT_CHUNK_BYTES)
+                if not chunk:
+                    complete = True
+                    break
+                read += len(chunk)
+
+                # NUL bytes are valid UTF-8 but mean UTF-16/32 text without a BOM
+                if b'\x00' in chunk:
+                    sample = chunk[:DataProcessingService.ENCODING_SAMPLE_BYTES]
+                    break
+                try:
+                    decoder.decode(chunk)
+                except UnicodeDecodeError as e:
+                    line_start = chunk.rfind(b'\n', 0, e.start) + 1
+                    sample = chunk[line_start:line_start + DataProcessingService.ENCODING_SAMPLE_BYTES]
+                    break
+                non_ascii = non_ascii or not chunk.isascii()
+
+            if sample is None and complete:
+                try:
+                    decoder.decode(b'', final=True)
+                except UnicodeDecodeError:
+                    # Truncated multi-byte sequence at the end of the file
+                    file.seek(0)
+                    sample = file.read(DataProcessingService.ENCODING_SAMPLE_BYTES)
+
+        if sample is None:
+            # Valid multi-byte sequences are rarely an accident
+            confidence = 1.0 if complete else 0.99 if non_ascii else 0.9
+            return {'encoding': 'utf-8', 'confidence': confidence, 'method': 'utf-8'}
+
+        # A multi-byte character cut at the end of the sample rules out its encoding
+        if b'\x00' not in sample and b'\n' in sample:
+            sample = sample[:sample.rindex(b'\n') + 1]
+
+        matches = charset_normalizer.from_bytes(sample)
+        match = matches.best()
+        if match is not None:
+            # Western text often fits several code pages equally well
+            tied = {m.encoding: m for m in matches if m.chaos == match.chaos}
+            for encoding in DataProcessingService.PREFERRED_LEGACY_ENCODINGS:
+                if encoding in tied:
+                    match = tied[encoding]
+                    break
+            return {
+                'encoding': codecs.lookup(match.encoding).name,
+                'confidence': round(1.0 - match.chaos, 3),
+                'method': 'charset_normalizer'
+            }
+
+        result = chardet.detect(sample)
+        if result['encoding']:
+            return {
+                'encoding': codecs.lookup(result['encoding']).name,
+                'confidence': round(result['confidence'], 3),
+                'method': 'chardet'
+            }
+        return {'encoding': 'utf-8', 'confidence': 0.0, 'method': 'default'}
 
     @staticmethod
     def convert_numpy_types(obj):
@@ -28,6 +158,8 @@ class DataProcessingService:
             return obj.tolist()
         elif isinstance(obj, np.bool_):
             return bool(obj)
+        elif isinstance(obj, (pd.Timestamp, datetime)):
+            return obj.isoformat()
         elif pd.isna(obj):
             return None
         else:
@@ -35,165 +167,957 @@ class DataProcessingService:
 
     @staticmethod
     def detect_column_types(df: pd.DataFrame) -> Dict[str, str]:
-        column_types = {}
+        return {
+            column: inference['type']
+            for column, inference in DataProcessingService.infer_column_types(df).items()
+        }
 
-        for column in df.columns:
-            col_data = df[column].dropna()
+    @staticmethod
+    def infer_column_types(
+        df: pd.DataFrame,
+        sample_size: int = TYPE_SAMPLE_SIZE
+    ) -> Dict[str, Dict[str, Any]]:
+        """Infer the logical type of every column from a sample of its values.
 
-            if col_data.empty:
-                column_types[column] = 'unknown'
-                continue
+        Typed columns are classified from their dtype. Text columns are
+        checked on an evenly spaced sample with vectorized coercions, and only
+        a sample whose conformance falls just short of the threshold is
+        re-checked against the full column. 'confidence' is the fraction of
+        non-null values that conform to the inferred type.
+        """
+        return {
+            column: DataProcessingService._infer_series_type(df[column], sample_size)
+            for column in df.columns
+        }
 
-            # Try to convert to numeric
-            try:
-                pd.to_numeric(col_data, errors='raise')
-                if col_data.dtype == 'int64' or (col_data == col_data.astype(int)).all():
-                    column_types[column] = 'integer'
-                else:
-                    column_types[column] = 'float'
-                continue
-            except (ValueError, TypeError):
-                pass
+    @staticmethod
+    def _infer_series_type(series: pd.Series, sample_size: int) -> Dict[str, Any]:
+        values = series.dropna()
+        if values.empty:
+            return {'type': 'unknown', 'confidence': 0.0}
 
-            # Try to convert to datetime
-            try:
-                # Add format='mixed' to suppress warning
-                pd.to_datetime(col_data, errors='raise', format='mixed')
-                column_types[column] = 'datetime'
-                continue
-            except (ValueError, TypeError):
-                pass
+        dtype = values.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            values = pd.Series(dtype.categories)
+            dtype = values.dtype
 
-            # Check if boolean
-            unique_values = col_data.unique()
-            if len(unique_values) <= 2 and all(
-                str(val).lower() in ['true', 'false',
-                                     '1', '0', 'yes', 'no', 't', 'f']
-                for val in unique_values
-            ):
-                column_types[column] = 'boolean'
-                continue
+        if pd.api.types.is_bool_dtype(dtype):
+            return {'type': 'boolean', 'confidence': 1.0}
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return {'type': 'datetime', 'confidence': 1.0}
+        if pd.api.types.is_integer_dtype(dtype):
+            return {'type': 'integer', 'confidence': 1.0}
+        if pd.api.types.is_float_dtype(dtype):
+            numbers = values.to_numpy(dtype=float)
+            is_integral = bool(np.all(np.isfinite(numbers) & (numbers == np.floor(numbers))))
+            return {'type': 'integer' if is_integral else 'float', 'confidence': 1.0}
+
+        sampled = len(values) > sample_size
+        if sampled:
+            # One value from each of sample_size equally sized strata
+            positions = np.linspace(0, len(values) - 1, sample_size).astype(int)
+            sample = values.iloc[positions]
+        else:
+            sample = values
+
+        for check in (
+            DataProcessingService._check_numeric,
+            DataProcessingService._check_datetime,
+            DataProcessingService._check_boolean
+        ):
+            inferred_type, ratio = check(sample.astype(str).str.strip())
+            if sampled and DataProcessingService.TYPE_ESCALATION_THRESHOLD <= ratio < 1.0:
+                inferred_type, ratio = check(values.astype(str).str.strip())
+            if ratio >= DataProcessingService.TYPE_CONFORMANCE_THRESHOLD:
+                return {'type': inferred_type, 'confidence': round(float(ratio), 4)}
+
+        return {'type': 'string', 'confidence': 1.0}
+
+    @staticmethod
+    def _check_numeric(values: pd.Series) -> Tuple[str, float]:
+        numbers = pd.to_numeric(values, errors='coerce')
+        conforming = numbers.dropna()
+        if conforming.empty:
+            return 'float', 0.0
 
-            # Default to string
-            column_types[column] = 'string'
+        finite = conforming[np.isfinite(conforming)]
+        is_integral = len(finite) == len(conforming) and bool((finite == np.floor(finite)).all())
+        return ('integer' if is_integral else 'float'), len(conforming) / len(values)
 
-        return column_types
+    @staticmethod
+    def _check_datetime(values: pd.Series) -> Tuple[str, float]:
+        # The regex rules out most non-dates before the slow per-value parser
+        candidates = values[values.str.match(DataProcessingService.DATETIME_PATTERN)]
+        if candidates.empty:
+            return 'datetime', 0.0
+
+        parsed = pd.to_datetime(candidates, errors='coerce', format='mixed')
+        return 'datetime', int(parsed.notna().sum()) / len(values)
+
+    @staticmethod
+    def _check_boolean(values: pd.Series) -> Tuple[str, float]:
+        lowered = values.str.lower()
+        conforming = lowered[lowered.isin(DataProcessingService.BOOLEAN_VALUES)]
+        if conforming.nunique() > 2:
+            return 'boolean', 0.0
+
+        return 'boolean', len(conforming) / len(values)
 
     @staticmethod
     def parse_csv_file(
         file_path: Path,
         encoding: Optional[str] = None,
-        delimiter: Optional[str] = None
+        delimiter: Optional[str] = None,
+        hints: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None
     ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Parse a CSV file, reusing the parse hints of an earlier parse.
 
-        if not encoding:
-            encoding = DataProcessingService.detect_encoding(file_path)
+        Hints hold the 'encoding', 'encoding_confidence', 'dialect' and
+        'column_dtypes' recorded by parse_hints, plus optional 'parse_dates'
+        and 'engine' overrides. Whatever they do not cover is detected as
+        usual. With columns given only those are converted, in that order,
+        and the metadata describes them only.
+        """
+        hints = hints or {}
+        encoding, encoding_confidence = DataProcessingService.resolve_encoding(file_path, encoding, hints)
+        dialect = DataProcessingService.resolve_dialect(file_path, encoding, delimiter, hints.get('dialect'))
 
-        # Try different delimiters if not specified
-        delimiters_to_try = [delimiter] if delimiter else [',', ';', '\t', '|']
+        read_options = {}
+        if columns is not None:
+            header = DataProcessingService._read_csv(file_path, encoding, dialect, {}, nrows=0).columns
+            for column in columns:
+                if column not in header:
+                    raise ValueError(f"Column '{column}' not found in dataframe")
+            read_options['usecols'] = columns
 
-        for delim in delimiters_to_try:
-            try:
-                df = pd.read_csv(
-                    file_path,
-                    encoding=encoding,
-                    delimiter=delim,
-                    on_bad_lines='skip',
-                    low_memory=False
-                )
+        df = DataProcessingService._read_csv(file_path, encoding, dialect, hints, **read_options)
+        if columns is not None:
+            # usecols keeps the order of the file
+            df = df[columns]
 
-                # If we got a reasonable number of columns, assume it's correct
-                if len(df.columns) > 1 or delimiter:
-                    break
+        memory_before = int(df.memory_usage(deep=True).sum())
+        df = DataProcessingService.compact_dataframe(df)
+
+        metadata = DataProcessingService.build_metadata(
+            df, file_path.stat().st_size, encoding, dialect['delimiter']
+        )
+        metadata['encoding_confidence'] = encoding_confidence
+        metadata['dialect'] = dialect
+        metadata['memory_usage_before_compaction_bytes'] = memory_before
+
+        return df, metadata
+
+    @staticmethod
+    def resolve_encoding(
+        file_path: Path,
+        encoding: Optional[str],
+        hints: Dict[str, Any]
+    ) -> Tuple[str, float]:
+        """The encoding to read a file with and the confidence in it"""
+        if encoding:
+            return encoding, 1.0
+        if hints.get('encoding'):
+            return hints['encoding'], hints.get('encoding_confidence') or 1.0
+
+        detection = DataProcessingService.detect_encoding_details(file_path)
+        return detection['encoding'], detection['confidence']
+
+    @staticmethod
+    def resolve_dialect(
+        file_path: Path,
+        encoding: str,
+        delimiter: Optional[str] = None,
+        hinted: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Reuse a recorded dialect, sniffing only what it leaves out.
+
+        A hinted dialect missing any of DIALECT_KEYS, e.g. one holding just
+        an overridden delimiter, is completed by sniffing the file with the
+        hinted values taking precedence.
+        """
+        hinted = {key: value for key, value in (hinted or {}).items() if value is not None}
+        if delimiter and hinted.get('delimiter', delimiter) != delimiter:
+            hinted = {}
+
+        if all(key in hinted for key in DataProcessingService.DIALECT_KEYS):
+            return {'confidence': 1.0, **hinted}
+
+        dialect = DataProcessingService.sniff_dialect(
+            file_path, encoding, delimiter=delimiter or hinted.get('delimiter')
+        )
+        dialect.update(hinted)
+        return dialect
+
+    @staticmethod
+    def _read_csv(
+        file_path: Path,
+        encoding: str,
+        dialect: Dict[str, Any],
+        hints: Dict[str, Any],
+        **options
+    ) -> pd.DataFrame:
+        """read_csv with the dialect and the explicit dtypes and engine of the hints.
 
-            except Exception:
+        Recorded dtypes that no longer fit the file, e.g. after it was
+        replaced, are dropped and the types inferred again.
+        """
+        engine = hints.get('engine') or 'c'
+        read_options = {'engine': engine, 'on_bad_lines': 'skip', **options}
+        if engine == 'c':
+            read_options['low_memory'] = False
+        if not dialect['has_header']:
+            read_options['header'] = None
+            read_options['names'] = [
+                f"column_{i + 1}" for i in range(dialect['field_count'])
+            ]
+        parse_dates = list(hints.get('parse_dates') or [])
+        dtypes = {}
+        for column, dtype in (hints.get('column_dtypes') or {}).items():
+            # Object columns hold mixed values that only inference reproduces
+            if dtype == 'object':
                 continue
-        else:
-            # If all delimiters failed, use comma as default
-            df = pd.read_csv(
+            # read_csv only parses dates through parse_dates, never through dtype
+            if pd.api.types.is_datetime64_any_dtype(pd.api.types.pandas_dtype(dtype)):
+                if column not in parse_dates:
+                    parse_dates.append(column)
+            else:
+                dtypes[column] = dtype
+        if 'usecols' in options:
+            parse_dates = [column for column in parse_dates if column in options['usecols']]
+        if parse_dates:
+            read_options['parse_dates'] = parse_dates
+
+        def read(**extra) -> pd.DataFrame:
+            return pd.read_csv(
                 file_path,
                 encoding=encoding,
-                delimiter=',',
-                on_bad_lines='skip',
-                low_memory=False
+                delimiter=dialect['delimiter'],
+                quotechar=dialect['quotechar'],
+                **read_options,
+                **extra
+            )
+
+        if not dtypes:
+            return read()
+        try:
+            return read(dtype=dtypes)
+        except (ValueError, TypeError) as e:
+            logger.info(f"Ignoring stale column dtypes for {file_path}: {str(e)}")
+            return read()
+
+    @staticmethod
+    def parse_hints(df: pd.DataFrame, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Record how a file was parsed so later reads can skip detection"""
+        dialect = metadata['dialect']
+        return {
+            'encoding': metadata['encoding'],
+            'encoding_confidence': metadata.get('encoding_confidence'),
+            'dialect': {key: dialect[key] for key in DataProcessingService.DIALECT_KEYS},
+            'column_dtypes': {
+                column: DataProcessingService._dtype_name(DataProcessingService._widened_dtype(dtype))
+                for column, dtype in df.dtypes.items()
+            }
+        }
+
+    @staticmethod
+    def _widened_dtype(dtype: Any) -> Any:
+        """The dtype to record for a compacted column.
+
+        read_csv wraps values that overflow an explicit integer dtype instead
+        of raising, so integers are recorded at full width and narrowed again
+        by compact_dataframe after each parse.
+        """
+        if pd.api.types.is_bool_dtype(dtype) or not isinstance(dtype, np.dtype):
+            return dtype
+        if pd.api.types.is_signed_integer_dtype(dtype):
+            return np.dtype('int64')
+        if pd.api.types.is_unsigned_integer_dtype(dtype):
+            return np.dtype('uint64')
+        return dtype
+
+    @staticmethod
+    def _dtype_name(dtype: Any) -> str:
+        # str() of a string dtype drops its storage
+        if isinstance(dtype, pd.StringDtype):
+            return f"string[{dtype.storage}]"
+        return str(dtype)
+
+    @staticmethod
+    def compact_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+        """Store every column in the smallest dtype that keeps its values exactly.
+
+        Integers are downcast to the narrowest integer type. Floats are
+        kept in float64: values that survive a round trip through float32
+        still lose precision in the sums and means computed over them. Text
+        columns become categoricals when values repeat, at most one distinct
+        value per CATEGORY_MAX_UNIQUE_RATIO rows, and Arrow-backed strings
+        otherwise. Object columns holding anything but strings are kept.
+        """
+        columns = {}
+        for column in df.columns:
+            series = df[column]
+            dtype = series.dtype
+
+            if pd.api.types.is_bool_dtype(dtype):
+                pass
+            elif pd.api.types.is_signed_integer_dtype(dtype):
+                series = pd.to_numeric(series, downcast='integer')
+            elif pd.api.types.is_unsigned_integer_dtype(dtype):
+                series = pd.to_numeric(series, downcast='unsigned')
+            elif dtype == object and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+                if series.nunique() <= len(series) * DataProcessingService.CATEGORY_MAX_UNIQUE_RATIO:
+                    series = series.astype('category')
+                else:
+                    series = series.astype('string[pyarrow]')
+
+            columns[column] = series
+
+        return pd.DataFrame(columns, index=df.index) if columns else df
+
+    @staticmethod
+    def read_csv_head(
+        file_path: Path,
+        rows: int = PREVIEW_ROWS,
+        encoding: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        hints: Optional[Dict[str, Any]] = None
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Parse only the first rows of a CSV file.
+
+        The row count comes from a streaming newline count, everything else in
+        the metadata describes the parsed rows only and is flagged with
+        'is_partial'.
+        """
+        hints = hints or {}
+        encoding, encoding_confidence = DataProcessingService.resolve_encoding(file_path, encoding, hints)
+        dialect = DataProcessingService.resolve_dialect(file_path, encoding, delimiter, hints.get('dialect'))
+
+        df = DataProcessingService._read_csv(file_path, encoding, dialect, hints, nrows=rows)
+
+        metadata = DataProcessingService.build_metadata(
+            df, file_path.stat().st_size, encoding, dialect['delimiter']
+        )
+        metadata['encoding_confidence'] = encoding_confidence
+        metadata['dialect'] = dialect
+        metadata['total_rows'] = max(
+            len(df),
+            DataProcessingService.count_rows(
+                file_path, dialect['line_terminator'], dialect['has_header']
             )
+        )
+        metadata['is_partial'] = True
+
+        return df, metadata
+
+    @staticmethod
+    def count_rows(
+        file_path: Path,
+        line_terminator: str = '\n',
+        has_header: bool = True
+    ) -> int:
+        """Count data rows by streaming line terminators without parsing.
+
+        Quoted fields spanning several lines and blank lines are counted as
+        rows, so the result is an upper bound for such files.
+        """
+        terminator = line_terminator[-1].encode()
+        count = 0
+        last_byte = b''
+
+        with open(file_path, 'rb') as file:
+            while chunk := file.read(DataProcessingService.ROW_COUNT_CHUNK_BYTES):
+                count += chunk.count(terminator)
+                last_byte = chunk[-1:]
+
+        # The last line may not be terminated
+        if last_byte and last_byte != terminator and last_byte.strip(b'\x00'):
+            count += 1
+
+        if has_header:
+            count -= 1
+
+        return max(count, 0)
+
+    @staticmethod
+    def sniff_dialect(
+        file_path: Path,
+        encoding: str,
+        delimiter: Optional[str] = None,
+        sample_bytes: int = SNIFF_SAMPLE_BYTES
+    ) -> Dict[str, Any]:
+        """Detect the CSV dialect from a bounded sample of the file.
+
+        Each candidate delimiter is scored by how consistently it splits the
+        sampled records into the same number of fields; the confidence is the
+        share of records that agree with the most common field count. A known
+        delimiter restricts the candidates to that delimiter.
+        """
+        candidates = [delimiter] if delimiter else DataProcessingService.CANDIDATE_DELIMITERS
+
+        with open(file_path, 'rb') as file:
+            raw_data = file.read(sample_bytes)
+            truncated = bool(file.read(1))
+
+        sample = raw_data.decode(encoding, errors='replace')
+
+        if '\r\n' in sample:
+            line_terminator = '\r\n'
+        elif '\n' in sample:
+            line_terminator = '\n'
+        elif '\r' in sample:
+            line_terminator = '\r'
+        else:
+            line_terminator = '\n'
+
+        # Drop the partial record at the end of a truncated sample
+        if truncated and line_terminator in sample:
+            sample = sample[:sample.rindex(line_terminator)]
+
+        best = DataProcessingService._score_delimiters(sample, candidates, '"')
+        quotechar = '"'
+
+        # Apostrophes also start plain text ("'90s"), so they only become the
+        # quote character when the sample parses cleanly with them
+        boundary = '(?:^|[' + re.escape(''.join(candidates)) + '])'
+        single_quotes = len(re.findall(boundary + "'", sample, flags=re.MULTILINE))
+        double_quotes = len(re.findall(boundary + '"', sample, flags=re.MULTILINE))
+        if single_quotes > double_quotes and DataProcessingService._quotes_check_out(sample, best['delimiter'], "'"):
+            quotechar = "'"
+            best = DataProcessingService._score_delimiters(sample, candidates, quotechar)
+
+        return {
+            'delimiter': best['delimiter'],
+            'quotechar': quotechar,
+            'line_terminator': line_terminator,
+            'has_header': DataProcessingService._sniff_header(sample, best['delimiter'], quotechar),
+            'field_count': best['field_count'],
+            'confidence': round(best['confidence'], 3)
+        }
+
+    @staticmethod
+    def _score_delimiters(sample: str, candidates: List[str], quotechar: str) -> Dict[str, Any]:
+        """The candidate delimiter splitting the most records into the same field count"""
+        best = {'delimiter': candidates[0], 'field_count': 1, 'confidence': 0.0}
+        for candidate in candidates:
+            try:
+                reader = csv.reader(io.StringIO(sample, newline=''), delimiter=candidate, quotechar=quotechar)
+                field_counts = [
+                    len(row) for _, row in zip(range(DataProcessingService.SNIFF_MAX_ROWS), reader) if row
+                ]
+            except csv.Error:
+                continue
+
+            if not field_counts:
+                continue
+
+            modal_count = max(set(field_counts), key=field_counts.count)
+            if modal_count < 2:
+                continue
+
+            confidence = field_counts.count(modal_count) / len(field_counts)
+            if (confidence, modal_count) > (best['confidence'], best['field_count']):
+                best = {'delimiter': candidate, 'field_count': modal_count, 'confidence': confidence}
+
+        return best
+
+    @staticmethod
+    def _quotes_check_out(sample: str, delimiter: str, quotechar: str) -> bool:
+        """Whether quotechar is a consistent quote character of the sample.
+
+        Every field opened by the quote must close right before a delimiter
+        or the end of a line, and every record must have the same number of
+        fields when parsed with it.
+        """
+        quote, separator = re.escape(quotechar), re.escape(delimiter)
+        boundary = f'(?:^|(?<={separator}))'
+        opened = len(re.findall(boundary + quote, sample, flags=re.MULTILINE))
+        closed = len(re.findall(
+            f'{boundary}{quote}(?:[^{quote}]|{quote}{quote})*{quote}(?={separator}|\r?\n|\r|$)',
+            sample, flags=re.MULTILINE
+        ))
+        if opened != closed:
+            return False
+
+        try:
+            reader = csv.reader(io.StringIO(sample, newline=''), delimiter=delimiter, quotechar=quotechar)
+            field_counts = {len(row) for _, row in zip(range(DataProcessingService.SNIFF_MAX_ROWS), reader) if row}
+        except csv.Error:
+            return False
+        return len(field_counts) == 1
+
+    @staticmethod
+    def _sniff_header(sample: str, delimiter: str, quotechar: str) -> bool:
+        """Assume a header row unless the first row looks like data.
+
+        Column names can be numbers, as in 'country,2020,2021', so a missing
+        header is only reported when every field of the first row is a
+        value: a number or a date. csv.Sniffer is not consulted, it mistakes
+        such headers and all-text tables for data.
+        """
+        try:
+            first_row = next(csv.reader(io.StringIO(sample, newline=''), delimiter=delimiter, quotechar=quotechar))
+        except (StopIteration, csv.Error):
+            return True
+
+        fields = [field.strip() for field in first_row if field.strip()]
+        if not fields:
+            return True
+        return not all(DataProcessingService._is_value_field(field) for field in fields)
+
+    @staticmethod
+    def _is_value_field(field: str) -> bool:
+        """Whether a CSV field holds a number or a date rather than a name"""
+        if pd.notna(pd.to_numeric(field, errors='coerce')):
+            return True
+        # Names such as 'May' or 'March' parse as dates, actual dates have digits
+        if not any(character.isdigit() for character in field):
+            return False
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return pd.notna(pd.to_datetime(field, errors='coerce'))
+
+    @staticmethod
+    def build_metadata(
+        df: pd.DataFrame,
+        file_size: int,
+        encoding: str,
+        delimiter: str
+    ) -> Dict[str, Any]:
+        column_inference = DataProcessingService.infer_column_types(df)
 
         # Convert all numpy types in the metadata
-        metadata = {
+        return {
             'total_rows': int(len(df)),
             'total_columns': int(len(df.columns)),
-            'file_size_bytes': int(file_path.stat().st_size),
+            'file_size_bytes': int(file_size),
             'encoding': encoding,
-            'delimiter': delim,
+            'delimiter': delimiter,
             'columns': list(df.columns),
-            'column_types': DataProcessingService.detect_column_types(df),
+            'column_types': {column: inference['type'] for column, inference in column_inference.items()},
+            'column_type_confidence': {column: inference['confidence'] for column, inference in column_inference.items()},
             'memory_usage_bytes': int(df.memory_usage(deep=True).sum()),
             'has_missing_values': bool(df.isnull().any().any()),
             'missing_values_per_column': {col: int(val) for col, val in df.isnull().sum().to_dict().items()}
         }
 
+    @staticmethod
+    def write_columnar_sidecar(
+        df: pd.DataFrame,
+        metadata: Dict[str, Any],
+        source_path: Path,
+        sidecar_path: Path
+    ) -> bool:
+        """Write a typed Parquet copy of a parsed CSV next to the original.
+
+        The encoding, delimiter and the source file's size and mtime are kept
+        in the Parquet schema metadata so readers can detect a stale sidecar.
+        Returns False when the frame cannot be represented in Arrow.
+        """
+        source_stat = source_path.stat()
+        sidecar_info = {
+            'encoding': metadata['encoding'],
+            'delimiter': metadata['delimiter'],
+            'dialect': metadata.get('dialect'),
+            'encoding_confidence': metadata.get('encoding_confidence'),
+            'source_size': source_stat.st_size,
+            'source_mtime_ns': source_stat.st_mtime_ns
+        }
+
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.warning(f"Cannot convert {source_path} to Parquet: {str(e)}")
+            return False
+
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata[DataProcessingService.COLUMNAR_METADATA_KEY] = json.dumps(sidecar_info).encode()
+        table = table.replace_schema_metadata(schema_metadata)
+
+        # Small row groups let filtered reads skip groups by their statistics
+        pq.write_table(table, sidecar_path, row_group_size=DataProcessingService.COLUMNAR_ROW_GROUP_SIZE)
+        return True
+
+    @staticmethod
+    def _open_columnar_sidecar(
+        sidecar_path: Path,
+        source_path: Path
+    ) -> Optional[Tuple[pq.ParquetFile, Dict[str, Any]]]:
+        """Open a sidecar unless it is missing or stale for the source file"""
+        if not sidecar_path.exists():
+            return None
+
+        parquet_file = pq.ParquetFile(sidecar_path)
+        raw_info = (parquet_file.schema_arrow.metadata or {}).get(DataProcessingService.COLUMNAR_METADATA_KEY)
+        if raw_info is None:
+            return None
+
+        sidecar_info = json.loads(raw_info)
+        source_stat = source_path.stat()
+        if (sidecar_info['source_size'] != source_stat.st_size
+                or sidecar_info['source_mtime_ns'] != source_stat.st_mtime_ns):
+            return None
+
+        return parquet_file, sidecar_info
+
+    @staticmethod
+    def read_columnar_sidecar(
+        sidecar_path: Path,
+        source_path: Path,
+        columns: Optional[List[str]] = None
+    ) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """Read a Parquet sidecar, optionally only the given columns.
+
+        Returns None when the sidecar is missing or was written for a
+        different version of the source file.
+        """
+        opened = DataProcessingService._open_columnar_sidecar(sidecar_path, source_path)
+        if opened is None:
+            return None
+
+        parquet_file, sidecar_info = opened
+        schema = parquet_file.schema_arrow
+        if columns is not None:
+            for column in columns:
+                if column not in schema.names:
+                    raise ValueError(f"Column '{column}' not found in dataframe")
+
+        df = DataProcessingService.arrow_to_pandas(parquet_file.read(columns=columns))
+        metadata = DataProcessingService.build_metadata(
+            df, sidecar_info['source_size'], sidecar_info['encoding'], sidecar_info['delimiter']
+        )
+        metadata['encoding_confidence'] = sidecar_info.get('encoding_confidence')
+        metadata['dialect'] = sidecar_info.get('dialect')
+
         return df, metadata
 
+    @staticmethod
+    def read_columnar_head(
+        sidecar_path: Path,
+        source_path: Path,
+        rows: int = PREVIEW_ROWS
+    ) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """Read the first rows of a Parquet sidecar.
+
+        The row count and per-column missing values come from the Parquet
+        footer, so they cover the whole file without reading it.
+        """
+        opened = DataProcessingService._open_columnar_sidecar(sidecar_path, source_path)
+        if opened is None:
+            return None
+
+        parquet_file, sidecar_info = opened
+        batch = next(parquet_file.iter_batches(batch_size=max(rows, 1)), None)
+        if batch is None:
+            df = DataProcessingService.arrow_to_pandas(parquet_file.schema_arrow.empty_table())
+        else:
+            df = DataProcessingService.arrow_to_pandas(pa.Table.from_batches([batch])).head(rows)
+
+        metadata = DataProcessingService.build_metadata(
+            df, sidecar_info['source_size'], sidecar_info['encoding'], sidecar_info['delimiter']
+        )
+        metadata['encoding_confidence'] = sidecar_info.get('encoding_confidence')
+        metadata['dialect'] = sidecar_info.get('dialect')
+        metadata['total_rows'] = parquet_file.metadata.num_rows
+        metadata['is_partial'] = True
+
+        missing_values = DataProcessingService._parquet_null_counts(parquet_file)
+        if missing_values is not None:
+            metadata['missing_values_per_column'] = missing_values
+            metadata['has_missing_values'] = any(count > 0 for count in missing_values.values())
+
+        return df, metadata
+
+    @staticmethod
+    def arrow_to_pandas(table: pa.Table) -> pd.DataFrame:
+        """Convert a sidecar table keeping strings in Arrow, as compact_dataframe does"""
+        string_dtype = pd.StringDtype('pyarrow')
+        return table.to_pandas(
+            types_mapper={pa.string(): string_dtype, pa.large_string(): string_dtype}.get
+        )
+
+    @staticmethod
+    def _parquet_null_counts(parquet_file: pq.ParquetFile) -> Optional[Dict[str, int]]:
+        file_metadata = parquet_file.metadata
+        null_counts = {name: 0 for name in parquet_file.schema_arrow.names}
+
+        for row_group_index in range(file_metadata.num_row_groups):
+            row_group = file_metadata.row_group(row_group_index)
+            for column_index in range(row_group.num_columns):
+                column = row_group.column(column_index)
+                statistics = column.statistics
+                if statistics is None or not statistics.has_null_count:
+                    return None
+                if column.path_in_schema in null_counts:
+                    null_counts[column.path_in_schema] += int(statistics.null_count)
+
+        return null_counts
+
+    @staticmethod
+    def load_dataframe(
+        file_path: Path,
+        sidecar_path: Optional[Path] = None,
+        columns: Optional[List[str]] = None,
+        hints: Optional[Dict[str, Any]] = None
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Load a dataset from its columnar sidecar, falling back to the CSV"""
+        if sidecar_path is not None:
+            result = DataProcessingService.read_columnar_sidecar(
+                sidecar_path, file_path, columns=columns
+            )
+            if result is not None:
+                return result
+
+        return DataProcessingService.parse_csv_file(file_path, hints=hints, columns=columns)
+
     @staticmethod
     def get_data_preview(
         df: pd.DataFrame,
-        rows: int = PREVIEW_ROWS
+        rows: int = PREVIEW_ROWS,
+        total_rows: Optional[int] = None,
+        orient: str = 'records'
     ) -> Dict[str, Any]:
         preview_df = df.head(rows)
 
-        # Convert DataFrame to dictionary format for JSON serialization
-        preview_data = []
-        for _, row in preview_df.iterrows():
-            row_dict = {}
-            for col in preview_df.columns:
-                value = row[col]
-                row_dict[col] = DataProcessingService.convert_numpy_types(
-                    value)
-            preview_data.append(row_dict)
-
         return {
-            'data': preview_data,
+            'data': DataProcessingService.serialize_dataframe(preview_df, orient=orient),
+            'orient': orient,
             'columns': list(df.columns),
-            'preview_rows': len(preview_data),
-            'total_rows': int(len(df))
+            'preview_rows': int(len(preview_df)),
+            'total_rows': int(len(df) if total_rows is None else total_rows)
+        }
+
+    @staticmethod
+    def serialize_dataframe(df: pd.DataFrame, orient: str = 'records') -> Any:
+        """Convert a DataFrame to JSON-ready Python objects column by column.
+
+        Missing values become None, numpy scalars become native Python types
+        and datetimes become ISO 8601 strings. 'records' returns a list of row
+        dictionaries, 'columns' a dictionary of column value lists.
+        """
+        if orient not in DataProcessingService.SERIALIZATION_ORIENTS:
+            raise ValueError(
+                f"Unsupported orient '{orient}'. Use one of: {', '.join(DataProcessingService.SERIALIZATION_ORIENTS)}"
+            )
+
+        columns = {
+            column: DataProcessingService._serialize_column(df[column])
+            for column in df.columns
         }
 
+        if orient == 'columns':
+            return columns
+
+        names = list(columns.keys())
+        return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+    @staticmethod
+    def _serialize_column(series: pd.Series) -> List[Any]:
+        dtype = series.dtype
+
+        if isinstance(dtype, pd.CategoricalDtype):
+            # Serialize the categories once and map the codes, -1 picks the trailing None
+            categories = DataProcessingService._serialize_column(pd.Series(dtype.categories))
+            lookup = np.array(categories + [None], dtype=object)
+            return lookup[series.cat.codes.to_numpy()].tolist()
+
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            mask = series.isna().to_numpy()
+            if getattr(dtype, 'tz', None) is not None:
+                values = np.datetime_as_string(
+                    series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy(), unit='auto', timezone='UTC'
+                )
+            else:
+                values = np.datetime_as_string(series.to_numpy(), unit='auto')
+            values = values.astype(object)
+            values[mask] = None
+            return values.tolist()
+
+        if pd.api.types.is_timedelta64_dtype(dtype):
+            values = series.astype(str).to_numpy(dtype=object)
+            values[series.isna().to_numpy()] = None
+            return values.tolist()
+
+        values = series.to_numpy(dtype=object, na_value=None)
+
+        # Object columns parsed from CSV hold str values, anything else needs
+        # the per-value fallback
+        if dtype == object and pd.api.types.infer_dtype(series, skipna=True) not in ('string', 'empty'):
+            return [DataProcessingService.convert_numpy_types(value) for value in values]
+
+        return values.tolist()
+
     @staticmethod
     def get_column_statistics(df: pd.DataFrame, column: str) -> Dict[str, Any]:
         if column not in df.columns:
             raise ValueError(f"Column '{column}' not found in dataframe")
 
-        col_data = df[column]
-        stats = {
-            'column': column,
-            'total_values': int(len(col_data)),
-            'missing_values': int(col_data.isnull().sum()),
-            'unique_values': int(col_data.nunique()),
-            'data_type': str(col_data.dtype)
+        return DataProcessingService.profile_dataframe(df[[column]])['columns'][column]
+
+    @staticmethod
+    def profile_dataframe(
+        df: pd.DataFrame,
+        timings: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """Compute column statistics for every column of a DataFrame.
+
+        Counts and numeric moments are computed for all columns at once;
+        only the value counts of non-numeric columns need a per-column pass.
+        When a timings dictionary is given, it receives the seconds spent in
+        the per-column pass of each column.
+        """
+        missing_values = df.isna().sum()
+        unique_values = df.nunique()
+
+        numeric_columns = [
+            column for column in df.columns
+            if pd.api.types.is_numeric_dtype(df[column]) and not pd.api.types.is_bool_dtype(df[column])
+        ]
+        if numeric_columns:
+            numeric = df[numeric_columns]
+            moments = numeric.agg(['mean', 'median', 'std', 'min', 'max'])
+            quartiles = numeric.quantile([0.25, 0.5, 0.75])
+            # One float matrix for the histograms, missing values are NaN
+            numeric_values = numeric.to_numpy(dtype=float, na_value=np.nan)
+
+        columns = {}
+        for column in df.columns:
+            column_start = time.perf_counter()
+            col_data = df[column]
+            stats = {
+                'column': column,
+                'total_values': int(len(col_data)),
+                'missing_values': int(missing_values[column]),
+                'unique_values': int(unique_values[column]),
+                'data_type': str(col_data.dtype)
+            }
+
+            # For numeric columns
+            if column in numeric_columns:
+                stats.update({
+                    'mean': DataProcessingService._to_float(moments.at['mean', column]),
+                    'median': DataProcessingService._to_float(moments.at['median', column]),
+                    'std': DataProcessingService._to_float(moments.at['std', column]),
+                    'min': DataProcessingService._to_float(moments.at['min', column]),
+                    'max': DataProcessingService._to_float(moments.at['max', column]),
+                    'quartiles': {
+                        'q1': DataProcessingService._to_float(quartiles.at[0.25, column]),
+                        'q2': DataProcessingService._to_float(quartiles.at[0.5, column]),
+                        'q3': DataProcessingService._to_float(quartiles.at[0.75, column])
+                    }
+                })
+                stats.update(DataProcessingService.histogram_summary(
+                    numeric_values[:, numeric_columns.index(column)]
+                ))
+
+            # For categorical columns
+            else:
+                value_counts = col_data.value_counts()
+                value_counts = value_counts[value_counts > 0]
+                top_values = value_counts.head(DataProcessingService.TOP_VALUES_LIMIT).to_dict()
+                stats.update({
+                    'top_values': {str(k): int(v) for k, v in top_values.items()},
+                    'mode': DataProcessingService._mode_from_counts(value_counts)
+                })
+
+                timestamps = DataProcessingService.datetime_values(col_data)
+                if timestamps is not None:
+                    stats.update(DataProcessingService.histogram_summary(timestamps, is_datetime=True))
+
+            columns[column] = stats
+            if timings is not None:
+                timings[column] = time.perf_counter() - column_start
+
+        return {
+            'total_rows': int(len(df)),
+            'total_columns': int(len(df.columns)),
+            'columns': columns
         }
 
-        # For numeric columns
-        if pd.api.types.is_numeric_dtype(col_data):
-            stats.update({
-                'mean': float(col_data.mean()) if not col_data.empty else None,
-                'median': float(col_data.median()) if not col_data.empty else None,
-                'std': float(col_data.std()) if not col_data.empty else None,
-                'min': float(col_data.min()) if not col_data.empty else None,
-                'max': float(col_data.max()) if not col_data.empty else None,
-                'quartiles': {
-                    'q1': float(col_data.quantile(0.25)) if not col_data.empty else None,
-                    'q2': float(col_data.quantile(0.5)) if not col_data.empty else None,
-                    'q3': float(col_data.quantile(0.75)) if not col_data.empty else None
-                }
-            })
-
-        # For categorical columns
+    @staticmethod
+    def datetime_values(series: pd.Series) -> Optional[np.ndarray]:
+        """Timestamps of a datetime column in nanoseconds, None for other columns"""
+        if pd.api.types.is_datetime64_any_dtype(series):
+            parsed = series
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            inference = DataProcessingService._infer_series_type(series, DataProcessingService.TYPE_SAMPLE_SIZE)
+            if inference['type'] != 'datetime':
+                return None
+            parsed = pd.to_datetime(series, errors='coerce', format='mixed', utc=True)
         else:
-            value_counts = col_data.value_counts()
-            top_values = value_counts.head(10).to_dict()
-            stats.update({
-                'top_values': {str(k): int(v) for k, v in top_values.items()},
-                'mode': str(col_data.mode().iloc[0]) if not col_data.mode().empty else None
-            })
-
-        return stats
+            return None
+
+        if getattr(parsed.dtype, 'tz', None) is not None:
+            parsed = parsed.dt.tz_convert('UTC').dt.tz_localize(None)
+        return parsed.dropna().to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+
+    @staticmethod
+    def histogram_summary(values: np.ndarray, is_datetime: bool = False) -> Dict[str, Any]:
+        """Equal-width and equal-frequency histograms and a sparkline of a column.
+
+        Missing values are ignored. Datetime values are nanosecond timestamps
+        and their bin edges are returned as ISO 8601 strings.
+        """
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return {'histogram': None, 'quantile_histogram': None, 'sparkline': None}
+
+        counts, edges = np.histogram(values, bins=DataProcessingService.HISTOGRAM_BINS)
+        quantile_edges = np.unique(
+            np.quantile(values, np.linspace(0, 1, DataProcessingService.HISTOGRAM_BINS + 1))
+        )
+        if len(quantile_edges) < 2:
+            quantile_edges = edges[[0, -1]]
+        quantile_counts, _ = np.histogram(values, bins=quantile_edges)
+
+        return DataProcessingService.format_histograms(
+            edges, counts, quantile_edges, quantile_counts, is_datetime
+        )
+
+    @staticmethod
+    def format_histograms(
+        edges: np.ndarray,
+        counts: np.ndarray,
+        quantile_edges: np.ndarray,
+        quantile_counts: np.ndarray,
+        is_datetime: bool = False
+    ) -> Dict[str, Any]:
+        """Build the histogram fields of a column profile from bin edges and counts.
+
+        The sparkline sums the equal-width counts into SPARKLINE_BINS coarser
+        bins, small enough to be listed for every column of every file.
+        """
+        def format_edges(values: np.ndarray) -> List[Any]:
+            if is_datetime:
+                # Round away the float noise of interpolated edges, to the millisecond
+                milliseconds = np.round(values / 1e6).astype(np.int64)
+                return DataProcessingService._serialize_column(pd.Series(pd.to_datetime(milliseconds, unit='ms')))
+            return values.astype(float).tolist()
+
+        counts = np.asarray(counts, dtype=np.int64)
+        return {
+            'histogram': {'edges': format_edges(edges), 'counts': counts.tolist()},
+            'quantile_histogram': {
+                'edges': format_edges(quantile_edges),
+                'counts': np.asarray(quantile_counts, dtype=np.int64).tolist()
+            },
+            'sparkline': counts.reshape(DataProcessingService.SPARKLINE_BINS, -1).sum(axis=1).tolist()
+        }
+
+    @staticmethod
+    def _to_float(value: Any) -> Optional[float]:
+        if value is None or pd.isna(value):
+            return None
+        return float(value)
+
+    @staticmethod
+    def _mode_from_counts(value_counts: pd.Series) -> Optional[str]:
+        if value_counts.empty:
+            return None
+
+        # Match Series.mode(), which returns the smallest of tied values
+        tied = list(value_counts.index[value_counts == value_counts.iloc[0]])
+        try:
+            return str(min(tied))
+        except TypeError:
+            return str(tied[0])
@@ -0,0 +1,141 @@
+"""Process-wide cache of parsed datasets"""
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from src.config import get_settings
+
+
+class DatasetCache:
+    """LRU cache of parsed DataFrames bounded by their in-memory size.
+
+    Entries are keyed by file id and validated against the mtime and size of
+    the file on disk, so a file rewritten in place is never served stale.
+    A file can also have variants cached next to its parsed frame, frames
+    derived from it and reorganized for one kind of query, under their own
+    variant name. Cached frames are shared between requests and must not be
+    mutated.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fingerprint(file_path: Path) -> Tuple[int, int]:
+        stat = file_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(
+        self,
+        file_id: str,
+        file_path: Path,
+        variant: Optional[str] = None
+    ) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """Return the cached frame and metadata, or None on a miss"""
+        key = (str(file_id), variant)
+        fingerprint = self._fingerprint(file_path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['fingerprint'] != fingerprint:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry['df'], entry['metadata']
+
+    def put(
+        self,
+        file_id: str,
+        file_path: Path,
+        df: pd.DataFrame,
+        metadata: Dict[str, Any],
+        variant: Optional[str] = None
+    ) -> None:
+        """Store a parsed frame, evicting least recently used entries"""
+        key = (str(file_id), variant)
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            return
+
+        entry = {
+            'fingerprint': self._fingerprint(file_path),
+            'df': df,
+            'metadata': metadata,
+            'size': size
+        }
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+            self._entries[key] = entry
+            self.current_bytes += size
+
+    def get_or_load(
+        self,
+        file_id: str,
+        file_path: Path,
+        loader: Callable[[Path], Tuple[pd.DataFrame, Dict[str, Any]]],
+        variant: Optional[str] = None
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Return the cached frame or parse it with loader and cache it"""
+        cached = self.get(file_id, file_path, variant)
+        if cached is not None:
+            return cached
+
+        df, metadata = loader(file_path)
+        self.put(file_id, file_path, df, metadata, variant)
+        return df, metadata
+
+    def invalidate(self, file_id: str) -> None:
+        """Drop the entries for a file and its variants, e.g. after it has been deleted"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == str(file_id)]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def _remove(self, key: Tuple[str, Optional[str]]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry['size']
+
+
+dataset_cache = DatasetCache(get_settings().DATASET_CACHE_MAX_BYTES)
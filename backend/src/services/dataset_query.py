@@ -0,0 +1,266 @@
+"""Filter, sort and project queries over uploaded datasets"""
+import operator
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.schemas.query import DatasetQuery, QueryFilter
+from src.services.data_processing import DataProcessingService
+
+
+class DatasetQueryService:
+    COMPARISONS = {
+        'eq': operator.eq,
+        'ne': operator.ne,
+        'lt': operator.lt,
+        'le': operator.le,
+        'gt': operator.gt,
+        'ge': operator.ge
+    }
+
+    @staticmethod
+    def touched_columns(query: DatasetQuery) -> Optional[List[str]]:
+        """Columns a query reads, output columns first, or None for all"""
+        if query.columns is None:
+            return None
+
+        columns = list(query.columns)
+        for column in [f.column for f in query.filters] + [s.column for s in query.sort]:
+            if column not in columns:
+                columns.append(column)
+        return columns
+
+    @staticmethod
+    def _check_columns(available: List[str], columns: List[str]) -> None:
+        for column in columns:
+            if column not in available:
+                raise ValueError(f"Column '{column}' not found in dataframe")
+
+    @staticmethod
+    def build_mask(df: pd.DataFrame, filters: List[QueryFilter]) -> np.ndarray:
+        """Evaluate AND-combined predicates into one boolean row mask"""
+        mask = np.ones(len(df), dtype=bool)
+        for query_filter in filters:
+            series = df[query_filter.column]
+            try:
+                mask &= DatasetQueryService._evaluate(series, query_filter)
+            except TypeError:
+                raise ValueError(
+                    f"Cannot apply '{query_filter.op}' to column '{query_filter.column}' of type {series.dtype}"
+                )
+        return mask
+
+    @staticmethod
+    def _evaluate(series: pd.Series, query_filter: QueryFilter) -> np.ndarray:
+        op, value = query_filter.op, query_filter.value
+
+        if op == 'is_null':
+            return series.isna().to_numpy()
+        if op == 'not_null':
+            return series.notna().to_numpy()
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Evaluate once per category and map the codes, -1 picks the trailing False
+            matches = DatasetQueryService._evaluate(pd.Series(series.cat.categories), query_filter)
+            return np.append(matches, False)[series.cat.codes.to_numpy()]
+
+        # Missing values never match a predicate, as in SQL
+        present = series.notna().to_numpy()
+
+        if op in ('in', 'not_in'):
+            if not isinstance(value, list):
+                raise ValueError(f"'{op}' requires a list value")
+            values = [DatasetQueryService._coerce_value(series, item) for item in value]
+            matches = series.isin(values).to_numpy()
+            return matches if op == 'in' else ~matches & present
+
+        if op == 'contains':
+            if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+                raise TypeError
+            return series.str.contains(str(value), regex=False, na=False).to_numpy(dtype=bool)
+
+        value = DatasetQueryService._coerce_value(series, value)
+        result = DatasetQueryService.COMPARISONS[op](series, value)
+        return result.fillna(False).to_numpy(dtype=bool) & present
+
+    @staticmethod
+    def _coerce_value(series: pd.Series, value: Any) -> Any:
+        """Convert a JSON value to the type of the column it is compared with"""
+        if value is None or not isinstance(value, str):
+            return value
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return pd.Timestamp(value)
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            try:
+                return float(value)
+            except ValueError:
+                raise ValueError(f"Value '{value}' is not a number")
+        return value
+
+    @staticmethod
+    def build_arrow_filter(schema: pa.Schema, filters: List[QueryFilter]) -> Optional[pc.Expression]:
+        """Translate predicates to an Arrow expression for Parquet pushdown"""
+        expression = None
+        for query_filter in filters:
+            field = pc.field(query_filter.column)
+            field_type = schema.field(query_filter.column).type
+            op, value = query_filter.op, query_filter.value
+
+            # Dictionary-encoded columns compare with values of their value type
+            if pa.types.is_dictionary(field_type):
+                field_type = field_type.value_type
+                if op == 'contains':
+                    field = field.cast(field_type)
+
+            if op == 'is_null':
+                condition = field.is_null()
+            elif op == 'not_null':
+                condition = field.is_valid()
+            elif op in ('in', 'not_in'):
+                if not isinstance(value, list):
+                    raise ValueError(f"'{op}' requires a list value")
+                compared, value_set = DatasetQueryService._arrow_value_set(field, value, field_type)
+                condition = compared.isin(value_set)
+                if op == 'not_in':
+                    condition = ~condition & field.is_valid()
+            elif op == 'contains':
+                if not pa.types.is_string(field_type) and not pa.types.is_large_string(field_type):
+                    raise ValueError(
+                        f"Cannot apply 'contains' to column '{query_filter.column}' of type {field_type}"
+                    )
+                condition = pc.match_substring(field, str(value))
+            else:
+                condition = DatasetQueryService.COMPARISONS[op](
+                    field, DatasetQueryService._arrow_scalar(value, field_type)
+                )
+
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    @staticmethod
+    def _arrow_scalar(value: Any, field_type: pa.DataType) -> pa.Scalar:
+        if DatasetQueryService._is_arrow_number(field_type):
+            # Compute kernels promote numeric scalars, so narrowed columns need no cast
+            return pa.scalar(DatasetQueryService._arrow_number(value))
+        scalar = pa.scalar(value)
+        # Strings compared with typed columns are parsed, e.g. ISO timestamps
+        if isinstance(value, str) and not pa.types.is_string(field_type):
+            try:
+                return scalar.cast(field_type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                raise ValueError(f"Value '{value}' cannot be compared with a column of type {field_type}")
+        return scalar
+
+    @staticmethod
+    def _arrow_value_set(
+        field: pc.Expression,
+        values: List[Any],
+        field_type: pa.DataType
+    ) -> Tuple[pc.Expression, pa.Array]:
+        """The field and a value set of a common type for 'isin'.
+
+        Integer columns of the sidecar are narrowed, e.g. to int8, so values
+        out of their range or with a fraction are matched against the column
+        widened to int64 or float64, like the pandas path compares them.
+        """
+        numeric = DatasetQueryService._is_arrow_number(field_type)
+        if numeric:
+            values = [DatasetQueryService._arrow_number(value) for value in values]
+        try:
+            return field, pa.array(values).cast(field_type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            if not numeric:
+                raise ValueError(f"Values {values} cannot be compared with a column of type {field_type}")
+
+        integral = all(value is None or isinstance(value, int) for value in values)
+        wide_type = pa.int64() if integral and pa.types.is_integer(field_type) else pa.float64()
+        return field.cast(wide_type), pa.array(values, type=wide_type)
+
+    @staticmethod
+    def _is_arrow_number(field_type: pa.DataType) -> bool:
+        return pa.types.is_integer(field_type) or pa.types.is_floating(field_type)
+
+    @staticmethod
+    def _arrow_number(value: Any) -> Any:
+        """Parse a JSON string compared with a numeric column, as _coerce_value does"""
+        if not isinstance(value, str):
+            return value
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f"Value '{value}' is not a number")
+
+    @staticmethod
+    def read_columnar(
+        sidecar_path: Path,
+        source_path: Path,
+        query: DatasetQuery
+    ) -> Optional[pd.DataFrame]:
+        """Read only the touched columns and matching rows of a Parquet sidecar.
+
+        Predicates are pushed down to the Parquet reader, which skips row
+        groups whose statistics exclude them. Returns None when the sidecar
+        is missing or stale.
+        """
+        opened = DataProcessingService._open_columnar_sidecar(sidecar_path, source_path)
+        if opened is None:
+            return None
+
+        parquet_file, _ = opened
+        schema = parquet_file.schema_arrow
+        columns = DatasetQueryService.touched_columns(query)
+        DatasetQueryService._check_columns(
+            schema.names,
+            (columns or []) + [f.column for f in query.filters] + [s.column for s in query.sort]
+        )
+
+        try:
+            table = pq.read_table(
+                sidecar_path,
+                columns=columns,
+                filters=DatasetQueryService.build_arrow_filter(schema, query.filters)
+            )
+        except (pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+            raise ValueError(f"Invalid filter: {str(e)}")
+
+        return DataProcessingService.arrow_to_pandas(table)
+
+    @staticmethod
+    def execute(
+        df: pd.DataFrame,
+        query: DatasetQuery,
+        filtered: bool = False
+    ) -> Tuple[pd.DataFrame, int]:
+        """Filter, sort and page a frame.
+
+        Returns the requested page and the number of matching rows. Pass
+        filtered=True when the predicates were already applied upstream.
+        """
+        output_columns = query.columns if query.columns is not None else list(df.columns)
+        DatasetQueryService._check_columns(
+            list(df.columns),
+            output_columns + [f.column for f in query.filters] + [s.column for s in query.sort]
+        )
+
+        if query.filters and not filtered:
+            df = df[DatasetQueryService.build_mask(df, query.filters)]
+        matched_rows = len(df)
+
+        if query.sort:
+            try:
+                df = df.sort_values(
+                    by=[s.column for s in query.sort],
+                    ascending=[not s.descending for s in query.sort],
+                    na_position='last',
+                    kind='stable'
+                )
+            except TypeError:
+                raise ValueError("Cannot sort columns with mixed value types")
+
+        page = df.iloc[query.offset:query.offset + query.limit]
+        return page[output_columns], matched_rows
@@ -0,0 +1,223 @@
+"""Downsampling of large series for charts
+
+Payloads are sized by the pixel width of the chart rather than the number
+of rows: a line chart cannot show more than a few points per pixel column,
+so drawing the reduced series looks the same as drawing all of it.
+
+- 'lttb' (Largest-Triangle-Three-Buckets) keeps one point per bucket, the
+  one forming the largest triangle with its neighbours, which preserves the
+  visual shape of a line.
+- 'minmax' keeps the first, last, minimum and maximum point of every pixel
+  column, so no spike is ever lost.
+- 'sample' is a stratified sample for scatter plots: every occupied grid
+  cell keeps at least one point and dense cells keep points in proportion
+  to their density.
+- 'bins' returns 2D counts on a grid with the aspect ratio of the chart
+  and at most max_points cells, so the payload stays within the point
+  budget of the other modes however large the chart is.
+"""
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.schemas.query import SeriesQuery
+from src.services.data_processing import DataProcessingService
+
+
+class DownsamplingService:
+    SAMPLE_GRID_SIZE = 32
+    SAMPLE_SEED = 0
+
+    @staticmethod
+    def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+        """Indices of the points selected by Largest-Triangle-Three-Buckets"""
+        n = len(x)
+        if threshold >= n or threshold < 3:
+            return np.arange(n)
+
+        # Buckets between the fixed first and last points
+        edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+        selected = np.empty(threshold, dtype=np.int64)
+        selected[0], selected[-1] = 0, n - 1
+
+        previous = 0
+        for bucket in range(threshold - 2):
+            start, end = edges[bucket], edges[bucket + 1]
+            if bucket + 2 < len(edges):
+                next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+                next_x, next_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+            else:
+                next_x, next_y = x[-1], y[-1]
+
+            # Twice the triangle area, the constant factor does not change the argmax
+            areas = np.abs(
+                (x[previous] - next_x) * (y[start:end] - y[previous])
+                - (x[previous] - x[start:end]) * (next_y - y[previous])
+            )
+            previous = start + int(np.argmax(areas))
+            selected[bucket + 1] = previous
+
+        return selected
+
+    @staticmethod
+    def min_max(x: np.ndarray, y: np.ndarray, buckets: int) -> np.ndarray:
+        """Indices of the first, last, min and max point in each x bucket"""
+        n = len(x)
+        if n <= 4 * buckets:
+            return np.arange(n)
+
+        span = x[-1] - x[0]
+        if span > 0:
+            bucket_ids = np.minimum(((x - x[0]) / span * buckets).astype(np.int64), buckets - 1)
+        else:
+            bucket_ids = np.arange(n) * buckets // n
+
+        # Bucket ids are sorted because x is, so each bucket is a contiguous run
+        starts = np.flatnonzero(np.diff(bucket_ids, prepend=-1))
+        ends = np.append(starts[1:], n) - 1
+
+        # Within each run sorted by y, the first point is the minimum and the last the maximum
+        order = np.lexsort((y, bucket_ids))
+        minima, maxima = order[starts], order[ends]
+
+        return np.unique(np.concatenate([starts, ends, minima, maxima]))
+
+    @staticmethod
+    def stratified_sample(x: np.ndarray, y: np.ndarray, max_points: int, grid_size: int) -> np.ndarray:
+        """Indices of a density-preserving sample that keeps sparse regions"""
+        n = len(x)
+        if n <= max_points:
+            return np.arange(n)
+
+        cells = DownsamplingService._grid_cells(x, grid_size) * grid_size + DownsamplingService._grid_cells(y, grid_size)
+        counts = np.bincount(cells, minlength=grid_size * grid_size)
+        quotas = np.maximum(1, np.round(counts * (max_points / n))).astype(np.int64)
+
+        # Random rank of every point within its cell, keep ranks below the quota
+        rng = np.random.default_rng(DownsamplingService.SAMPLE_SEED)
+        order = np.lexsort((rng.random(n), cells))
+        sorted_cells = cells[order]
+        cell_starts = np.flatnonzero(np.diff(sorted_cells, prepend=-1))
+        ranks = np.arange(n) - np.repeat(cell_starts, np.diff(np.append(cell_starts, n)))
+
+        return np.sort(order[ranks < quotas[sorted_cells]])
+
+    @staticmethod
+    def _grid_cells(values: np.ndarray, grid_size: int) -> np.ndarray:
+        low, high = values.min(), values.max()
+        if high <= low:
+            return np.zeros(len(values), dtype=np.int64)
+        return np.minimum(((values - low) / (high - low) * grid_size).astype(np.int64), grid_size - 1)
+
+    @staticmethod
+    def to_numeric_axis(series: pd.Series) -> Tuple[np.ndarray, bool]:
+        """Convert an axis to float values, parsing dates when needed.
+
+        Returns the values and whether they are datetimes in nanoseconds.
+        """
+        if pd.api.types.is_bool_dtype(series):
+            return series.astype(float).to_numpy(), False
+        if pd.api.types.is_numeric_dtype(series):
+            return series.to_numpy(dtype=float, na_value=np.nan), False
+
+        parsed = series
+        if not pd.api.types.is_datetime64_any_dtype(series):
+            parsed = pd.to_datetime(series, errors='coerce', format='mixed')
+            if parsed.notna().sum() < series.notna().sum() * DataProcessingService.TYPE_CONFORMANCE_THRESHOLD:
+                raise ValueError(f"Column '{series.name}' is neither numeric nor a date")
+        if getattr(parsed.dtype, 'tz', None) is not None:
+            parsed = parsed.dt.tz_convert('UTC').dt.tz_localize(None)
+
+        values = parsed.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+        values[parsed.isna().to_numpy()] = np.nan
+        return values, True
+
+    @staticmethod
+    def _axis_values(values: np.ndarray, is_datetime: bool) -> List[Any]:
+        if is_datetime:
+            return DataProcessingService._serialize_column(pd.Series(pd.to_datetime(values.astype(np.int64))))
+        return values.tolist()
+
+    @staticmethod
+    def downsample(df: pd.DataFrame, query: SeriesQuery) -> Dict[str, Any]:
+        """Reduce an x/y series to what a chart of the given size can show"""
+        for column in [query.x] + query.y:
+            if column not in df.columns:
+                raise ValueError(f"Column '{column}' not found in dataframe")
+
+        x, x_is_datetime = DownsamplingService.to_numeric_axis(df[query.x])
+        result: Dict[str, Any] = {
+            'mode': query.mode,
+            'x': query.x,
+            'source_rows': int(len(df)),
+            'series': []
+        }
+
+        # Line modes need x in ascending order
+        if query.mode in ('lttb', 'minmax'):
+            order = np.argsort(x, kind='stable')
+        else:
+            order = np.arange(len(x))
+
+        for column in query.y:
+            y, y_is_datetime = DownsamplingService.to_numeric_axis(df[column])
+            rows = order[~(np.isnan(x[order]) | np.isnan(y[order]))]
+            xs, ys = x[rows], y[rows]
+
+            if query.mode == 'bins':
+                result['series'].append(
+                    DownsamplingService._bin_2d(
+                        xs, ys, query.width, query.height, query.max_points, column, x_is_datetime, y_is_datetime
+                    )
+                )
+                continue
+
+            if query.mode == 'lttb':
+                selected = DownsamplingService.lttb(xs, ys, query.width)
+            elif query.mode == 'minmax':
+                selected = DownsamplingService.min_max(xs, ys, query.width)
+            else:
+                selected = DownsamplingService.stratified_sample(
+                    xs, ys, query.max_points, DownsamplingService.SAMPLE_GRID_SIZE
+                )
+
+            # Return the original values of the selected rows
+            picked = df.iloc[rows[selected]]
+            result['series'].append({
+                'column': column,
+                'points': int(len(selected)),
+                'x': DataProcessingService._serialize_column(picked[query.x]),
+                'y': DataProcessingService._serialize_column(picked[column])
+            })
+
+        return result
+
+    @staticmethod
+    def _bin_2d(
+        x: np.ndarray,
+        y: np.ndarray,
+        width: int,
+        height: int,
+        max_cells: int,
+        column: str,
+        x_is_datetime: bool,
+        y_is_datetime: bool
+    ) -> Dict[str, Any]:
+        if not len(x):
+            return {'column': column, 'x_edges': [], 'y_edges': [], 'cells': []}
+
+        if width * height > max_cells:
+            scale = (max_cells / (width * height)) ** 0.5
+            width, height = max(1, int(width * scale)), max(1, int(height * scale))
+
+        counts, x_edges, y_edges = np.histogram2d(x, y, bins=[width, height])
+        x_index, y_index = np.nonzero(counts)
+
+        return {
+            'column': column,
+            'x_edges': DownsamplingService._axis_values(x_edges, x_is_datetime),
+            'y_edges': DownsamplingService._axis_values(y_edges, y_is_datetime),
+            # Sparse [x bin, y bin, count] triples of the occupied cells
+            'cells': np.column_stack([x_index, y_index, counts[x_index, y_index]]).astype(np.int64).tolist()
+        }
@@ -0,0 +1,155 @@
+"""Parallel parsing of large CSV files over record-aligned byte ranges
+
+The row index already records the byte offset of every CHECKPOINT_ROWS-th
+record, found with a quote-aware scan, so its checkpoints are safe places
+to cut a file: no range starts inside a quoted field. Each range is parsed
+with the same read_csv options as DataProcessingService.parse_csv_file in a
+separate process, compacted there so little data is pickled back, and the
+parts are concatenated in file order.
+
+Type inference is per range, so a column can come back numeric in one
+range and text in another. Such columns are parsed again as text in every
+range, which is what a single read_csv call infers for them.
+"""
+import io
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from src.services.data_processing import DataProcessingService
+
+
+def parse_byte_range(
+    file_path: str,
+    start: int,
+    end: Optional[int],
+    columns: List[str],
+    encoding: str,
+    dialect: Dict[str, Any],
+    text_columns: Sequence[str] = ()
+) -> pd.DataFrame:
+    """Parse the records in [start, end) of a CSV file, end None for the rest.
+
+    Only text_columns are parsed, as strings, when it is given.
+    """
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        data = file.read() if end is None else file.read(end - start)
+
+    read_options = {}
+    if text_columns:
+        read_options['usecols'] = list(text_columns)
+        read_options['dtype'] = {column: str for column in text_columns}
+
+    df = pd.read_csv(
+        io.BytesIO(data),
+        encoding=encoding,
+        delimiter=dialect['delimiter'],
+        quotechar=dialect['quotechar'],
+        header=None,
+        names=columns,
+        on_bad_lines='skip',
+        low_memory=False,
+        **read_options
+    )
+    return DataProcessingService.compact_dataframe(df)
+
+
+class ParallelCSVParser:
+    # Smaller ranges are not worth the cost of a worker process
+    MIN_RANGE_BYTES = 8 * 1024 * 1024
+
+    def __init__(self, workers: int):
+        self.workers = workers
+
+    @staticmethod
+    def split_ranges(index: Dict[str, Any], parts: int) -> List[Tuple[int, Optional[int]]]:
+        """Cut a file into about `parts` byte ranges at row index checkpoints"""
+        offsets = index['offsets']
+        if not offsets:
+            return []
+
+        step = max(1, math.ceil(len(offsets) / parts))
+        starts = offsets[::step]
+        return list(zip(starts, starts[1:] + [None]))
+
+    def parse(self, file_path: Path, index: Dict[str, Any]) -> pd.DataFrame:
+        """Parse the data rows of an indexed CSV file in parallel"""
+        parts = min(self.workers, max(1, file_path.stat().st_size // self.MIN_RANGE_BYTES))
+        ranges = self.split_ranges(index, parts)
+        columns = index['columns']
+        if not ranges:
+            return pd.DataFrame(columns=columns)
+        if len(ranges) == 1:
+            return parse_byte_range(str(file_path), ranges[0][0], None, columns, index['encoding'], index['dialect'])
+
+        def parse_ranges(pool: ProcessPoolExecutor, text_columns: Sequence[str] = ()) -> List[pd.DataFrame]:
+            futures = [
+                pool.submit(
+                    parse_byte_range, str(file_path), start, end,
+                    columns, index['encoding'], index['dialect'], text_columns
+                )
+                for start, end in ranges
+            ]
+            return [future.result() for future in futures]
+
+        with ProcessPoolExecutor(
+            max_workers=len(ranges),
+            mp_context=multiprocessing.get_context('spawn')
+        ) as pool:
+            frames = parse_ranges(pool)
+
+            text_columns = self.conflicting_columns(frames)
+            if text_columns:
+                for frame, text in zip(frames, parse_ranges(pool, text_columns)):
+                    frame[text_columns] = text[text_columns]
+
+        return self.concat(frames)
+
+    def parse_csv(self, file_path: Path, index: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Parallel counterpart of DataProcessingService.parse_csv_file"""
+        df = self.parse(file_path, index)
+        metadata = DataProcessingService.build_metadata(
+            df, file_path.stat().st_size, index['encoding'], index['dialect']['delimiter']
+        )
+        metadata['dialect'] = index['dialect']
+        return df, metadata
+
+    @staticmethod
+    def _value_kind(series: pd.Series) -> Optional[str]:
+        if not series.notna().any():
+            return None
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.infer_dtype(series, skipna=True) == 'boolean':
+            return 'boolean'
+        if pd.api.types.is_numeric_dtype(series):
+            return 'numeric'
+        return 'text'
+
+    @staticmethod
+    def conflicting_columns(frames: List[pd.DataFrame]) -> List[str]:
+        """Columns inferred as different kinds of values in different ranges"""
+        conflicts = []
+        for column in frames[0].columns:
+            kinds = {ParallelCSVParser._value_kind(frame[column]) for frame in frames} - {None}
+            if len(kinds) > 1:
+                conflicts.append(column)
+        return conflicts
+
+    @staticmethod
+    def concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """Concatenate parsed ranges, merging the categories of categorical columns"""
+        columns = {}
+        for column in frames[0].columns:
+            pieces = [frame[column] for frame in frames]
+            if all(isinstance(piece.dtype, pd.CategoricalDtype) for piece in pieces):
+                # Sorted like the categories of a single astype('category')
+                columns[column] = pd.Series(union_categoricals(pieces, sort_categories=True), name=column)
+            else:
+                columns[column] = pd.concat(pieces, ignore_index=True)
+
+        return DataProcessingService.compact_dataframe(pd.DataFrame(columns))
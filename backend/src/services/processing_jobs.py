@@ -0,0 +1,359 @@
+"""Background processing of uploaded files in a process pool"""
+import logging
+import multiprocessing
+import threading
+import time
+import tracemalloc
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+from src.database.connection import SessionLocal
+from src.models.file_profile import FileProfile
+from src.models.processing_job import ProcessingJob
+from src.services.chunked_stats import ChunkedStatisticsEngine
+from src.services.data_processing import DataProcessingService
+from src.services.parallel_csv import ParallelCSVParser
+from src.services.row_index import RowIndexService
+from src.services.sampling import ReservoirSampler, SamplingService
+
+logger = logging.getLogger(__name__)
+
+
+def process_csv_file(
+    file_path: str,
+    sidecar_path: str,
+    index_path: str,
+    hints: Optional[Dict[str, Any]] = None,
+    sample_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """Parse, convert, index, sample and profile one uploaded CSV file.
+
+    This is the unit of work executed in the worker processes, so it only
+    takes and returns plain picklable values. Large files are parsed in
+    parallel over row index checkpoints; files too large to hold in memory
+    are profiled chunk by chunk and get no columnar sidecar. A failed
+    sidecar conversion or row index is logged and does not fail the job.
+    The peak memory does not include the parsing processes.
+
+    The encoding and dialect are detected once, or taken from the parse
+    hints overriding them, and returned with the parsed column dtypes as
+    'parse_hints' to be recorded on the file. When sample_path is given, a
+    uniform row sample for approximate previews and statistics is drawn
+    from the parsed frame or during the chunked profiling pass and cached
+    there; failing to write it does not fail the job either.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        full_path = Path(file_path)
+        file_size = full_path.stat().st_size
+        columnar = False
+        hints = hints or {}
+        encoding, encoding_confidence = DataProcessingService.resolve_encoding(full_path, None, hints)
+        dialect = DataProcessingService.resolve_dialect(full_path, encoding, hinted=hints.get('dialect'))
+        parse_hints = {
+            'encoding': encoding,
+            'encoding_confidence': encoding_confidence,
+            'dialect': {key: dialect[key] for key in DataProcessingService.DIALECT_KEYS}
+        }
+
+        # The row index comes first, its checkpoints split large files for parallel parsing
+        index = None
+        try:
+            index = RowIndexService.build_index(full_path, encoding, dialect)
+            if index is not None:
+                RowIndexService.save_index(index, Path(index_path))
+        except Exception as e:
+            logger.warning(f"Row indexing failed for {file_path}: {str(e)}")
+
+        sampler = ReservoirSampler(SamplingService.SAMPLE_ROWS, SamplingService.SAMPLE_SEED)
+        if file_size > DataProcessingService.MAX_FILE_SIZE:
+            engine = ChunkedStatisticsEngine()
+            with engine.read_chunks(full_path, encoding, dialect=dialect) as reader:
+                profile = engine.profile_chunks(sampler.consume(reader))
+            # Recorded for the metadata endpoint, which does not parse large files
+            profile['column_types'] = DataProcessingService.detect_column_types(sampler.sample())
+        else:
+            parse_workers = get_settings().CSV_PARSE_WORKERS
+            # The parallel parser infers types per range and cannot apply dtype overrides
+            overridden = any(hints.get(key) for key in ('column_dtypes', 'parse_dates', 'engine'))
+            if (index is not None and parse_workers > 1 and not overridden
+                    and file_size >= 2 * ParallelCSVParser.MIN_RANGE_BYTES):
+                df, metadata = ParallelCSVParser(parse_workers).parse_csv(full_path, index)
+            else:
+                df, metadata = DataProcessingService.parse_csv_file(
+                    full_path, hints={**hints, **parse_hints, 'dialect': dialect}
+                )
+            # The parallel parser takes the encoding from the row index
+            metadata.setdefault('encoding_confidence', encoding_confidence)
+            parse_hints = DataProcessingService.parse_hints(df, metadata)
+            try:
+                columnar = DataProcessingService.write_columnar_sidecar(
+                    df, metadata, full_path, Path(sidecar_path)
+                )
+            except Exception as e:
+                logger.warning(f"Columnar conversion failed for {file_path}: {str(e)}")
+            sampler.update(df)
+            profile = DataProcessingService.profile_dataframe(df)
+            profile['column_types'] = metadata.get('column_types') or DataProcessingService.detect_column_types(df)
+
+        if sample_path is not None:
+            try:
+                SamplingService.write_sample(sampler.sample(), sampler.rows_seen, full_path, Path(sample_path))
+            except Exception as e:
+                logger.warning(f"Sampling failed for {file_path}: {str(e)}")
+
+        _, peak_memory = tracemalloc.get_traced_memory()
+        return {
+            'columnar': columnar,
+            'profile': profile,
+            'parse_hints': parse_hints,
+            'duration_seconds': time.perf_counter() - start,
+            'peak_memory_bytes': peak_memory
+        }
+    finally:
+        tracemalloc.stop()
+
+
+class ProcessingQueue:
+    """Runs processing jobs in a bounded process pool and persists their state.
+
+    Each worker slot is paired with a dispatcher thread that marks its job as
+    running, waits on the worker process and records the outcome, so a job
+    is only reported as running while a worker is actually executing it.
+    With max_workers set to 0 jobs run inline in the calling thread instead.
+    """
+
+    # Recycle workers periodically so memory fragmented by pandas is returned
+    MAX_TASKS_PER_CHILD = 20
+    SUPERSEDED_ERROR = "Superseded by a newer processing job"
+
+    def __init__(
+        self,
+        max_workers: int,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        self.max_workers = max_workers
+        self.session_factory = session_factory
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._dispatcher: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._running = 0
+        self._lock = threading.Lock()
+
+    @property
+    def inline(self) -> bool:
+        return self.max_workers <= 0
+
+    def _ensure_started(self) -> None:
+        # Worker processes are spawned lazily, on the first submitted job
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                max_tasks_per_child=self.MAX_TASKS_PER_CHILD
+            )
+            self._dispatcher = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='processing-dispatcher'
+            )
+
+    def submit(
+        self,
+        job_id: str,
+        file_path: str,
+        sidecar_path: str,
+        columnar_path: str,
+        index_path: str,
+        hints: Optional[Dict[str, Any]] = None,
+        sample_path: Optional[str] = None
+    ) -> Future:
+        """Queue a job for a worker process.
+
+        columnar_path is the storage path recorded on the file when the
+        sidecar at sidecar_path was written, hints are the parse hints
+        overridden for the file and sample_path is where its row sample is
+        cached. Returns the dispatcher future.
+        """
+        key = str(job_id)
+        with self._lock:
+            self._ensure_started()
+            future = self._dispatcher.submit(
+                self._dispatch, key, file_path, sidecar_path, columnar_path, index_path, hints, sample_path
+            )
+            self._pending[key] = future
+        future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def supersede(self, db: Session, file_id: str) -> None:
+        """Mark the queued and running jobs of a file as failed.
+
+        Used before processing a file again with new parse hints: a job
+        that has not started is skipped and the results of a running one
+        are discarded, so it cannot overwrite those of the newer job. The
+        caller commits.
+        """
+        jobs = db.query(ProcessingJob).filter(
+            ProcessingJob.file_id == file_id,
+            ProcessingJob.status.in_([ProcessingJob.QUEUED, ProcessingJob.RUNNING])
+        ).all()
+
+        with self._lock:
+            for job in jobs:
+                future = self._pending.get(str(job.id))
+                if future is not None:
+                    future.cancel()
+
+        for job in jobs:
+            job.status = ProcessingJob.FAILED
+            job.error = self.SUPERSEDED_ERROR
+            job.finished_at = datetime.now(timezone.utc)
+
+    def run(
+        self,
+        db: Session,
+        job_id: str,
+        file_path: str,
+        sidecar_path: str,
+        columnar_path: str,
+        index_path: str,
+        hints: Optional[Dict[str, Any]] = None,
+        sample_path: Optional[str] = None
+    ) -> None:
+        """Run a job synchronously in the calling thread"""
+        self._execute(
+            db, str(job_id),
+            lambda: process_csv_file(file_path, sidecar_path, index_path, hints, sample_path),
+            sidecar_path, columnar_path, index_path, sample_path
+        )
+
+    def _dispatch(
+        self,
+        job_id: str,
+        file_path: str,
+        sidecar_path: str,
+        columnar_path: str,
+        index_path: str,
+        hints: Optional[Dict[str, Any]],
+        sample_path: Optional[str]
+    ) -> None:
+        db = self.session_factory()
+        try:
+            self._execute(
+                db, job_id,
+                lambda: self._pool.submit(
+                    process_csv_file, file_path, sidecar_path, index_path, hints, sample_path
+                ).result(),
+                sidecar_path, columnar_path, index_path, sample_path
+            )
+        finally:
+            db.close()
+
+    def _execute(
+        self,
+        db: Session,
+        job_id: str,
+        runner: Callable[[], Dict[str, Any]],
+        sidecar_path: str,
+        columnar_path: str,
+        index_path: str,
+        sample_path: Optional[str] = None
+    ) -> None:
+        job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+        if job is None or job.status == ProcessingJob.FAILED:
+            # The file was deleted or the job superseded before it started
+            return
+
+        job.status = ProcessingJob.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        db.commit()
+
+        with self._lock:
+            self._running += 1
+        try:
+            result = runner()
+        except Exception as e:
+            logger.warning(f"Processing job {job_id} failed: {str(e)}")
+            result = None
+            error = str(e) or e.__class__.__name__
+        finally:
+            with self._lock:
+                self._running -= 1
+
+        db.expire_all()
+        job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+        if job is None or job.status != ProcessingJob.RUNNING:
+            # The file was deleted or the job superseded while it was being
+            # processed. A superseded job may have replaced the sidecars of
+            # the newer job, which are rebuilt on demand once removed.
+            Path(sidecar_path).unlink(missing_ok=True)
+            Path(index_path).unlink(missing_ok=True)
+            if sample_path is not None:
+                Path(sample_path).unlink(missing_ok=True)
+            return
+
+        job.finished_at = datetime.now(timezone.utc)
+        if result is None:
+            job.status = ProcessingJob.FAILED
+            job.error = error
+        else:
+            job.status = ProcessingJob.DONE
+            job.duration_seconds = result['duration_seconds']
+            job.peak_memory_bytes = result['peak_memory_bytes']
+            if result['columnar']:
+                job.file.columnar_path = columnar_path
+            job.file.encoding = result['parse_hints']['encoding']
+            job.file.encoding_confidence = result['parse_hints']['encoding_confidence']
+            job.file.dialect = result['parse_hints']['dialect']
+            job.file.column_dtypes = result['parse_hints'].get('column_dtypes')
+            if job.file.profile is None:
+                job.file.profile = FileProfile(profile=result['profile'])
+            else:
+                job.file.profile.profile = result['profile']
+        db.commit()
+
+    def _forget(self, job_id: str) -> None:
+        with self._lock:
+            self._pending.pop(job_id, None)
+
+    def shutdown(self) -> None:
+        """Stop the workers, marking jobs that never started as failed"""
+        with self._lock:
+            pool, dispatcher = self._pool, self._dispatcher
+            self._pool, self._dispatcher = None, None
+            cancelled = [job_id for job_id, future in self._pending.items() if future.cancel()]
+        if dispatcher is not None:
+            dispatcher.shutdown(wait=False, cancel_futures=True)
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if not cancelled:
+            return
+        db = self.session_factory()
+        try:
+            db.query(ProcessingJob).filter(ProcessingJob.id.in_(cancelled)).update(
+                {
+                    ProcessingJob.status: ProcessingJob.FAILED,
+                    ProcessingJob.error: "Interrupted by server shutdown",
+                    ProcessingJob.finished_at: datetime.now(timezone.utc)
+                },
+                synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'running': self._running,
+                'queued': len(self._pending) - self._running if not self.inline else 0
+            }
+
+
+processing_queue = ProcessingQueue(get_settings().PROCESSING_WORKERS)
@@ -0,0 +1,183 @@
+"""Process-wide cache of computed query results"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm.attributes import NO_VALUE
+
+from src.config import get_settings
+from src.models.file import File
+
+
+class ResultCache:
+    """LRU cache of JSON-ready query results bounded by their serialized size.
+
+    Entries are keyed by the content hash of the source file, the kind of
+    query, its normalized spec and the parse hints the file is read with,
+    so identical queries against identical content parsed the same way
+    share an entry regardless of which file row they came from.
+    Every hit is counted towards the bytes and compute time it saved.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bytes_saved = 0
+        self.compute_seconds_saved = 0.0
+        self._entries: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._keys_by_hash: Dict[str, Set[Tuple[str, str, str]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        content_hash: str,
+        kind: str,
+        spec: Dict[str, Any],
+        parse_hints: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, str, str]:
+        normalized = json.dumps({'spec': spec, 'parse_hints': parse_hints}, sort_keys=True, default=str)
+        return content_hash, kind, normalized
+
+    def get(
+        self,
+        content_hash: str,
+        kind: str,
+        spec: Dict[str, Any],
+        parse_hints: Optional[Dict[str, Any]] = None
+    ) -> Optional[Any]:
+        """Return the cached result, or None on a miss"""
+        key = self.make_key(content_hash, kind, spec, parse_hints)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.bytes_saved += entry['size']
+            self.compute_seconds_saved += entry['compute_seconds']
+            return entry['result']
+
+    def put(
+        self,
+        content_hash: str,
+        kind: str,
+        spec: Dict[str, Any],
+        result: Any,
+        compute_seconds: float = 0.0,
+        parse_hints: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Store a result, evicting least recently used entries"""
+        key = self.make_key(content_hash, kind, spec, parse_hints)
+        size = len(json.dumps(result, default=str))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+            self._entries[key] = {'result': result, 'size': size, 'compute_seconds': compute_seconds}
+            self._keys_by_hash.setdefault(content_hash, set()).add(key)
+            self.current_bytes += size
+
+    def get_or_compute(
+        self,
+        content_hash: str,
+        kind: str,
+        spec: Dict[str, Any],
+        compute: Callable[[], Any],
+        parse_hints: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Return the cached result or compute, time and cache it"""
+        cached = self.get(content_hash, kind, spec, parse_hints)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        result = compute()
+        self.put(content_hash, kind, spec, result, time.perf_counter() - start, parse_hints)
+        return result
+
+    def invalidate(self, content_hash: str) -> None:
+        """Drop all results computed from the given content"""
+        with self._lock:
+            for key in list(self._keys_by_hash.get(content_hash, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_hash.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+            self.bytes_saved = 0
+            self.compute_seconds_saved = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'bytes_saved': self.bytes_saved,
+                'compute_seconds_saved': round(self.compute_seconds_saved, 3)
+            }
+
+    def _remove(self, key: Tuple[str, str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry['size']
+
+        keys = self._keys_by_hash.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_hash[key[0]]
+
+
+result_cache = ResultCache(get_settings().RESULT_CACHE_MAX_BYTES)
+
+
+@event.listens_for(File, 'after_delete')
+def invalidate_deleted_file(mapper, connection, target: File) -> None:
+    if target.content_hash:
+        result_cache.invalidate(target.content_hash)
+
+
+@event.listens_for(File.content_hash, 'set', active_history=True)
+def invalidate_replaced_content(target: File, value: str, oldvalue: str, initiator) -> None:
+    if oldvalue and oldvalue is not NO_VALUE and oldvalue != value:
+        result_cache.invalidate(oldvalue)
+
+
+@event.listens_for(File.path, 'set', active_history=True)
+def invalidate_moved_file(target: File, value: str, oldvalue: str, initiator) -> None:
+    if target.content_hash and oldvalue is not NO_VALUE and oldvalue != value:
+        result_cache.invalidate(target.content_hash)
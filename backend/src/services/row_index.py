@@ -0,0 +1,179 @@
+"""Sparse byte-offset index for random access into CSV files
+
+The index stores the byte offset of every CHECKPOINT_ROWS-th data row, so a
+page of rows is read by seeking to the nearest checkpoint and parsing at most
+CHECKPOINT_ROWS + limit rows instead of everything before the page.
+
+Record boundaries are found with a vectorized scan for line terminators
+outside quoted fields: a terminator ends a record when the number of quote
+characters before it is even. Escaped quotes ("") count twice and keep the
+parity intact. Blank lines are not counted as rows, as in pandas.
+"""
+import codecs
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.services.data_processing import DataProcessingService
+
+
+class RowIndexService:
+    CHECKPOINT_ROWS = 10_000
+    SCAN_CHUNK_BYTES = 4 * 1024 * 1024
+    MAX_PAGE_ROWS = 10_000
+    INDEX_VERSION = 1
+
+    @staticmethod
+    def build_index(
+        file_path: Path,
+        encoding: Optional[str] = None,
+        dialect: Optional[Dict[str, Any]] = None,
+        checkpoint_rows: int = CHECKPOINT_ROWS
+    ) -> Optional[Dict[str, Any]]:
+        """Scan a CSV file once and return its row-offset index.
+
+        Returns None for encodings whose quote and line terminator characters
+        are not single bytes (UTF-16/32), which cannot be scanned bytewise.
+        """
+        if not encoding:
+            encoding = DataProcessingService.detect_encoding(file_path)
+        if codecs.lookup(encoding).name.startswith(('utf-16', 'utf-32')):
+            return None
+        dialect = DataProcessingService.resolve_dialect(file_path, encoding, hinted=dialect)
+
+        quote = ord(dialect['quotechar'])
+        terminator = ord(dialect['line_terminator'][-1])
+        terminator_length = len(dialect['line_terminator'])
+        header_records = 1 if dialect['has_header'] else 0
+
+        offsets: List[int] = []
+        records = 0
+        record_start = 0
+        quote_parity = 0
+        position = 0
+
+        with open(file_path, 'rb') as file:
+            while chunk := file.read(RowIndexService.SCAN_CHUNK_BYTES):
+                data = np.frombuffer(chunk, dtype=np.uint8)
+                ends = np.flatnonzero(data == terminator)
+
+                is_quote = data == quote
+                if quote_parity or is_quote.any():
+                    quotes_before = np.cumsum(is_quote) + quote_parity
+                    ends = ends[quotes_before[ends] % 2 == 0]
+                    quote_parity = int(quotes_before[-1] % 2)
+
+                position += len(chunk)
+                if not len(ends):
+                    continue
+
+                ends += position - len(chunk)
+                starts = np.concatenate(([record_start], ends[:-1] + 1))
+                starts = starts[ends - starts > terminator_length - 1]
+
+                # Index of each non-empty record counted from the first data row
+                rows = np.arange(records, records + len(starts)) - header_records
+                checkpoints = starts[(rows >= 0) & (rows % checkpoint_rows == 0)]
+                offsets.extend(int(offset) for offset in checkpoints)
+
+                records += len(starts)
+                record_start = int(ends[-1]) + 1
+
+        # The last record may not be terminated
+        if record_start < position:
+            row = records - header_records
+            if row >= 0 and row % checkpoint_rows == 0:
+                offsets.append(record_start)
+            records += 1
+
+        if dialect['has_header']:
+            columns = list(pd.read_csv(
+                file_path, encoding=encoding, delimiter=dialect['delimiter'],
+                quotechar=dialect['quotechar'], nrows=0
+            ).columns)
+        else:
+            columns = [f"column_{i + 1}" for i in range(dialect['field_count'])]
+
+        source_stat = file_path.stat()
+        return {
+            'version': RowIndexService.INDEX_VERSION,
+            'checkpoint_rows': checkpoint_rows,
+            'total_rows': max(records - header_records, 0),
+            'offsets': offsets,
+            'columns': columns,
+            'encoding': encoding,
+            'dialect': dialect,
+            'source_size': source_stat.st_size,
+            'source_mtime_ns': source_stat.st_mtime_ns
+        }
+
+    @staticmethod
+    def save_index(index: Dict[str, Any], index_path: Path) -> None:
+        with open(index_path, 'w') as file:
+            json.dump(index, file)
+
+    @staticmethod
+    def load_index(index_path: Path, source_path: Path) -> Optional[Dict[str, Any]]:
+        """Load an index unless it is missing or stale for the source file"""
+        if not index_path.exists():
+            return None
+
+        with open(index_path) as file:
+            index = json.load(file)
+
+        source_stat = source_path.stat()
+        if (index.get('version') != RowIndexService.INDEX_VERSION
+                or index['source_size'] != source_stat.st_size
+                or index['source_mtime_ns'] != source_stat.st_mtime_ns):
+            return None
+
+        return index
+
+    @staticmethod
+    def get_or_build_index(
+        file_path: Path,
+        index_path: Path,
+        encoding: Optional[str] = None,
+        dialect: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Load the index of a file, building and saving it on first use"""
+        index = RowIndexService.load_index(index_path, file_path)
+        if index is None:
+            index = RowIndexService.build_index(file_path, encoding, dialect)
+            if index is not None:
+                RowIndexService.save_index(index, index_path)
+        return index
+
+    @staticmethod
+    def read_rows(
+        file_path: Path,
+        index: Dict[str, Any],
+        offset: int,
+        limit: int
+    ) -> pd.DataFrame:
+        """Parse rows [offset, offset + limit) starting from the nearest checkpoint"""
+        columns = index['columns']
+        if offset >= index['total_rows'] or limit <= 0:
+            return pd.DataFrame(columns=columns)
+
+        checkpoint = offset // index['checkpoint_rows']
+        skip = offset - checkpoint * index['checkpoint_rows']
+        dialect = index['dialect']
+
+        with open(file_path, 'rb') as file:
+            file.seek(index['offsets'][checkpoint])
+            df = pd.read_csv(
+                file,
+                encoding=index['encoding'],
+                delimiter=dialect['delimiter'],
+                quotechar=dialect['quotechar'],
+                header=None,
+                names=columns,
+                nrows=skip + limit,
+                on_bad_lines='skip'
+            )
+
+        return df.iloc[skip:].reset_index(drop=True)
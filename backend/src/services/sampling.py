@@ -0,0 +1,300 @@
+"""Uniform row samples for approximate previews and statistics
+
+A ReservoirSampler keeps a uniform sample without replacement of a stream of
+DataFrame chunks in bounded memory. Every row gets a random key and the
+sample is the rows with the smallest keys seen so far (priority sampling).
+Once the reservoir is full, most rows of a chunk are discarded by a single
+vectorized comparison against the largest key kept.
+
+Statistics computed on a sample come with confidence intervals at
+CONFIDENCE_LEVEL, using the finite population correction so that a sample
+holding the whole file gives exact values:
+
+- missing values and top value counts are proportions scaled to the row
+  count, with Wilson score intervals.
+- the mean uses the normal approximation mean +- z * s / sqrt(n), the
+  standard deviation s +- z * s / sqrt(2 (n - 1)).
+- the median and quartiles use distribution-free intervals between the
+  order statistics at ranks n * q +- z * sqrt(n * q * (1 - q)).
+- distinct counts use the GEE estimator sqrt(N / n) * f1 + (d - f1),
+  where d values were seen and f1 of them once. Its interval runs from d,
+  a hard lower bound, to the estimate times its ratio error sqrt(N / n).
+- min and max are the extremes of the sample and carry no interval: the
+  true extremes lie at or beyond them.
+"""
+import json
+import math
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.services.chunked_stats import ChunkedStatisticsEngine
+from src.services.data_processing import DataProcessingService
+
+
+class ReservoirSampler:
+    """Uniform sample of at most `size` rows from a stream of chunks"""
+
+    def __init__(self, size: int, seed: int = 0):
+        self.size = size
+        self.rows_seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._rows: Optional[pd.DataFrame] = None
+        self._keys = np.empty(0)
+        self._positions = np.empty(0, dtype=np.int64)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        keys = self._rng.random(len(chunk))
+        positions = np.arange(self.rows_seen, self.rows_seen + len(chunk))
+        self.rows_seen += len(chunk)
+
+        # A full reservoir only admits rows with a key below its largest one
+        if len(self._keys) >= self.size:
+            admitted = keys < self._keys.max()
+            if not admitted.any():
+                return
+            chunk, keys, positions = chunk[admitted], keys[admitted], positions[admitted]
+
+        rows = chunk if self._rows is None else pd.concat([self._rows, chunk])
+        keys = np.concatenate([self._keys, keys])
+        positions = np.concatenate([self._positions, positions])
+        if len(keys) > self.size:
+            kept = np.argpartition(keys, self.size - 1)[:self.size]
+            rows, keys, positions = rows.iloc[kept], keys[kept], positions[kept]
+
+        self._rows, self._keys, self._positions = rows, keys, positions
+
+    def consume(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Sample chunks while passing them on, e.g. to a streaming profile"""
+        for chunk in chunks:
+            self.update(chunk)
+            yield chunk
+
+    def sample(self) -> pd.DataFrame:
+        """The sampled rows in file order, indexed by their row number"""
+        if self._rows is None:
+            return pd.DataFrame()
+
+        order = np.argsort(self._positions)
+        sample = self._rows.iloc[order]
+        sample.index = pd.Index(self._positions[order], name=None)
+        return sample
+
+
+class SamplingService:
+    SAMPLE_ROWS = 10000
+    SAMPLE_SEED = 0
+    CONFIDENCE_LEVEL = 0.95
+    SAMPLE_METADATA_KEY = b'jabiru_sample'
+
+    @staticmethod
+    def sample_csv(
+        file_path: Path,
+        encoding: Optional[str] = None,
+        dialect: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None,
+        size: int = SAMPLE_ROWS
+    ) -> Tuple[pd.DataFrame, int]:
+        """Sample the rows of a CSV file in one streaming pass.
+
+        Returns the sample and the number of rows in the file.
+        """
+        sampler = ReservoirSampler(size, SamplingService.SAMPLE_SEED)
+        with ChunkedStatisticsEngine().read_chunks(file_path, encoding, columns=columns, dialect=dialect) as reader:
+            for chunk in reader:
+                sampler.update(chunk)
+        return sampler.sample(), sampler.rows_seen
+
+    @staticmethod
+    def write_sample(
+        sample: pd.DataFrame,
+        population_rows: int,
+        source_path: Path,
+        sample_path: Path
+    ) -> bool:
+        """Cache a sample as Parquet, stamped like the columnar sidecar.
+
+        Returns False when the sample cannot be represented in Arrow.
+        """
+        source_stat = source_path.stat()
+        sample_info = {
+            'population_rows': int(population_rows),
+            'source_size': source_stat.st_size,
+            'source_mtime_ns': source_stat.st_mtime_ns
+        }
+
+        try:
+            table = pa.Table.from_pandas(sample, preserve_index=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return False
+
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata[SamplingService.SAMPLE_METADATA_KEY] = json.dumps(sample_info).encode()
+        pq.write_table(table.replace_schema_metadata(schema_metadata), sample_path)
+        return True
+
+    @staticmethod
+    def read_sample(
+        sample_path: Path,
+        source_path: Path,
+        columns: Optional[List[str]] = None
+    ) -> Optional[Tuple[pd.DataFrame, int]]:
+        """Read a cached sample, None when it is missing or stale"""
+        if not sample_path.exists():
+            return None
+
+        parquet_file = pq.ParquetFile(sample_path)
+        schema = parquet_file.schema_arrow
+        raw_info = (schema.metadata or {}).get(SamplingService.SAMPLE_METADATA_KEY)
+        if raw_info is None:
+            return None
+
+        sample_info = json.loads(raw_info)
+        source_stat = source_path.stat()
+        if (sample_info['source_size'] != source_stat.st_size
+                or sample_info['source_mtime_ns'] != source_stat.st_mtime_ns):
+            return None
+
+        if columns is not None:
+            for column in columns:
+                if column not in schema.names:
+                    raise ValueError(f"Column '{column}' not found in dataframe")
+
+        sample = parquet_file.read(columns=columns, use_pandas_metadata=True).to_pandas()
+        return sample, sample_info['population_rows']
+
+    @staticmethod
+    def _z_score() -> float:
+        return NormalDist().inv_cdf(0.5 + SamplingService.CONFIDENCE_LEVEL / 2)
+
+    @staticmethod
+    def _fpc(sample_rows: int, population_rows: int) -> float:
+        """Finite population correction of a standard error"""
+        if population_rows <= 1 or sample_rows >= population_rows:
+            return 0.0
+        return math.sqrt((population_rows - sample_rows) / (population_rows - 1))
+
+    @staticmethod
+    def proportion_interval(successes: int, trials: int, fpc: float) -> Tuple[float, float]:
+        """Wilson score interval of a proportion"""
+        if trials == 0:
+            return 0.0, 1.0
+
+        z = SamplingService._z_score()
+        share = successes / trials
+        denominator = 1 + z ** 2 / trials
+        center = (share + z ** 2 / (2 * trials)) / denominator
+        half_width = z * math.sqrt(share * (1 - share) / trials + z ** 2 / (4 * trials ** 2)) / denominator
+        if fpc == 0.0:
+            return share, share
+        return max(0.0, center - half_width * fpc), min(1.0, center + half_width * fpc)
+
+    @staticmethod
+    def quantile_interval(sorted_values: np.ndarray, q: float, fpc: float) -> List[Optional[float]]:
+        """Distribution-free interval of a quantile between two order statistics"""
+        n = len(sorted_values)
+        if n == 0:
+            return [None, None]
+
+        spread = SamplingService._z_score() * math.sqrt(n * q * (1 - q)) * fpc
+        low = min(n - 1, max(0, math.floor(n * q - spread)))
+        high = min(n - 1, max(0, math.ceil(n * q + spread) - 1))
+        if fpc == 0.0:
+            value = float(np.quantile(sorted_values, q))
+            return [value, value]
+        return [float(sorted_values[low]), float(sorted_values[high])]
+
+    @staticmethod
+    def _scaled(interval: Tuple[float, float], total: int) -> List[int]:
+        return [int(math.floor(interval[0] * total)), int(math.ceil(interval[1] * total))]
+
+    @staticmethod
+    def approximate_statistics(
+        sample: pd.DataFrame,
+        population_rows: int,
+        columns: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Estimate column statistics of a file from a uniform sample of its rows.
+
+        The result is shaped like DataProcessingService.profile_dataframe,
+        with counts scaled to the file, and every column also carries a
+        'confidence_intervals' dictionary of [low, high] pairs.
+        """
+        columns = list(sample.columns) if columns is None else columns
+        for column in columns:
+            if column not in sample.columns:
+                raise ValueError(f"Column '{column}' not found in dataframe")
+
+        n = len(sample)
+        fpc = SamplingService._fpc(n, population_rows)
+        z = SamplingService._z_score()
+        scale = population_rows / n if n else 0.0
+        # The ratio error of the GEE distinct count estimate
+        ratio_error = math.sqrt(scale) if scale > 1 else 1.0
+
+        profile = DataProcessingService.profile_dataframe(sample[columns])
+        for column in columns:
+            values = sample[column]
+            stats = profile['columns'][column]
+            intervals: Dict[str, Any] = {}
+
+            missing = int(values.isna().sum())
+            stats['total_values'] = int(population_rows)
+            stats['missing_values'] = int(round(missing * scale))
+            intervals['missing_values'] = SamplingService._scaled(
+                SamplingService.proportion_interval(missing, n, fpc), population_rows
+            )
+
+            counts = values.value_counts()
+            counts = counts[counts > 0]
+            seen = int(len(counts))
+            singletons = int((counts == 1).sum())
+            if fpc == 0.0:
+                stats['unique_values'] = seen
+                intervals['unique_values'] = [seen, seen]
+            else:
+                estimate = ratio_error * singletons + (seen - singletons)
+                upper = min(population_rows - intervals['missing_values'][0], int(math.ceil(estimate * ratio_error)))
+                stats['unique_values'] = int(round(estimate))
+                intervals['unique_values'] = [seen, max(seen, upper)]
+
+            if 'mean' in stats:
+                numeric = np.sort(values.dropna().to_numpy(dtype=float))
+                count = len(numeric)
+                if count > 1:
+                    std = float(numeric.std(ddof=1))
+                    mean_error = z * std / math.sqrt(count) * fpc
+                    std_error = z * std / math.sqrt(2 * (count - 1)) * fpc
+                    intervals['mean'] = [stats['mean'] - mean_error, stats['mean'] + mean_error]
+                    intervals['std'] = [max(0.0, std - std_error), std + std_error]
+                for name, q in (('q1', 0.25), ('median', 0.5), ('q3', 0.75)):
+                    intervals[name] = SamplingService.quantile_interval(numeric, q, fpc)
+            else:
+                sample_counts = stats['top_values']
+                stats['top_values'] = {value: int(round(count * scale)) for value, count in sample_counts.items()}
+                intervals['top_values'] = {
+                    value: SamplingService._scaled(
+                        SamplingService.proportion_interval(count, n, fpc), population_rows
+                    )
+                    for value, count in sample_counts.items()
+                }
+
+            # Sample histograms would be mistaken for counts over the file
+            for key in ('histogram', 'quantile_histogram', 'sparkline'):
+                stats.pop(key, None)
+
+            stats['confidence_intervals'] = intervals
+
+        return {
+            'total_rows': int(population_rows),
+            'total_columns': len(columns),
+            'columns': {column: profile['columns'][column] for column in columns},
+            'approximate': True,
+            'sample_rows': int(n),
+            'confidence_level': SamplingService.CONFIDENCE_LEVEL
+        }
@@ -0,0 +1,165 @@
+"""Read-only SQL over the files of a project with an embedded DuckDB
+
+Each file is registered as a view over an Arrow dataset of its columnar
+sidecar, or of the CSV itself, so DuckDB scans the files in native code
+with projection and filter pushdown instead of materializing DataFrames.
+Connections are in-memory, live for a single query and are sandboxed:
+only single SELECT statements are accepted and external file access is
+disabled once the views are registered.
+"""
+import json
+import re
+import threading
+import time
+from datetime import date, datetime, time as time_of_day
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import duckdb
+import pyarrow as pa
+import pyarrow.csv as pcsv
+import pyarrow.dataset as ds
+
+from src.services.data_processing import DataProcessingService
+
+
+class SQLQueryService:
+    BATCH_ROWS = 2048
+    VIEW_NAME_PATTERN = re.compile(r'[^0-9a-z_]+')
+
+    @staticmethod
+    def view_name(filename: str, taken: List[str]) -> str:
+        """Derive a unique SQL identifier from a file name, e.g. 'Sales 2024.csv' -> sales_2024"""
+        name = SQLQueryService.VIEW_NAME_PATTERN.sub('_', Path(filename).stem.lower()).strip('_') or 'file'
+        if name[0].isdigit():
+            name = f"t_{name}"
+
+        candidate, counter = name, 2
+        while candidate in taken:
+            candidate = f"{name}_{counter}"
+            counter += 1
+        return candidate
+
+    @staticmethod
+    def open_dataset(
+        file_path: Path,
+        sidecar_path: Optional[Path] = None,
+        hints: Optional[Dict[str, Any]] = None
+    ) -> ds.Dataset:
+        """Open a file as an Arrow dataset, preferring an up-to-date sidecar"""
+        if sidecar_path is not None:
+            if DataProcessingService._open_columnar_sidecar(sidecar_path, file_path) is not None:
+                return ds.dataset(sidecar_path, format='parquet')
+
+        hints = hints or {}
+        encoding = hints.get('encoding') or DataProcessingService.detect_encoding(file_path)
+        dialect = DataProcessingService.resolve_dialect(file_path, encoding, hinted=hints.get('dialect'))
+
+        read_options = pcsv.ReadOptions(encoding=encoding)
+        if not dialect['has_header']:
+            read_options.column_names = [f"column_{i + 1}" for i in range(dialect['field_count'])]
+
+        csv_format = ds.CsvFileFormat(
+            parse_options=pcsv.ParseOptions(
+                delimiter=dialect['delimiter'],
+                quote_char=dialect['quotechar'],
+                newlines_in_values=True
+            ),
+            read_options=read_options
+        )
+        return ds.dataset(file_path, format=csv_format)
+
+    @staticmethod
+    def connect(datasets: Dict[str, ds.Dataset], memory_limit: str) -> duckdb.DuckDBPyConnection:
+        """Open a sandboxed in-memory connection with the datasets as views"""
+        connection = duckdb.connect(':memory:')
+        connection.execute(f"SET memory_limit='{memory_limit}'")
+        for name, dataset in datasets.items():
+            connection.register(name, dataset)
+
+        # Registered datasets are scanned through Arrow, everything else on
+        # the file system is off limits and cannot be turned back on
+        connection.execute("SET enable_external_access=false")
+        connection.execute("SET lock_configuration=true")
+        return connection
+
+    @staticmethod
+    def validate_sql(sql: str) -> None:
+        """Reject anything but a single SELECT statement"""
+        with duckdb.connect(':memory:') as connection:
+            serialized = json.loads(
+                connection.execute("SELECT json_serialize_sql(?::VARCHAR)", [sql]).fetchone()[0]
+            )
+
+        if serialized.get('error'):
+            message = serialized.get('error_message', 'Invalid SQL')
+            if serialized.get('error_type') == 'not implemented':
+                message = "Only SELECT statements are allowed"
+            raise ValueError(message)
+        if len(serialized['statements']) != 1:
+            raise ValueError("Exactly one SELECT statement is allowed")
+
+    @staticmethod
+    def _json_default(value: Any) -> Any:
+        if isinstance(value, (datetime, date, time_of_day)):
+            return value.isoformat()
+        return str(value)
+
+    @staticmethod
+    def execute(
+        connection: duckdb.DuckDBPyConnection,
+        sql: str,
+        max_rows: int,
+        timeout_seconds: float
+    ) -> Iterator[str]:
+        """Run a query and return its result as NDJSON lines.
+
+        The first line holds the column names and types, then one object per
+        row, then a summary with the row count and whether the result was
+        cut at max_rows. The query is interrupted after timeout_seconds,
+        including the time spent streaming. Binding errors are raised before
+        the first line so they can be reported as a bad request.
+        """
+        timer = threading.Timer(timeout_seconds, connection.interrupt)
+        timer.start()
+        start = time.perf_counter()
+
+        try:
+            reader = connection.sql(sql).fetch_arrow_reader(SQLQueryService.BATCH_ROWS)
+        except Exception:
+            timer.cancel()
+            connection.close()
+            raise
+
+        def stream() -> Iterator[str]:
+            rows, truncated = 0, False
+            try:
+                yield json.dumps({
+                    'columns': reader.schema.names,
+                    'types': [str(field.type) for field in reader.schema]
+                }) + '\n'
+
+                for batch in reader:
+                    if rows + batch.num_rows > max_rows:
+                        batch = batch.slice(0, max_rows - rows)
+                        truncated = True
+                    for row in batch.to_pylist():
+                        yield json.dumps(row, default=SQLQueryService._json_default) + '\n'
+                    rows += batch.num_rows
+                    if truncated:
+                        break
+
+                yield json.dumps({
+                    'row_count': rows,
+                    'truncated': truncated,
+                    'elapsed_seconds': round(time.perf_counter() - start, 3)
+                }) + '\n'
+            except duckdb.InterruptException:
+                yield json.dumps({'error': f"Query timed out after {timeout_seconds} seconds", 'row_count': rows}) + '\n'
+            except (duckdb.Error, pa.ArrowException) as e:
+                yield json.dumps({'error': str(e), 'row_count': rows}) + '\n'
+            finally:
+                timer.cancel()
+                connection.close()
+
+        return stream()
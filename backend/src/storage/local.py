@@ -1,5 +1,6 @@
 import os
 import shutil
+import hashlib
 from pathlib import Path
 from typing import Union, Optional
 import aiofiles
@@ -7,6 +8,9 @@ from fastapi import UploadFile
 
 
 class LocalFileStorage:
+    # Derived files live apart from uploads, which can never be named like a directory
+    SIDECAR_DIRECTORY = ".sidecars"
+
     def __init__(self, base_path: str = "uploads"):
         self.base_path = Path(base_path)
         self._ensure_directory_exists()
@@ -18,7 +22,8 @@ class LocalFileStorage:
         project_directory = self.base_path / project_id
         project_directory.mkdir(parents=True, exist_ok=True)
         
-        file_path = project_directory / filename
+        # Client file names must not reach into other directories
+        file_path = project_directory / Path(filename).name
         counter = 1
         original_stem = file_path.stem
         suffix = file_path.suffix
@@ -55,6 +60,20 @@ class LocalFileStorage:
         if full_path.exists():
             full_path.unlink()
     
+    def get_content_hash(self, file_path: str) -> str:
+        full_path = self.base_path / file_path
+        digest = hashlib.sha256()
+        with open(full_path, 'rb') as file:
+            while chunk := file.read(1024 * 1024):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def get_sidecar_path(self, file_path: str, extension: str) -> str:
+        source = Path(file_path)
+        sidecar_path = source.parent / self.SIDECAR_DIRECTORY / f"{source.name}.{extension}"
+        (self.base_path / sidecar_path).parent.mkdir(parents=True, exist_ok=True)
+        return str(sidecar_path)
+    
     def delete_project_directory(self, project_id: str) -> None:
         project_directory = self.base_path / project_id
         if project_directory.exists():
@@ -0,0 +1,91 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.schemas.query import AggregationQuery
+from src.services.aggregation import AggregationService
+from src.services.data_processing import DataProcessingService
+
+
+class TestAggregationService:
+
+    @pytest.fixture
+    def sample_df(self):
+        return pd.DataFrame({
+            'city': ['Paris', 'Paris', 'Paris', 'Lyon', 'Lyon', 'Nice', None],
+            'kind': ['a', 'b', 'a', 'a', 'b', 'a', 'b'],
+            'amount': [10.0, 20.0, np.nan, 5.0, 15.0, 8.0, 1.0]
+        })
+
+    def test_group_metrics(self, sample_df):
+        query = AggregationQuery(
+            group_by=['city'],
+            metrics=[
+                {'func': 'count'},
+                {'func': 'sum', 'column': 'amount'},
+                {'func': 'avg', 'column': 'amount'},
+                {'func': 'count', 'column': 'amount'},
+                {'func': 'max', 'column': 'amount'}
+            ]
+        )
+
+        result = AggregationService.aggregate(sample_df, query)
+
+        assert result['metrics'] == ['count', 'sum_amount', 'avg_amount', 'count_amount', 'max_amount']
+        assert result['data'][0] == {
+            'city': 'Paris', 'count': 3, 'sum_amount': 30.0,
+            'avg_amount': 15.0, 'count_amount': 2, 'max_amount': 20.0
+        }
+        assert {'city': None, 'count': 1, 'sum_amount': 1.0, 'avg_amount': 1.0,
+                'count_amount': 1, 'max_amount': 1.0} in result['data']
+        assert result['total_groups'] == 4
+        assert result['other_groups'] == 0
+
+    def test_other_bucket(self, sample_df):
+        query = AggregationQuery(
+            group_by=['city'],
+            metrics=[{'func': 'count'}, {'func': 'avg', 'column': 'amount'}, {'func': 'min', 'column': 'amount'}],
+            max_groups=1
+        )
+
+        result = AggregationService.aggregate(sample_df, query)
+
+        assert len(result['data']) == 2
+        assert result['data'][-1] == {
+            'city': 'Other', 'count': 4, 'avg_amount': pytest.approx(29.0 / 4), 'min_amount': 1.0
+        }
+        assert result['other_groups'] == 3
+
+    def test_order_by_key(self, sample_df):
+        query = AggregationQuery(group_by=['kind', 'city'], order_by='key', max_groups=10)
+
+        result = AggregationService.aggregate(sample_df, query)
+
+        keys = [(row['kind'], row['city']) for row in result['data']]
+        assert keys[:3] == [('a', 'Lyon'), ('a', 'Nice'), ('a', 'Paris')]
+
+    def test_sum_of_text_column(self, sample_df):
+        query = AggregationQuery(group_by=['kind'], metrics=[{'func': 'sum', 'column': 'city'}])
+
+        with pytest.raises(ValueError, match="non-numeric"):
+            AggregationService.aggregate(sample_df, query)
+
+    def test_min_max_of_compacted_text_column(self, sample_df):
+        df = DataProcessingService.compact_dataframe(sample_df)
+        assert isinstance(df['city'].dtype, pd.CategoricalDtype)
+        query = AggregationQuery(
+            group_by=['kind'],
+            metrics=[{'func': 'min', 'column': 'city'}, {'func': 'max', 'column': 'city'}],
+            max_groups=1
+        )
+
+        result = AggregationService.aggregate(df, query)
+
+        assert result['data'][0] == {'kind': 'a', 'min_city': 'Lyon', 'max_city': 'Paris'}
+        assert result['data'][1] == {'kind': 'Other', 'min_city': 'Lyon', 'max_city': 'Paris'}
+
+    def test_unknown_group_column(self, sample_df):
+        query = AggregationQuery(group_by=['unknown'])
+
+        with pytest.raises(ValueError, match="Column 'unknown' not found"):
+            AggregationService.aggregate(sample_df, query)
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from src.services.chunked_stats import (
+    ChunkedStatisticsEngine,
+    HyperLogLog,
+    MisraGries,
+    RunningMoments,
+    TDigest,
+)
+from src.services.data_processing import DataProcessingService
+
+
+class TestSketches:
+
+    def test_running_moments_merge_matches_numpy(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(10, 3, 10_000)
+
+        left, right = RunningMoments(), RunningMoments()
+        left.update(values[:3000])
+        right.update(values[3000:])
+        left.merge(right)
+
+        assert left.count == 10_000
+        assert left.mean == pytest.approx(values.mean())
+        assert left.std == pytest.approx(values.std(ddof=1))
+        assert left.min == values.min()
+        assert left.max == values.max()
+
+    def test_tdigest_quantiles_within_rank_error(self):
+        rng = np.random.default_rng(0)
+        values = rng.lognormal(0, 1, 200_000)
+
+        digest = TDigest()
+        for chunk in np.array_split(values, 20):
+            digest.update(chunk)
+
+        sorted_values = np.sort(values)
+        for q in [0.01, 0.25, 0.5, 0.75, 0.99]:
+            rank = np.searchsorted(sorted_values, digest.quantile(q)) / len(values)
+            assert abs(rank - q) < 0.005
+
+    def test_hyperloglog_estimate(self):
+        sketch = HyperLogLog()
+        sketch.update(pd.Series(np.arange(50_000)))
+        sketch.update(pd.Series(np.arange(25_000, 100_000)))
+
+        assert sketch.count() == pytest.approx(100_000, rel=4 * sketch.relative_error)
+
+    def test_hyperloglog_small_cardinality(self):
+        sketch = HyperLogLog()
+        sketch.update(pd.Series(['a', 'b', 'c', 'a']))
+
+        assert sketch.count() == 3
+
+    def test_misra_gries_bounds(self):
+        rng = np.random.default_rng(0)
+        values = pd.Series(rng.zipf(1.5, 50_000).astype(str))
+
+        summary = MisraGries(capacity=20)
+        for start in range(0, len(values), 5000):
+            summary.update(values.iloc[start:start + 5000])
+
+        exact = values.value_counts()
+        for value, count in summary.top(5).items():
+            assert count <= exact[value]
+            assert exact[value] - count <= summary.max_error
+        assert summary.top(1).index[0] == exact.index[0]
+
+
+class TestChunkedStatisticsEngine:
+
+    @pytest.fixture
+    def large_csv_file(self):
+        rng = np.random.default_rng(0)
+        rows = 30_000
+        df = pd.DataFrame({
+            'amount': rng.normal(100, 15, rows).round(2),
+            'category': rng.choice(['alpha', 'beta', 'gamma'], rows, p=[0.6, 0.3, 0.1]),
+            'quantity': rng.integers(0, 500, rows)
+        })
+        df.loc[::10, 'amount'] = np.nan
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            df.to_csv(f, index=False)
+            temp_path = f.name
+
+        yield Path(temp_path)
+        os.unlink(temp_path)
+
+    def test_profile_csv_matches_exact_statistics(self, large_csv_file):
+        profile = ChunkedStatisticsEngine(chunk_rows=4000).profile_csv(large_csv_file)
+        df, _ = DataProcessingService.parse_csv_file(large_csv_file)
+        exact = DataProcessingService.profile_dataframe(df)
+
+        assert profile['approximate'] is True
+        assert profile['total_rows'] == exact['total_rows']
+
+        amount, exact_amount = profile['columns']['amount'], exact['columns']['amount']
+        assert amount['missing_values'] == exact_amount['missing_values']
+        assert amount['mean'] == pytest.approx(exact_amount['mean'])
+        assert amount['std'] == pytest.approx(exact_amount['std'])
+        assert amount['min'] == exact_amount['min']
+        assert amount['quartiles']['q2'] == pytest.approx(exact_amount['quartiles']['q2'], rel=0.01)
+
+        quantity = profile['columns']['quantity']
+        assert quantity['data_type'] == 'int64'
+        assert quantity['unique_values'] == pytest.approx(500, rel=0.05)
+
+        category = profile['columns']['category']
+        assert category['top_values'] == exact['columns']['category']['top_values']
+        assert category['mode'] == 'alpha'
+
+    def test_profile_csv_histograms(self, large_csv_file):
+        profile = ChunkedStatisticsEngine(chunk_rows=4000).profile_csv(large_csv_file)
+        df, _ = DataProcessingService.parse_csv_file(large_csv_file)
+        exact = DataProcessingService.profile_dataframe(df)
+
+        histogram = profile['columns']['amount']['histogram']
+        exact_histogram = exact['columns']['amount']['histogram']
+        assert histogram['edges'] == pytest.approx(exact_histogram['edges'])
+        assert sum(histogram['counts']) == sum(exact_histogram['counts'])
+        assert np.abs(np.subtract(histogram['counts'], exact_histogram['counts'])).max() <= 0.01 * len(df)
+        assert 'histogram' not in profile['columns']['category']
+
+    def test_profile_csv_selected_columns(self, large_csv_file):
+        profile = ChunkedStatisticsEngine(chunk_rows=4000).profile_csv(
+            large_csv_file, columns=['quantity']
+        )
+
+        assert list(profile['columns']) == ['quantity']
@@ -0,0 +1,67 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.schemas.query import CorrelationQuery
+from src.services.correlation import CorrelationService
+
+
+class TestCorrelationService:
+
+    @pytest.fixture
+    def sample_df(self):
+        rng = np.random.default_rng(0)
+        rows = 2000
+        df = pd.DataFrame({
+            'a': rng.normal(size=rows),
+            'noise': rng.normal(size=rows),
+            'label': rng.choice(['x', 'y'], rows)
+        })
+        df['b'] = 3 * df['a'] + rng.normal(size=rows) * 0.1
+        df['c'] = -np.exp(df['a'])
+        df.loc[::7, 'a'] = np.nan
+        return df
+
+    def test_pearson_matches_pandas(self, sample_df):
+        result = CorrelationService.correlate(sample_df, CorrelationQuery())
+
+        assert result['columns'] == ['a', 'noise', 'b', 'c']
+        expected = sample_df[result['columns']].corr().to_numpy()
+        assert np.array(result['matrix'], dtype=float) == pytest.approx(expected, abs=1e-6)
+        assert result['sampled_rows'] is None
+
+    def test_spearman_matches_pandas_without_missing_values(self, sample_df):
+        df = sample_df.dropna()
+
+        result = CorrelationService.correlate(df, CorrelationQuery(method='spearman'))
+
+        expected = df[result['columns']].corr(method='spearman').to_numpy()
+        assert np.array(result['matrix'], dtype=float) == pytest.approx(expected, abs=1e-6)
+        # Monotonic relation, perfect rank correlation
+        assert result['top_pairs'][0]['correlation'] == pytest.approx(-1.0)
+
+    def test_top_pairs(self, sample_df):
+        result = CorrelationService.correlate(sample_df, CorrelationQuery(columns=['a', 'b', 'noise'], top_k=2))
+
+        assert len(result['top_pairs']) == 2
+        assert (result['top_pairs'][0]['x'], result['top_pairs'][0]['y']) == ('a', 'b')
+        assert result['top_pairs'][0]['rows'] == int(sample_df['a'].notna().sum())
+
+    def test_sampling(self, sample_df):
+        result = CorrelationService.correlate(sample_df, CorrelationQuery(columns=['a', 'b'], max_rows=500))
+
+        assert result['source_rows'] == 2000
+        assert result['sampled_rows'] == 500
+        assert result['matrix'][0][1] > 0.99
+
+    def test_constant_column_is_undefined(self):
+        df = pd.DataFrame({'a': [1.0, 2.0, 3.0, 4.0], 'b': [5.0, 5.0, 5.0, 5.0]})
+
+        result = CorrelationService.correlate(df, CorrelationQuery())
+
+        assert result['matrix'][0][1] is None
+        assert result['top_pairs'] == []
+
+    def test_non_numeric_column(self, sample_df):
+        with pytest.raises(ValueError, match="not numeric"):
+            CorrelationService.correlate(sample_df, CorrelationQuery(columns=['a', 'label']))
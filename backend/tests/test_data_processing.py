@@ -40,6 +40,35 @@ class TestDataProcessingService:
         encoding = DataProcessingService.detect_encoding(sample_csv_file)
         assert encoding in ['utf-8', 'ascii', 'UTF-8', 'ASCII']
     
+    @pytest.mark.parametrize("encoding,ascii_rows,method", [
+        ('utf-8-sig', 0, 'bom'),
+        ('utf-16', 0, 'bom'),
+        ('utf-8', 0, 'utf-8'),
+        ('utf-8', 5000, 'utf-8'),
+        ('cp1252', 5000, 'charset_normalizer'),
+        ('cp1251', 0, 'charset_normalizer')
+    ])
+    def test_detect_encoding_details(self, tmp_path, encoding, ascii_rows, method):
+        text = "name,city\n" + "x,y\n" * ascii_rows
+        if encoding == 'cp1251':
+            text += "Иван,Москва\nПётр,Омск\nМария,Казань\nОльга,Самара\n" * 20
+        else:
+            text += "José,Zürich\nRenée,Besançon\nMüller,São Paulo\n" * 20
+        path = tmp_path / 'encoded.csv'
+        path.write_bytes(text.encode(encoding))
+
+        detection = DataProcessingService.detect_encoding_details(path)
+
+        assert detection['method'] == method
+        assert path.read_bytes().decode(detection['encoding']) == text
+        assert 0 < detection['confidence'] <= 1
+
+    def test_parse_csv_file_reports_encoding_confidence(self, sample_csv_file):
+        _, metadata = DataProcessingService.parse_csv_file(sample_csv_file)
+
+        assert metadata['encoding'] == 'utf-8'
+        assert metadata['encoding_confidence'] == 1.0
+
     def test_detect_column_types(self):
         df = pd.DataFrame({
             'integers': [1, 2, 3, 4, 5],
@@ -163,4 +192,381 @@ class TestDataProcessingService:
         assert preview['data'][1]['col2'] is False
         
         # Check datetime handling
-        assert '2023-01-01' in preview['data'][0]['col3']
\ No newline at end of file
+        assert '2023-01-01' in preview['data'][0]['col3']
+
+    def test_columnar_sidecar_roundtrip(self, sample_csv_file):
+        df, metadata = DataProcessingService.parse_csv_file(sample_csv_file)
+        sidecar_path = Path(f"{sample_csv_file}.parquet")
+
+        try:
+            assert DataProcessingService.write_columnar_sidecar(
+                df, metadata, sample_csv_file, sidecar_path
+            )
+
+            sidecar_df, sidecar_metadata = DataProcessingService.read_columnar_sidecar(
+                sidecar_path, sample_csv_file, columns=['salary']
+            )
+
+            assert list(sidecar_df.columns) == ['salary']
+            assert sidecar_df['salary'].tolist() == df['salary'].tolist()
+            assert sidecar_metadata['delimiter'] == ','
+            assert sidecar_metadata['file_size_bytes'] == metadata['file_size_bytes']
+        finally:
+            sidecar_path.unlink(missing_ok=True)
+
+    def test_stale_columnar_sidecar_is_ignored(self, sample_csv_file):
+        df, metadata = DataProcessingService.parse_csv_file(sample_csv_file)
+        sidecar_path = Path(f"{sample_csv_file}.parquet")
+
+        try:
+            DataProcessingService.write_columnar_sidecar(df, metadata, sample_csv_file, sidecar_path)
+
+            with open(sample_csv_file, 'a') as f:
+                f.write("Dana White,28,52000.00,2023-04-01,true\n")
+
+            assert DataProcessingService.read_columnar_sidecar(sidecar_path, sample_csv_file) is None
+
+            fallback_df, _ = DataProcessingService.load_dataframe(sample_csv_file, sidecar_path)
+            assert len(fallback_df) == 6
+        finally:
+            sidecar_path.unlink(missing_ok=True)
+
+    def test_parse_csv_file_projects_columns(self, sample_csv_file, monkeypatch):
+        full_df, _ = DataProcessingService.parse_csv_file(sample_csv_file)
+
+        usecols = []
+        read_csv = pd.read_csv
+
+        def spy_read_csv(*args, **kwargs):
+            usecols.append(kwargs.get('usecols'))
+            return read_csv(*args, **kwargs)
+
+        monkeypatch.setattr(pd, 'read_csv', spy_read_csv)
+        df, metadata = DataProcessingService.parse_csv_file(sample_csv_file, columns=['salary', 'name'])
+
+        assert usecols[-1] == ['salary', 'name']
+        assert metadata['columns'] == ['salary', 'name']
+        pd.testing.assert_frame_equal(df, full_df[['salary', 'name']])
+
+    def test_load_dataframe_invalid_column(self, sample_csv_file):
+        with pytest.raises(ValueError, match="Column 'invalid_column' not found"):
+            DataProcessingService.load_dataframe(sample_csv_file, columns=['invalid_column'])
+
+    @pytest.mark.parametrize('delimiter', [',', ';', '\t', '|'])
+    def test_sniff_dialect_delimiters(self, delimiter):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write(delimiter.join(['id', 'name', 'score']) + "\n")
+            for i in range(20):
+                f.write(delimiter.join([str(i), f"name {i}", f"{i * 1.5}"]) + "\n")
+            temp_path = Path(f.name)
+
+        try:
+            dialect = DataProcessingService.sniff_dialect(temp_path, 'utf-8')
+
+            assert dialect['delimiter'] == delimiter
+            assert dialect['field_count'] == 3
+            assert dialect['confidence'] == 1.0
+            assert dialect['has_header'] is True
+            assert dialect['line_terminator'] == '\n'
+        finally:
+            os.unlink(temp_path)
+
+    def test_sniff_dialect_quoted_fields(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as f:
+            f.write('city;description\r\n')
+            f.write('Paris;"Capital; largest city"\r\n')
+            f.write("Lyon;\"Rhône, O'Neill's favourite\"\r\n")
+            temp_path = Path(f.name)
+
+        try:
+            dialect = DataProcessingService.sniff_dialect(temp_path, 'utf-8')
+
+            assert dialect['delimiter'] == ';'
+            assert dialect['quotechar'] == '"'
+            assert dialect['line_terminator'] == '\r\n'
+        finally:
+            os.unlink(temp_path)
+
+    @pytest.mark.parametrize('content, quotechar', [
+        ("id,product,note\n1,Widget,'90s reissue\n2,Gadget,ok\n3,Gizmo,'tis new\n", '"'),
+        ("id,note\n1,'a, b'\n2,'c'\n3,'it''s'\n", "'")
+    ])
+    def test_sniff_dialect_single_quotes(self, content, quotechar):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as f:
+            f.write(content)
+            temp_path = Path(f.name)
+
+        try:
+            dialect = DataProcessingService.sniff_dialect(temp_path, 'utf-8')
+            assert dialect['delimiter'] == ','
+            assert dialect['quotechar'] == quotechar
+
+            df, _ = DataProcessingService.parse_csv_file(temp_path)
+            assert len(df) == 3
+        finally:
+            os.unlink(temp_path)
+
+    @pytest.mark.parametrize('content, has_header', [
+        ("country,2020,2021\nFrance,1.5,2.5\nSpain,3.5,4.5\n", True),
+        ("name,city\nJohn,Paris\nJane,Lyon\n", True),
+        ("id,month\n1,May\n2,June\n", True),
+        ("1,2.5,3\n4,5.5,6\n", False),
+        ("7,2023-01-01\n8,2023-01-02\n", False)
+    ])
+    def test_sniff_dialect_header(self, content, has_header):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write(content)
+            temp_path = Path(f.name)
+
+        try:
+            assert DataProcessingService.sniff_dialect(temp_path, 'utf-8')['has_header'] is has_header
+        finally:
+            os.unlink(temp_path)
+
+    def test_parse_csv_file_without_header(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write("1,10.5,2023-01-01\n")
+            f.write("2,11.5,2023-01-02\n")
+            f.write("3,12.5,2023-01-03\n")
+            temp_path = Path(f.name)
+
+        try:
+            df, metadata = DataProcessingService.parse_csv_file(temp_path)
+
+            assert len(df) == 3
+            assert metadata['columns'] == ['column_1', 'column_2', 'column_3']
+            assert metadata['dialect']['has_header'] is False
+        finally:
+            os.unlink(temp_path)
+
+    def test_read_csv_head(self, sample_csv_file):
+        df, metadata = DataProcessingService.read_csv_head(sample_csv_file, rows=2)
+
+        assert len(df) == 2
+        assert metadata['total_rows'] == 5
+        assert metadata['is_partial'] is True
+        assert metadata['columns'] == ['name', 'age', 'salary', 'hired_date', 'is_active']
+
+    def test_count_rows_without_trailing_newline(self):
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.csv', delete=False) as f:
+            f.write(b"a,b\r\n1,2\r\n3,4")
+            temp_path = Path(f.name)
+
+        try:
+            assert DataProcessingService.count_rows(temp_path, '\r\n') == 2
+            assert DataProcessingService.count_rows(temp_path, '\r\n', has_header=False) == 3
+        finally:
+            os.unlink(temp_path)
+
+    def test_read_columnar_head(self, sample_csv_file):
+        df, metadata = DataProcessingService.parse_csv_file(sample_csv_file)
+        sidecar_path = Path(f"{sample_csv_file}.parquet")
+
+        try:
+            DataProcessingService.write_columnar_sidecar(df, metadata, sample_csv_file, sidecar_path)
+
+            head_df, head_metadata = DataProcessingService.read_columnar_head(
+                sidecar_path, sample_csv_file, rows=2
+            )
+
+            assert len(head_df) == 2
+            assert head_metadata['total_rows'] == 5
+            assert head_metadata['missing_values_per_column']['age'] == 1
+            assert head_metadata['is_partial'] is True
+        finally:
+            sidecar_path.unlink(missing_ok=True)
+
+    def test_serialize_dataframe_columns_orient(self):
+        df = pd.DataFrame({
+            'count': np.array([1, 2, 3], dtype=np.int32),
+            'ratio': [0.5, np.nan, 1.5],
+            'label': pd.Categorical(['a', None, 'a']),
+            'when': pd.to_datetime(['2023-01-01 10:30:00', None, '2023-01-03 08:00:00'])
+        })
+
+        data = DataProcessingService.serialize_dataframe(df, orient='columns')
+
+        assert data['count'] == [1, 2, 3]
+        assert type(data['count'][0]) is int
+        assert data['ratio'] == [0.5, None, 1.5]
+        assert data['label'] == ['a', None, 'a']
+        assert data['when'] == ['2023-01-01T10:30', None, '2023-01-03T08:00']
+
+    def test_serialize_dataframe_invalid_orient(self):
+        with pytest.raises(ValueError, match="Unsupported orient"):
+            DataProcessingService.serialize_dataframe(pd.DataFrame({'a': [1]}), orient='split')
+
+    def test_infer_column_types_from_text(self):
+        df = pd.DataFrame({
+            'amounts': ['1.5', '2', ' 3.25 ', None],
+            'dates': ['2023-01-01', '2023/02/15', 'Mar 3, 2023', None],
+            'flags': ['Yes', 'no', 'YES', 'no'],
+            'names': ['John', 'Jane', 'Bob', 'Alice']
+        })
+
+        inference = DataProcessingService.infer_column_types(df)
+
+        assert inference['amounts'] == {'type': 'float', 'confidence': 1.0}
+        assert inference['dates']['type'] == 'datetime'
+        assert inference['flags']['type'] == 'boolean'
+        assert inference['names'] == {'type': 'string', 'confidence': 1.0}
+
+    def test_infer_column_types_reports_conformance(self):
+        values = [str(i) for i in range(5000)]
+        values[::250] = ['N/A'] * len(values[::250])
+        df = pd.DataFrame({'ids': values})
+
+        inference = DataProcessingService.infer_column_types(df, sample_size=500)
+
+        assert inference['ids']['type'] == 'integer'
+        assert inference['ids']['confidence'] == 0.996
+
+    def test_parse_csv_file_reports_type_confidence(self, sample_csv_file):
+        _, metadata = DataProcessingService.parse_csv_file(sample_csv_file)
+
+        assert metadata['column_types']['hired_date'] == 'datetime'
+        assert metadata['column_type_confidence']['hired_date'] == 1.0
+
+    def test_compact_dataframe_is_lossless(self):
+        df = pd.DataFrame({
+            'small': [1, 2, 3, 4],
+            'large': [1, 2, 3, 2 ** 40],
+            'halves': [0.5, 1.5, np.nan, 2.0],
+            'decimals': [0.1, 0.2, 0.3, 0.4],
+            'city': ['Paris', 'Paris', 'Lyon', None],
+            'name': ['a', 'b', 'c', 'd'],
+            'flags': [True, False, np.nan, True]
+        })
+
+        compact = DataProcessingService.compact_dataframe(df)
+
+        assert compact['small'].dtype == np.int8
+        assert compact['large'].dtype == np.int64
+        assert compact['halves'].dtype == np.float64
+        assert compact['decimals'].dtype == np.float64
+        assert isinstance(compact['city'].dtype, pd.CategoricalDtype)
+        assert compact['name'].dtype == pd.StringDtype('pyarrow')
+        assert compact['flags'].dtype == object
+        assert DataProcessingService.serialize_dataframe(compact) == DataProcessingService.serialize_dataframe(df)
+
+    def test_compact_dataframe_keeps_float_aggregates_exact(self):
+        df = pd.DataFrame({'salary': np.full(200_000, 59956.5)})
+
+        compact = DataProcessingService.compact_dataframe(df)
+
+        assert compact['salary'].sum() == df['salary'].sum()
+        assert compact['salary'].mean() == 59956.5
+
+    def test_parse_csv_file_reports_compaction(self, sample_csv_file):
+        _, metadata = DataProcessingService.parse_csv_file(sample_csv_file)
+
+        assert metadata['memory_usage_bytes'] < metadata['memory_usage_before_compaction_bytes']
+
+    def test_parse_hints_roundtrip(self, sample_csv_file, monkeypatch):
+        df, metadata = DataProcessingService.parse_csv_file(sample_csv_file)
+        hints = DataProcessingService.parse_hints(df, metadata)
+
+        assert hints['encoding'] == metadata['encoding']
+        assert hints['dialect']['has_header'] is True
+        assert hints['column_dtypes']['age'] == 'float64'
+
+        # Nothing is detected again when reading with the hints
+        monkeypatch.setattr(DataProcessingService, 'detect_encoding', pytest.fail)
+        monkeypatch.setattr(DataProcessingService, 'sniff_dialect', pytest.fail)
+        hinted, _ = DataProcessingService.parse_csv_file(sample_csv_file, hints=hints)
+
+        pd.testing.assert_frame_equal(hinted, df)
+
+    def test_parse_hints_keep_datetime_columns(self, sample_csv_file, monkeypatch):
+        df, metadata = DataProcessingService.parse_csv_file(sample_csv_file, hints={'parse_dates': ['hired_date']})
+        hints = DataProcessingService.parse_hints(df, metadata)
+        assert hints['column_dtypes']['hired_date'] == 'datetime64[ns]'
+
+        # The other recorded dtypes are applied instead of dropped as stale
+        dtypes = []
+        read_csv = pd.read_csv
+
+        def spy_read_csv(*args, **kwargs):
+            dtypes.append(kwargs.get('dtype'))
+            return read_csv(*args, **kwargs)
+
+        monkeypatch.setattr(pd, 'read_csv', spy_read_csv)
+        hinted, _ = DataProcessingService.parse_csv_file(sample_csv_file, hints=hints)
+
+        assert len(dtypes) == 1
+        assert 'hired_date' not in dtypes[0]
+        pd.testing.assert_frame_equal(hinted, df)
+
+    def test_parse_hints_keep_integers_wide(self, tmp_path):
+        csv_path = tmp_path / 'counts.csv'
+        csv_path.write_text("id,count\n1,10\n2,20\n")
+        df, metadata = DataProcessingService.parse_csv_file(csv_path)
+        hints = DataProcessingService.parse_hints(df, metadata)
+
+        assert df['count'].dtype == np.int8
+        assert hints['column_dtypes']['count'] == 'int64'
+
+        # A value beyond the compacted type is kept instead of wrapping around
+        csv_path.write_text("id,count\n1,10\n2,300\n")
+        hinted, _ = DataProcessingService.parse_csv_file(csv_path, hints=hints)
+
+        assert hinted['count'].tolist() == [10, 300]
+
+    def test_parse_csv_file_ignores_stale_dtypes(self, sample_csv_file):
+        hints = {'column_dtypes': {'name': 'int8', 'is_active': 'bool'}}
+
+        df, _ = DataProcessingService.parse_csv_file(sample_csv_file, hints=hints)
+
+        assert df['name'].iloc[0] == 'John Doe'
+
+    def test_parse_csv_file_hint_overrides(self, sample_csv_file):
+        hints = {'column_dtypes': {'age': 'float64'}, 'parse_dates': ['hired_date'], 'engine': 'python'}
+
+        df, _ = DataProcessingService.parse_csv_file(sample_csv_file, hints=hints)
+
+        assert pd.api.types.is_datetime64_any_dtype(df['hired_date'])
+        assert df['hired_date'].iloc[0] == pd.Timestamp('2023-01-15')
+
+    def test_profile_dataframe(self, sample_csv_file):
+        df, _ = DataProcessingService.parse_csv_file(sample_csv_file)
+
+        profile = DataProcessingService.profile_dataframe(df)
+
+        assert profile['total_rows'] == 5
+        assert profile['total_columns'] == 5
+        assert profile['columns']['age']['missing_values'] == 1
+        assert profile['columns']['salary']['quartiles']['q2'] == 55000.0
+        assert profile['columns']['is_active']['top_values'] == {'True': 3, 'False': 2}
+        assert profile['columns']['name']['mode'] == 'Alice Brown'
+
+    def test_profile_dataframe_histograms(self):
+        df = pd.DataFrame({
+            'value': np.arange(1000, dtype=float),
+            'day': pd.date_range('2024-01-01', periods=1000, freq='h').astype(str),
+            'label': ['a', 'b'] * 500
+        })
+
+        columns = DataProcessingService.profile_dataframe(df)['columns']
+
+        histogram = columns['value']['histogram']
+        assert len(histogram['counts']) == DataProcessingService.HISTOGRAM_BINS
+        assert histogram['edges'][0] == 0.0
+        assert histogram['edges'][-1] == 999.0
+        assert sum(histogram['counts']) == 1000
+        assert columns['value']['quantile_histogram']['counts'][0] == pytest.approx(1000 / 32, abs=1)
+        assert len(columns['value']['sparkline']) == DataProcessingService.SPARKLINE_BINS
+        assert sum(columns['value']['sparkline']) == 1000
+
+        assert columns['day']['histogram']['edges'][0] == '2024-01-01'
+        assert sum(columns['day']['sparkline']) == 1000
+        assert 'histogram' not in columns['label']
+
+    def test_profile_dataframe_all_missing_numeric(self):
+        df = pd.DataFrame({'empty': [np.nan, np.nan]})
+
+        stats = DataProcessingService.profile_dataframe(df)['columns']['empty']
+
+        assert stats['missing_values'] == 2
+        assert stats['mean'] is None
+        assert stats['quartiles']['q1'] is None
+        assert stats['histogram'] is None
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import pytest
+from pathlib import Path
+
+from src.services.data_processing import DataProcessingService
+from src.services.dataset_cache import DatasetCache
+
+
+class TestDatasetCache:
+
+    @pytest.fixture
+    def csv_file(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write("name,age\n")
+            f.write("John,30\n")
+            f.write("Jane,25\n")
+            temp_path = f.name
+
+        yield Path(temp_path)
+        os.unlink(temp_path)
+
+    @pytest.fixture
+    def cache(self):
+        return DatasetCache(max_bytes=10 * 1024 * 1024)
+
+    def test_miss_then_hit(self, cache, csv_file):
+        df, _ = cache.get_or_load('file-1', csv_file, DataProcessingService.parse_csv_file)
+        cached_df, metadata = cache.get_or_load('file-1', csv_file, DataProcessingService.parse_csv_file)
+
+        assert cached_df is df
+        assert metadata['total_rows'] == 2
+
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+        assert stats['current_bytes'] > 0
+
+    def test_file_change_invalidates_entry(self, cache, csv_file):
+        cache.get_or_load('file-1', csv_file, DataProcessingService.parse_csv_file)
+
+        with open(csv_file, 'a') as f:
+            f.write("Bob,35\n")
+
+        df, _ = cache.get_or_load('file-1', csv_file, DataProcessingService.parse_csv_file)
+
+        assert len(df) == 3
+        assert cache.get_stats()['misses'] == 2
+
+    def test_invalidate(self, cache, csv_file):
+        cache.get_or_load('file-1', csv_file, DataProcessingService.parse_csv_file)
+        cache.invalidate('file-1')
+
+        assert cache.get('file-1', csv_file) is None
+        assert cache.get_stats()['current_bytes'] == 0
+
+    def test_lru_eviction_by_bytes(self, csv_file):
+        df, metadata = DataProcessingService.parse_csv_file(csv_file)
+        size = int(df.memory_usage(deep=True).sum())
+        cache = DatasetCache(max_bytes=size * 2)
+
+        cache.put('file-1', csv_file, df, metadata)
+        cache.put('file-2', csv_file, df, metadata)
+        cache.get('file-1', csv_file)
+        cache.put('file-3', csv_file, df, metadata)
+
+        assert cache.get('file-2', csv_file) is None
+        assert cache.get('file-1', csv_file) is not None
+        assert cache.get('file-3', csv_file) is not None
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_oversized_frame_not_cached(self, csv_file):
+        df, metadata = DataProcessingService.parse_csv_file(csv_file)
+        cache = DatasetCache(max_bytes=1)
+
+        cache.put('file-1', csv_file, df, metadata)
+
+        assert cache.get_stats()['entries'] == 0
+
+    def test_variants_cached_and_invalidated_with_file(self, cache, csv_file):
+        df, _ = cache.get_or_load('file-1', csv_file, DataProcessingService.parse_csv_file)
+        sorted_df = df.sort_values('age')
+        cache.put('file-1', csv_file, sorted_df, {}, variant='by-age')
+
+        assert cache.get('file-1', csv_file)[0] is df
+        assert cache.get('file-1', csv_file, variant='by-age')[0] is sorted_df
+        assert cache.get_stats()['entries'] == 2
+
+        cache.invalidate('file-1')
+
+        assert cache.get('file-1', csv_file, variant='by-age') is None
+        assert cache.get_stats()['entries'] == 0
@@ -0,0 +1,159 @@
+import os
+import tempfile
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from src.schemas.query import DatasetQuery
+from src.services.data_processing import DataProcessingService
+from src.services.dataset_query import DatasetQueryService
+
+
+class TestDatasetQueryService:
+
+    @pytest.fixture
+    def sample_df(self):
+        return pd.DataFrame({
+            'name': ['John', 'Jane', 'Bob', 'Alice', 'Eve'],
+            'age': [30, 25, np.nan, 40, 35],
+            'city': ['Paris', 'Lyon', 'Paris', None, 'Nice']
+        })
+
+    @pytest.fixture
+    def sidecar(self, sample_df):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            sample_df.to_csv(f, index=False)
+            temp_path = f.name
+
+        source_path = Path(temp_path)
+        sidecar_path = Path(f"{temp_path}.parquet")
+        df, metadata = DataProcessingService.parse_csv_file(source_path)
+        DataProcessingService.write_columnar_sidecar(df, metadata, source_path, sidecar_path)
+
+        yield source_path, sidecar_path
+        os.unlink(temp_path)
+        sidecar_path.unlink(missing_ok=True)
+
+    def test_filter_sort_and_project(self, sample_df):
+        query = DatasetQuery(
+            columns=['name'],
+            filters=[{'column': 'age', 'op': 'ge', 'value': 30}],
+            sort=[{'column': 'age', 'descending': True}]
+        )
+
+        page, matched_rows = DatasetQueryService.execute(sample_df, query)
+
+        assert matched_rows == 3
+        assert list(page.columns) == ['name']
+        assert page['name'].tolist() == ['Alice', 'Eve', 'John']
+
+    def test_missing_values_never_match(self, sample_df):
+        query = DatasetQuery(filters=[{'column': 'city', 'op': 'ne', 'value': 'Paris'}])
+
+        _, matched_rows = DatasetQueryService.execute(sample_df, query)
+
+        assert matched_rows == 2
+
+    def test_paging(self, sample_df):
+        query = DatasetQuery(sort=[{'column': 'name'}], offset=1, limit=2)
+
+        page, matched_rows = DatasetQueryService.execute(sample_df, query)
+
+        assert matched_rows == 5
+        assert page['name'].tolist() == ['Bob', 'Eve']
+
+    def test_touched_columns(self):
+        query = DatasetQuery(
+            columns=['name'],
+            filters=[{'column': 'age', 'op': 'is_null'}],
+            sort=[{'column': 'city'}]
+        )
+
+        assert DatasetQueryService.touched_columns(query) == ['name', 'age', 'city']
+        assert DatasetQueryService.touched_columns(DatasetQuery()) is None
+
+    @pytest.mark.parametrize('filters', [
+        [{'column': 'city', 'op': 'in', 'value': ['Paris', 'Nice']}],
+        [{'column': 'city', 'op': 'not_in', 'value': ['Paris']}],
+        [{'column': 'city', 'op': 'contains', 'value': 'ar'}],
+        [{'column': 'age', 'op': 'lt', 'value': '36'}, {'column': 'age', 'op': 'not_null'}],
+        [{'column': 'age', 'op': 'is_null'}]
+    ])
+    def test_columnar_pushdown_matches_pandas(self, sample_df, sidecar, filters):
+        source_path, sidecar_path = sidecar
+        query = DatasetQuery(columns=['name'], filters=filters, sort=[{'column': 'name'}])
+
+        df = DatasetQueryService.read_columnar(sidecar_path, source_path, query)
+        pushed_page, pushed_rows = DatasetQueryService.execute(df, query, filtered=True)
+        page, matched_rows = DatasetQueryService.execute(sample_df, query)
+
+        assert list(df.columns) == ['name', *{f['column'] for f in filters}]
+        assert pushed_rows == matched_rows
+        assert pushed_page['name'].tolist() == page['name'].tolist()
+
+    @pytest.mark.parametrize('query_filter', [
+        {'column': 'city', 'op': 'eq', 'value': 'Paris'},
+        {'column': 'city', 'op': 'lt', 'value': 'Nice'},
+        {'column': 'city', 'op': 'in', 'value': ['Lyon', 'Nice']},
+        {'column': 'city', 'op': 'not_in', 'value': ['Paris']},
+        {'column': 'city', 'op': 'contains', 'value': 'ar'}
+    ])
+    def test_categorical_filters_match_strings(self, query_filter, tmp_path):
+        df = pd.DataFrame({'city': ['Paris', 'Lyon', 'Paris', None, 'Nice', 'Paris'] * 10})
+        compact = DataProcessingService.compact_dataframe(df)
+        query = DatasetQuery(filters=[query_filter])
+
+        source_path = tmp_path / 'cities.csv'
+        sidecar_path = tmp_path / 'cities.csv.parquet'
+        df.to_csv(source_path, index=False)
+        DataProcessingService.write_columnar_sidecar(
+            compact, {'encoding': 'utf-8', 'delimiter': ','}, source_path, sidecar_path
+        )
+        pushed = DatasetQueryService.read_columnar(sidecar_path, source_path, query)
+
+        assert isinstance(compact['city'].dtype, pd.CategoricalDtype)
+        expected = DatasetQueryService.build_mask(df, query.filters)
+        assert DatasetQueryService.build_mask(compact, query.filters).tolist() == expected.tolist()
+        assert len(pushed) == expected.sum()
+
+    @pytest.mark.parametrize('query_filter', [
+        {'column': 'age', 'op': 'in', 'value': [30, 300]},
+        {'column': 'age', 'op': 'in', 'value': [30.5, 25]},
+        {'column': 'age', 'op': 'not_in', 'value': [-1000, 40]},
+        {'column': 'age', 'op': 'eq', 'value': '300'},
+        {'column': 'age', 'op': 'lt', 'value': 30.5},
+        {'column': 'age', 'op': 'ge', 'value': '-200'}
+    ])
+    def test_narrowed_integer_filters(self, query_filter, tmp_path):
+        df = pd.DataFrame({'age': [30, 25, 40, 35, 30] * 10})
+        compact = DataProcessingService.compact_dataframe(df)
+        query = DatasetQuery(filters=[query_filter])
+
+        source_path = tmp_path / 'ages.csv'
+        sidecar_path = tmp_path / 'ages.csv.parquet'
+        df.to_csv(source_path, index=False)
+        DataProcessingService.write_columnar_sidecar(
+            compact, {'encoding': 'utf-8', 'delimiter': ','}, source_path, sidecar_path
+        )
+        pushed = DatasetQueryService.read_columnar(sidecar_path, source_path, query)
+
+        assert compact['age'].dtype == np.int8
+        expected = DatasetQueryService.build_mask(df, query.filters)
+        assert len(pushed) == expected.sum()
+        assert pushed['age'].tolist() == df['age'][expected].tolist()
+
+    def test_invalid_comparison(self, sample_df, sidecar):
+        source_path, sidecar_path = sidecar
+        query = DatasetQuery(filters=[{'column': 'age', 'op': 'eq', 'value': 'abc'}])
+
+        with pytest.raises(ValueError):
+            DatasetQueryService.execute(sample_df, query)
+        with pytest.raises(ValueError):
+            DatasetQueryService.read_columnar(sidecar_path, source_path, query)
+
+    def test_unknown_column(self, sample_df):
+        query = DatasetQuery(sort=[{'column': 'unknown'}])
+
+        with pytest.raises(ValueError, match="Column 'unknown' not found"):
+            DatasetQueryService.execute(sample_df, query)
@@ -0,0 +1,97 @@
+import json
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.schemas.query import SeriesQuery
+from src.services.downsampling import DownsamplingService
+
+
+class TestDownsamplingService:
+
+    @pytest.fixture
+    def line_df(self):
+        rng = np.random.default_rng(1)
+        values = np.cumsum(rng.normal(size=10_000))
+        values[4321] = 1_000.0
+        return pd.DataFrame({'t': np.arange(10_000), 'value': values})
+
+    def test_lttb_keeps_endpoints_and_threshold(self, line_df):
+        x = line_df['t'].to_numpy(dtype=float)
+        y = line_df['value'].to_numpy()
+
+        selected = DownsamplingService.lttb(x, y, 200)
+
+        assert len(selected) == 200
+        assert selected[0] == 0
+        assert selected[-1] == len(x) - 1
+        assert np.all(np.diff(selected) > 0)
+        assert 4321 in selected
+
+    def test_lttb_short_series_unchanged(self):
+        x = np.arange(5, dtype=float)
+
+        assert DownsamplingService.lttb(x, x, 10).tolist() == [0, 1, 2, 3, 4]
+
+    def test_min_max_keeps_extremes(self, line_df):
+        query = SeriesQuery(x='t', y=['value'], mode='minmax', width=100)
+
+        series = DownsamplingService.downsample(line_df, query)['series'][0]
+
+        assert series['points'] <= 4 * 100
+        assert max(series['y']) == line_df['value'].max()
+        assert min(series['y']) == line_df['value'].min()
+        assert series['x'][0] == 0
+        assert series['x'][-1] == 9_999
+
+    def test_sample_keeps_sparse_points(self):
+        rng = np.random.default_rng(2)
+        df = pd.DataFrame({'x': rng.normal(size=50_000), 'y': rng.normal(size=50_000)})
+        df.loc[0, ['x', 'y']] = [40.0, -40.0]
+        query = SeriesQuery(x='x', y=['y'], mode='sample', max_points=500)
+
+        series = DownsamplingService.downsample(df, query)['series'][0]
+
+        assert series['points'] < 1_000
+        assert [40.0, -40.0] in [list(point) for point in zip(series['x'], series['y'])]
+
+    def test_bins_count_all_points(self, line_df):
+        line_df.loc[10, 'value'] = np.nan
+        query = SeriesQuery(x='t', y=['value'], mode='bins', width=50, height=20)
+
+        series = DownsamplingService.downsample(line_df, query)['series'][0]
+
+        assert len(series['x_edges']) == 51
+        assert len(series['y_edges']) == 21
+        assert sum(cell[2] for cell in series['cells']) == len(line_df) - 1
+
+    def test_bins_grid_fits_point_budget(self):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({'x': rng.random(200_000), 'y': rng.random(200_000)})
+        query = SeriesQuery(x='x', y=['y'], mode='bins', width=4000, height=2000, max_points=2000)
+
+        series = DownsamplingService.downsample(df, query)['series'][0]
+
+        width, height = len(series['x_edges']) - 1, len(series['y_edges']) - 1
+        assert width * height <= 2000
+        assert abs(width - 2 * height) <= 2
+        assert len(series['cells']) <= 2000
+        assert sum(cell[2] for cell in series['cells']) == len(df)
+        assert len(json.dumps(series)) < 100_000
+
+    def test_datetime_axis(self):
+        df = pd.DataFrame({
+            'day': ['2024-01-03', '2024-01-01', '2024-01-02', None],
+            'value': [3, 1, 2, 4]
+        })
+        query = SeriesQuery(x='day', y=['value'])
+
+        result = DownsamplingService.downsample(df, query)
+
+        assert result['source_rows'] == 4
+        assert result['series'][0]['x'] == ['2024-01-01', '2024-01-02', '2024-01-03']
+        assert result['series'][0]['y'] == [1, 2, 3]
+
+    def test_unknown_column(self, line_df):
+        with pytest.raises(ValueError, match="not found"):
+            DownsamplingService.downsample(line_df, SeriesQuery(x='t', y=['missing']))
@@ -0,0 +1,678 @@
+"""Tests for the dataset endpoints of uploaded files"""
+import io
+import json
+import hashlib
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.api.v1.endpoints import files as files_endpoints
+from src.models import User, Project as ProjectModel, File as FileModel, FileProfile, ProcessingJob
+from src.services.dataset_cache import dataset_cache
+from src.services.processing_jobs import ProcessingQueue
+from src.services.result_cache import result_cache
+from src.auth.utils import get_password_hash
+from src.storage.local import LocalFileStorage
+
+
+CSV_CONTENT = (
+    "name,age,salary,city\n"
+    "John,30,50000.5,Paris\n"
+    "Jane,25,45000.0,Lyon\n"
+    "Bob,,60000.75,Paris\n"
+    "Alice,40,70000.0,Nice\n"
+).encode()
+
+
+@pytest.fixture(autouse=True)
+def storage(tmp_path, monkeypatch):
+    """Store uploads in a temporary directory"""
+    temp_storage = LocalFileStorage(str(tmp_path))
+    monkeypatch.setattr(files_endpoints, "storage", temp_storage)
+    return temp_storage
+
+
+@pytest.fixture(autouse=True)
+def processing_queue(monkeypatch):
+    """Process uploads inline so their results are visible to the test"""
+    queue = ProcessingQueue(max_workers=0)
+    monkeypatch.setattr(files_endpoints, "processing_queue", queue)
+    return queue
+
+
+@pytest.fixture
+def test_user(db: Session):
+    """Create a test user"""
+    user = User(
+        username="datauser",
+        email="data@example.com",
+        password_hash=get_password_hash("password123")
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def auth_headers(client: TestClient, test_user: User):
+    """Get authentication headers"""
+    response = client.post(
+        "/api/v1/users/login",
+        json={"username": "datauser", "password": "password123"}
+    )
+    token = response.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def test_project(db: Session, test_user: User):
+    """Create a test project"""
+    project = ProjectModel(name="Data Project", owner_id=test_user.id)
+    db.add(project)
+    db.commit()
+    db.refresh(project)
+    return project
+
+
+@pytest.fixture
+def uploaded_file(client: TestClient, auth_headers: dict, test_project: ProjectModel):
+    """Upload a small CSV file"""
+    response = client.post(
+        f"/api/v1/projects/{test_project.id}/files",
+        headers=auth_headers,
+        files={"file": ("people.csv", io.BytesIO(CSV_CONTENT), "text/csv")}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestFileDataEndpoints:
+    """Test preview, metadata and statistics of uploaded files"""
+
+    def test_upload_writes_sidecar_and_profile(self, db: Session, uploaded_file: dict, storage):
+        file = db.query(FileModel).filter(FileModel.id == uploaded_file["id"]).first()
+
+        assert file.columnar_path == storage.get_sidecar_path(uploaded_file['path'], 'parquet')
+        assert storage.get_full_path(file.columnar_path).exists()
+        assert file.profile.profile["columns"]["age"]["missing_values"] == 1
+
+    def test_processing_status(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.get(
+            f"/api/v1/files/{uploaded_file['id']}/processing",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["file_id"] == uploaded_file["id"]
+        assert data["status"] == "done"
+        assert data["duration_seconds"] > 0
+        assert data["peak_memory_bytes"] > 0
+
+    def test_list_files_includes_sparklines(
+        self, client: TestClient, auth_headers: dict, uploaded_file: dict, test_project: ProjectModel
+    ):
+        response = client.get(f"/api/v1/projects/{test_project.id}/files", headers=auth_headers)
+
+        assert response.status_code == 200
+        sparklines = response.json()["files"][0]["sparklines"]
+        assert set(sparklines) == {"age", "salary"}
+        assert sum(sparklines["age"]) == 3
+
+    def test_column_stats_histogram(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.get(
+            f"/api/v1/files/{uploaded_file['id']}/column-stats/salary",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        histogram = response.json()["histogram"]
+        assert len(histogram["edges"]) == len(histogram["counts"]) + 1
+        assert histogram["edges"][0] == 45000.0
+        assert sum(histogram["counts"]) == 4
+
+    def test_batch_column_stats(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.post(
+            f"/api/v1/files/{uploaded_file['id']}/column-stats",
+            headers=auth_headers,
+            json={"columns": ["salary", "city"]}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["source"] == "profile"
+        assert list(data["columns"]) == ["salary", "city"]
+        assert data["columns"]["salary"]["max"] == 70000.0
+        assert data["columns"]["city"]["mode"] == "Paris"
+        assert set(data["timing"]["columns"]) == {"salary", "city"}
+
+    def test_batch_column_stats_single_read(
+        self, client: TestClient, auth_headers: dict, uploaded_file: dict, db: Session
+    ):
+        db.query(FileProfile).filter(FileProfile.file_id == uploaded_file["id"]).delete()
+        db.commit()
+
+        response = client.post(
+            f"/api/v1/files/{uploaded_file['id']}/column-stats",
+            headers=auth_headers,
+            json={"columns": "all"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["source"] == "dataframe"
+        assert list(data["columns"]) == ["name", "age", "salary", "city"]
+        assert data["columns"]["age"]["missing_values"] == 1
+        assert all(seconds >= 0 for seconds in data["timing"]["columns"].values())
+
+    def test_batch_column_stats_unknown_column(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.post(
+            f"/api/v1/files/{uploaded_file['id']}/column-stats",
+            headers=auth_headers,
+            json={"columns": ["age", "unknown"]}
+        )
+
+        assert response.status_code == 400
+        assert "not found" in response.json()["detail"]
+
+    def test_preview_is_partial(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.get(
+            f"/api/v1/files/{uploaded_file['id']}/preview?rows=2",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["preview"]["preview_rows"] == 2
+        assert data["preview"]["total_rows"] == 4
+        assert data["metadata"]["is_partial"] is True
+        assert data["metadata"]["missing_values_per_column"]["age"] == 1
+
+    def test_preview_approximate(self, client: TestClient, auth_headers: dict, uploaded_file: dict, storage):
+        assert storage.get_full_path(storage.get_sidecar_path(uploaded_file['path'], 'sample.parquet')).exists()
+
+        response = client.get(
+            f"/api/v1/files/{uploaded_file['id']}/preview?rows=3&approximate=true",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["metadata"]["approximate"] is True
+        assert data["metadata"]["sample_rows"] == 4
+        assert data["preview"]["total_rows"] == 4
+        assert data["preview"]["row_numbers"] == [0, 1, 2]
+        assert data["preview"]["data"][0]["name"] == "John"
+
+    def test_rows_page(self, client: TestClient, auth_headers: dict, uploaded_file: dict, storage):
+        response = client.get(
+            f"/api/v1/files/{uploaded_file['id']}/rows?offset=2&limit=5",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [row["name"] for row in data["data"]] == ["Bob", "Alice"]
+        assert data["offset"] == 2
+        assert data["rows"] == 2
+        assert data["total_rows"] == 4
+        assert storage.get_full_path(storage.get_sidecar_path(uploaded_file['path'], 'rowidx.json')).exists()
+
+    def test_rows_invalid_limit(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.get(
+            f"/api/v1/files/{uploaded_file['id']}/rows?limit=0",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
+    def test_query(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.post(
+            f"/api/v1/files/{uploaded_file['id']}/query",
+            headers=auth_headers,
+            json={
+                "columns": ["name", "salary"],
+                "filters": [{"column": "city", "op": "eq", "value": "Paris"}],
+                "sort": [{"column": "salary", "descending": True}]
+            }
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["columns"] == ["name", "salary"]
+        assert data["matched_rows"] == 2
+        assert data["data"] == [
+            {"name": "Bob", "salary": 60000.75},
+            {"name": "John", "salary": 50000.5}
+        ]
+
+    def test_query_legacy_file_location(
+        self, client: TestClient, auth_headers: dict, uploaded_file: dict,
+        db: Session, storage: LocalFileStorage, tmp_path, monkeypatch
+    ):
+        # An older upload without a hash, stored under the upload directory only
+        file = db.query(FileModel).filter(FileModel.id == uploaded_file["id"]).first()
+        file.content_hash = None
+        db.commit()
+        legacy_path = tmp_path / "legacy" / file.path
+        legacy_path.parent.mkdir(parents=True)
+        storage.get_full_path(file.path).rename(legacy_path)
+        monkeypatch.setattr(files_endpoints.settings, "UPLOAD_DIRECTORY", str(tmp_path / "legacy"))
+
+        response = client.post(
+            f"/api/v1/files/{uploaded_file['id']}/query",
+            headers=auth_headers,
+            json={"filters": [{"column": "city", "op": "eq", "value": "Paris"}]}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["matched_rows"] == 2
+        db.refresh(file)
+        assert file.content_hash == hashlib.sha256(CSV_CONTENT).hexdigest()
+
+    def test_query_unknown_column(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.post(
+            f"/api/v1/files/{uploaded_file['id']}/query",
+            headers=auth_headers,
+            json={"filters": [{"column": "unknown", "op": "is_null"}]}
+        )
+
+        assert response.status_code == 400
+        assert "not found" in response.json()["detail"]
+
+    def test_aggregate(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        result_cache.clear()
+        body = {
+            "group_by": ["city"],
+            "metrics": [{"func": "count"}, {"func": "avg", "column": "age"}]
+        }
+
+        response = client.post(
+            f"/api/v1/files/{uploaded_file['id']}/aggregate",
+            headers=auth_headers,
+            json=body
+        )
+        cached_response = client.post(
+            f"/api/v1/files/{uploaded_file['id']}/aggregate",
+            headers=auth_headers,
+            json=body
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"][0] == {"city": "Paris", "count": 2, "avg_age": 30.0}
+        assert cached_response.json() == response.json()
+        assert result_cache.get_stats()["hits"] == 1
+
+    def test_correlations(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.post(
+            f"/api/v1/files/{uploaded_file['id']}/correlations",
+            headers=auth_headers,
+            json={"method": "pearson"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["columns"] == ["age", "salary"]
+        assert data["matrix"][0][1] > 0.9
+        assert data["top_pairs"][0]["rows"] == 3
+
+    def test_series(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.post(
+            f"/api/v1/files/{uploaded_file['id']}/series",
+            headers=auth_headers,
+            json={"x": "age", "y": ["salary"], "mode": "lttb", "width": 10}
+        )
+
+        assert response.status_code == 200
+        series = response.json()["series"][0]
+        assert series["column"] == "salary"
+        assert series["points"] == len(series["x"]) == len(series["y"])
+        assert series["x"] == sorted(series["x"])
+
+    def test_series_rejects_text_axis(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.post(
+            f"/api/v1/files/{uploaded_file['id']}/series",
+            headers=auth_headers,
+            json={"x": "name", "y": ["salary"]}
+        )
+
+        assert response.status_code == 400
+        assert "neither numeric nor a date" in response.json()["detail"]
+
+    def test_resample(self, client: TestClient, auth_headers: dict, test_project: ProjectModel):
+        content = (
+            "when,amount\n"
+            "2024-01-02 10:00,5\n"
+            "2024-01-01 09:00,1\n"
+            "2024-01-01 17:30,2\n"
+            "2024-01-04 08:00,4\n"
+        ).encode()
+        upload = client.post(
+            f"/api/v1/projects/{test_project.id}/files",
+            headers=auth_headers,
+            files={"file": ("events.csv", io.BytesIO(content), "text/csv")}
+        ).json()
+
+        response = client.post(
+            f"/api/v1/files/{upload['id']}/resample",
+            headers=auth_headers,
+            json={"time_column": "when", "value_columns": ["amount"], "frequency": "day", "func": "sum"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["timestamps"] == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+        assert data["series"][0]["values"] == [3, 5, 0, 4]
+
+        response = client.post(
+            f"/api/v1/files/{upload['id']}/resample",
+            headers=auth_headers,
+            json={"time_column": "amount", "value_columns": ["amount"]}
+        )
+
+        assert response.status_code == 400
+        assert "not a date column" in response.json()["detail"]
+
+    def test_query_results_are_cached(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        result_cache.clear()
+        for _ in range(2):
+            response = client.post(
+                f"/api/v1/files/{uploaded_file['id']}/query",
+                headers=auth_headers,
+                json={"columns": ["name"], "limit": 2}
+            )
+            assert response.json()["data"] == [{"name": "John"}, {"name": "Jane"}]
+
+        assert result_cache.get_stats()["hits"] == 1
+
+    def test_sidecars_never_replace_uploads(
+        self, client: TestClient, auth_headers: dict, test_project: ProjectModel, storage: LocalFileStorage
+    ):
+        upload = client.post(
+            f"/api/v1/projects/{test_project.id}/files",
+            headers=auth_headers,
+            files={"file": ("people.csv.rowidx.json", io.BytesIO(b'{"user": "data"}'), "application/json")}
+        )
+        csv_upload = client.post(
+            f"/api/v1/projects/{test_project.id}/files",
+            headers=auth_headers,
+            files={"file": ("people.csv", io.BytesIO(CSV_CONTENT), "text/csv")}
+        )
+        json_path = storage.get_full_path(upload.json()["path"])
+
+        assert storage.get_full_path(storage.get_sidecar_path(csv_upload.json()["path"], "rowidx.json")).exists()
+        assert json_path.read_bytes() == b'{"user": "data"}'
+
+        response = client.delete(f"/api/v1/files/{csv_upload.json()['id']}", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert json_path.exists()
+
+    def test_delete_file_invalidates_results(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        result_cache.clear()
+        client.post(
+            f"/api/v1/files/{uploaded_file['id']}/query",
+            headers=auth_headers,
+            json={"limit": 1}
+        )
+
+        response = client.delete(f"/api/v1/files/{uploaded_file['id']}", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert result_cache.get_stats()["entries"] == 0
+
+    def test_upload_records_content_hash(self, db: Session, uploaded_file: dict):
+        file = db.query(FileModel).filter(FileModel.id == uploaded_file["id"]).first()
+
+        assert file.content_hash == hashlib.sha256(CSV_CONTENT).hexdigest()
+
+    def test_upload_records_parse_hints(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.get(f"/api/v1/files/{uploaded_file['id']}/parse-hints", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["detected"]["dialect"]["delimiter"] == ","
+        assert data["detected"]["column_dtypes"]["age"] == "float64"
+        assert data["detected"]["encoding"] == "utf-8"
+        assert data["detected"]["encoding_confidence"] == 1.0
+        assert data["overrides"] == {}
+        assert data["effective"]["encoding"] == data["detected"]["encoding"]
+
+    def test_update_parse_hints_reprocesses_file(
+        self, client: TestClient, auth_headers: dict, uploaded_file: dict, db: Session
+    ):
+        response = client.put(
+            f"/api/v1/files/{uploaded_file['id']}/parse-hints",
+            headers=auth_headers,
+            json={"has_header": False, "encoding": "latin-1"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["overrides"] == {"has_header": False, "encoding": "latin-1"}
+        assert data["detected"]["encoding"] == "latin-1"
+        assert data["effective"]["dialect"]["has_header"] is False
+
+        file = db.query(FileModel).filter(FileModel.id == uploaded_file["id"]).first()
+        db.refresh(file)
+        assert len(file.processing_jobs) == 2
+        assert file.columnar_path is not None
+
+        response = client.get(f"/api/v1/files/{uploaded_file['id']}/metadata", headers=auth_headers)
+        assert response.json()["columns"] == ["column_1", "column_2", "column_3", "column_4"]
+        assert response.json()["total_rows"] == 5
+
+    def test_update_parse_hints_drops_profile(
+        self, client: TestClient, auth_headers: dict, uploaded_file: dict, db: Session, monkeypatch
+    ):
+        # The new job never finishes, as when it fails
+        async def skip_processing(*args):
+            pass
+
+        monkeypatch.setattr(files_endpoints, "start_processing_job", skip_processing)
+
+        response = client.put(
+            f"/api/v1/files/{uploaded_file['id']}/parse-hints",
+            headers=auth_headers,
+            json={"column_dtypes": {"age": "string"}}
+        )
+
+        assert response.status_code == 200
+        assert db.query(FileProfile).filter(FileProfile.file_id == uploaded_file["id"]).first() is None
+
+        response = client.post(
+            f"/api/v1/files/{uploaded_file['id']}/column-stats",
+            headers=auth_headers,
+            json={"columns": ["age"]}
+        )
+        assert response.json()["source"] == "dataframe"
+        assert response.json()["columns"]["age"]["data_type"] == "string"
+
+    def test_update_parse_hints_supersedes_pending_job(
+        self, client: TestClient, auth_headers: dict, uploaded_file: dict, db: Session, monkeypatch
+    ):
+        async def skip_processing(*args):
+            pass
+
+        monkeypatch.setattr(files_endpoints, "start_processing_job", skip_processing)
+
+        for dtype in ("string", "float64"):
+            response = client.put(
+                f"/api/v1/files/{uploaded_file['id']}/parse-hints",
+                headers=auth_headers,
+                json={"column_dtypes": {"age": dtype}}
+            )
+            assert response.status_code == 200
+
+        jobs = db.query(ProcessingJob).filter(ProcessingJob.file_id == uploaded_file["id"]).all()
+        statuses = sorted(job.status for job in jobs)
+        assert statuses == sorted([ProcessingJob.DONE, ProcessingJob.FAILED, ProcessingJob.QUEUED])
+        superseded = next(job for job in jobs if job.status == ProcessingJob.FAILED)
+        assert superseded.error == ProcessingQueue.SUPERSEDED_ERROR
+
+    @pytest.mark.parametrize("overrides,status_code", [
+        ({"encoding": "not-an-encoding"}, 422),
+        ({"delimiter": ";;"}, 422),
+        ({"column_dtypes": {"age": "not-a-dtype"}}, 400)
+    ])
+    def test_update_parse_hints_invalid(
+        self, client: TestClient, auth_headers: dict, uploaded_file: dict, overrides: dict, status_code: int
+    ):
+        response = client.put(
+            f"/api/v1/files/{uploaded_file['id']}/parse-hints",
+            headers=auth_headers,
+            json=overrides
+        )
+
+        assert response.status_code == status_code
+
+    def test_sql_query(
+        self, client: TestClient, auth_headers: dict, test_project: ProjectModel, uploaded_file: dict
+    ):
+        response = client.post(
+            f"/api/v1/projects/{test_project.id}/sql",
+            headers=auth_headers,
+            json={"sql": "SELECT city, COUNT(*) AS n FROM people GROUP BY city ORDER BY n DESC, city"}
+        )
+
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0]["columns"] == ["city", "n"]
+        assert lines[1] == {"city": "Paris", "n": 2}
+        assert lines[-1]["row_count"] == 3
+
+    def test_sql_query_rejects_writes(
+        self, client: TestClient, auth_headers: dict, test_project: ProjectModel, uploaded_file: dict
+    ):
+        response = client.post(
+            f"/api/v1/projects/{test_project.id}/sql",
+            headers=auth_headers,
+            json={"sql": "DELETE FROM people"}
+        )
+
+        assert response.status_code == 400
+
+    def test_sql_tables(
+        self, client: TestClient, auth_headers: dict, test_project: ProjectModel, uploaded_file: dict
+    ):
+        response = client.get(f"/api/v1/projects/{test_project.id}/sql/tables", headers=auth_headers)
+
+        assert response.status_code == 200
+        table = response.json()["tables"][0]
+        assert table["name"] == "people"
+        assert [column["name"] for column in table["columns"]] == ["name", "age", "salary", "city"]
+
+    def test_metadata(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.get(
+            f"/api/v1/files/{uploaded_file['id']}/metadata",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_rows"] == 4
+        assert data["column_types"]["salary"] == "float"
+        assert data["encoding_confidence"] == 1.0
+        assert "is_partial" not in data
+
+    def test_metadata_from_profile(
+        self, client: TestClient, auth_headers: dict, uploaded_file: dict, monkeypatch
+    ):
+        dataset_cache.clear()
+        monkeypatch.setattr(files_endpoints, "load_dataset", lambda *args, **kwargs: pytest.fail("parsed the file"))
+
+        response = client.get(
+            f"/api/v1/files/{uploaded_file['id']}/metadata",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_rows"] == 4
+        assert data["columns"] == ["name", "age", "salary", "city"]
+        assert data["column_types"]["salary"] == "float"
+        assert data["delimiter"] == ","
+        assert data["missing_values_per_column"]["age"] == 1
+        assert data["has_missing_values"] is True
+
+    def test_metadata_of_large_unprocessed_file(
+        self, client: TestClient, auth_headers: dict, uploaded_file: dict, db: Session, monkeypatch
+    ):
+        db.query(FileProfile).filter(FileProfile.file_id == uploaded_file["id"]).delete()
+        db.commit()
+        dataset_cache.clear()
+        monkeypatch.setattr(files_endpoints.DataProcessingService, "MAX_FILE_SIZE", 10)
+
+        response = client.get(
+            f"/api/v1/files/{uploaded_file['id']}/metadata",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 413
+
+    def test_column_stats_from_profile(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.get(
+            f"/api/v1/files/{uploaded_file['id']}/column-stats/city",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["top_values"] == {"Paris": 2, "Lyon": 1, "Nice": 1}
+        assert data["mode"] == "Paris"
+
+    def test_column_stats_without_profile(
+        self, client: TestClient, auth_headers: dict, uploaded_file: dict, db: Session
+    ):
+        db.query(FileProfile).delete()
+        db.commit()
+
+        response = client.get(
+            f"/api/v1/files/{uploaded_file['id']}/column-stats/salary",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["max"] == 70000.0
+
+    def test_column_stats_approximate(
+        self, client: TestClient, auth_headers: dict, uploaded_file: dict, db: Session, storage
+    ):
+        db.query(FileProfile).delete()
+        db.commit()
+        # Without the sample drawn at upload the file is sampled on demand
+        storage.delete_file(storage.get_sidecar_path(uploaded_file['path'], 'sample.parquet'))
+
+        response = client.post(
+            f"/api/v1/files/{uploaded_file['id']}/column-stats?approximate=true",
+            headers=auth_headers,
+            json={"columns": ["salary", "city"]}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["source"] == "sample"
+        assert data["sample_rows"] == 4
+        assert data["confidence_level"] == 0.95
+        # A sample holding every row gives exact values
+        assert data["columns"]["salary"]["confidence_intervals"]["mean"] == [56250.3125, 56250.3125]
+        assert data["columns"]["city"]["top_values"]["Paris"] == 2
+
+        response = client.get(
+            f"/api/v1/files/{uploaded_file['id']}/column-stats/age?approximate=true",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["missing_values"] == 1
+        assert response.json()["confidence_intervals"]["missing_values"] == [1, 1]
+
+    def test_column_stats_unknown_column(self, client: TestClient, auth_headers: dict, uploaded_file: dict):
+        response = client.get(
+            f"/api/v1/files/{uploaded_file['id']}/column-stats/unknown",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 400
+        assert "not found" in response.json()["detail"]
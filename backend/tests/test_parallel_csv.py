@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.services.data_processing import DataProcessingService
+from src.services.parallel_csv import ParallelCSVParser
+from src.services.row_index import RowIndexService
+
+
+class TestParallelCSVParser:
+
+    @pytest.fixture
+    def csv_file(self, tmp_path):
+        rng = np.random.default_rng(0)
+        rows = 3000
+        df = pd.DataFrame({
+            'id': np.arange(rows),
+            'amount': rng.normal(size=rows).round(3),
+            'city': rng.choice(['Paris', 'Lyon', 'Nice'], rows),
+            'note': [f'line one\nline "two" {i}' if i % 7 == 0 else f'note {i}' for i in range(rows)],
+            # Numeric in the first ranges, text in the last one
+            'code': [str(i) for i in range(rows - 10)] + ['X'] * 10
+        })
+        df.loc[::11, 'amount'] = np.nan
+        path = tmp_path / 'data.csv'
+        df.to_csv(path, index=False)
+        return path
+
+    def test_split_ranges(self):
+        index = {'offsets': [10, 100, 200, 300, 400]}
+
+        assert ParallelCSVParser.split_ranges(index, 2) == [(10, 300), (300, None)]
+        assert ParallelCSVParser.split_ranges(index, 10) == [
+            (10, 100), (100, 200), (200, 300), (300, 400), (400, None)
+        ]
+        assert ParallelCSVParser.split_ranges({'offsets': []}, 4) == []
+
+    def test_parse_matches_single_read(self, csv_file, monkeypatch):
+        monkeypatch.setattr(ParallelCSVParser, 'MIN_RANGE_BYTES', 1024)
+        index = RowIndexService.build_index(csv_file, checkpoint_rows=500)
+
+        df, metadata = ParallelCSVParser(workers=3).parse_csv(csv_file, index)
+        expected, expected_metadata = DataProcessingService.parse_csv_file(csv_file)
+
+        assert len(ParallelCSVParser.split_ranges(index, 3)) == 3
+        assert list(df.columns) == list(expected.columns)
+        assert metadata['column_types'] == expected_metadata['column_types']
+        assert df['code'].iloc[0] == '0'
+        assert list(df['city'].cat.categories) == ['Lyon', 'Nice', 'Paris']
+        assert DataProcessingService.serialize_dataframe(df) == DataProcessingService.serialize_dataframe(expected)
@@ -0,0 +1,144 @@
+import os
+import tempfile
+import pytest
+from pathlib import Path
+from sqlalchemy.orm import Session
+
+from src.models import User, Project, File, ProcessingJob
+from src.config import get_settings
+from src.services.parallel_csv import ParallelCSVParser
+from src.services import processing_jobs
+from src.services.processing_jobs import ProcessingQueue, process_csv_file
+from tests.conftest import TestingSessionLocal
+
+
+class TestProcessingJobs:
+
+    @pytest.fixture
+    def csv_file(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write("name,age\n")
+            f.write("John,30\n")
+            f.write("Jane,25\n")
+            temp_path = f.name
+
+        yield Path(temp_path)
+        os.unlink(temp_path)
+        Path(f"{temp_path}.parquet").unlink(missing_ok=True)
+        Path(f"{temp_path}.rowidx.json").unlink(missing_ok=True)
+        Path(f"{temp_path}.sample.parquet").unlink(missing_ok=True)
+
+    @pytest.fixture
+    def job(self, db: Session, csv_file):
+        user = User(username="jobuser", email="job@example.com", password_hash="hash")
+        project = Project(name="Jobs", owner=user)
+        file = File(
+            filename="people.csv", path=str(csv_file), size=csv_file.stat().st_size,
+            project=project, uploader=user
+        )
+        job = ProcessingJob(status=ProcessingJob.QUEUED, file=file)
+        db.add(job)
+        db.commit()
+        return job
+
+    def test_process_csv_file(self, csv_file):
+        result = process_csv_file(
+            str(csv_file), f"{csv_file}.parquet", f"{csv_file}.rowidx.json",
+            sample_path=f"{csv_file}.sample.parquet"
+        )
+
+        assert result['columnar'] is True
+        assert result['profile']['total_rows'] == 2
+        assert result['peak_memory_bytes'] > 0
+        assert Path(f"{csv_file}.rowidx.json").exists()
+        assert Path(f"{csv_file}.sample.parquet").exists()
+
+    def test_process_csv_file_applies_dtype_overrides(self, csv_file, monkeypatch):
+        # Large enough for the parallel parser, which cannot apply overrides
+        monkeypatch.setattr(get_settings(), 'CSV_PARSE_WORKERS', 2)
+        monkeypatch.setattr(ParallelCSVParser, 'MIN_RANGE_BYTES', 1)
+        monkeypatch.setattr(ParallelCSVParser, 'parse_csv', pytest.fail)
+
+        result = process_csv_file(
+            str(csv_file), f"{csv_file}.parquet", f"{csv_file}.rowidx.json",
+            hints={'column_dtypes': {'age': 'float64'}}
+        )
+
+        assert result['parse_hints']['column_dtypes']['age'] == 'float64'
+        assert result['profile']['columns']['age']['data_type'] == 'float64'
+
+    def test_run_inline(self, db: Session, job, csv_file):
+        ProcessingQueue(max_workers=0).run(
+            db, job.id, str(csv_file),
+            f"{csv_file}.parquet", "people.csv.parquet", f"{csv_file}.rowidx.json"
+        )
+
+        db.refresh(job)
+        assert job.status == ProcessingJob.DONE
+        assert job.started_at is not None
+        assert job.file.columnar_path == "people.csv.parquet"
+        assert job.file.profile.profile['columns']['age']['max'] == 30
+
+    def test_run_inline_failure(self, db: Session, job, csv_file):
+        ProcessingQueue(max_workers=0).run(
+            db, job.id, str(csv_file) + ".missing",
+            f"{csv_file}.parquet", "people.csv.parquet", f"{csv_file}.rowidx.json"
+        )
+
+        db.refresh(job)
+        assert job.status == ProcessingJob.FAILED
+        assert job.error
+        assert job.file.profile is None
+
+    def test_superseded_job_discards_results(self, db: Session, job, csv_file, monkeypatch):
+        queue = ProcessingQueue(max_workers=0)
+
+        def process_and_supersede(*args):
+            result = process_csv_file(*args)
+            # New parse hints arrive while the job is running
+            queue.supersede(db, job.file_id)
+            db.commit()
+            return result
+
+        monkeypatch.setattr(processing_jobs, 'process_csv_file', process_and_supersede)
+        queue.run(
+            db, job.id, str(csv_file),
+            f"{csv_file}.parquet", "people.csv.parquet", f"{csv_file}.rowidx.json"
+        )
+
+        db.refresh(job)
+        assert job.status == ProcessingJob.FAILED
+        assert job.error == ProcessingQueue.SUPERSEDED_ERROR
+        assert job.file.profile is None
+        assert job.file.columnar_path is None
+        assert not Path(f"{csv_file}.parquet").exists()
+
+    def test_superseded_job_is_skipped(self, db: Session, job, csv_file, monkeypatch):
+        queue = ProcessingQueue(max_workers=0)
+        queue.supersede(db, job.file_id)
+        db.commit()
+        monkeypatch.setattr(processing_jobs, 'process_csv_file', pytest.fail)
+
+        queue.run(
+            db, job.id, str(csv_file),
+            f"{csv_file}.parquet", "people.csv.parquet", f"{csv_file}.rowidx.json"
+        )
+
+        db.refresh(job)
+        assert job.status == ProcessingJob.FAILED
+        assert job.started_at is None
+
+    def test_submit_to_process_pool(self, db: Session, job, csv_file):
+        queue = ProcessingQueue(max_workers=1, session_factory=TestingSessionLocal)
+        try:
+            queue.submit(
+                job.id, str(csv_file),
+                f"{csv_file}.parquet", "people.csv.parquet", f"{csv_file}.rowidx.json"
+            ).result(timeout=60)
+        finally:
+            queue.shutdown()
+
+        db.expire_all()
+        assert job.status == ProcessingJob.DONE
+        assert job.duration_seconds > 0
+        assert job.file.profile.profile['total_rows'] == 2
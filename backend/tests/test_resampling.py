@@ -0,0 +1,92 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.schemas.query import ResampleQuery
+from src.services.resampling import ResamplingService
+
+
+class TestResamplingService:
+
+    @pytest.fixture
+    def events(self):
+        # Shuffled hourly readings over 10 days, as text like a parsed CSV
+        times = pd.date_range('2024-01-01', periods=240, freq='H')
+        df = pd.DataFrame({
+            'when': times.strftime('%Y-%m-%d %H:%M:%S'),
+            'value': np.arange(240, dtype=float),
+            'label': ['a', 'b'] * 120
+        })
+        return df.sample(frac=1, random_state=0)
+
+    def test_index_by_time_sorts_and_parses(self, events):
+        indexed = ResamplingService.index_by_time(events, 'when')
+
+        assert isinstance(indexed.index, pd.DatetimeIndex)
+        assert indexed.index.is_monotonic_increasing
+        assert indexed.index.name == 'when'
+        assert list(indexed.columns) == ['value', 'label']
+        assert indexed['value'].tolist() == list(range(240))
+
+    def test_index_by_time_drops_invalid_dates(self):
+        df = pd.DataFrame({'when': ['2024-01-02', '2024-01-01', None], 'value': [2, 1, 3]})
+
+        indexed = ResamplingService.index_by_time(df, 'when')
+
+        assert indexed['value'].tolist() == [1, 2]
+
+    @pytest.mark.parametrize("column", ['value', 'label'])
+    def test_index_by_time_rejects_non_dates(self, events, column):
+        with pytest.raises(ValueError, match="not a date column"):
+            ResamplingService.index_by_time(events, column)
+
+    def test_resample_daily_sum(self, events):
+        indexed = ResamplingService.index_by_time(events, 'when')
+        query = ResampleQuery(time_column='when', value_columns=['value'], frequency='day', func='sum')
+
+        result = ResamplingService.resample(indexed, query)
+
+        assert result['buckets'] == 10
+        assert result['source_rows'] == 240
+        assert result['timestamps'][:2] == ['2024-01-01', '2024-01-02']
+        assert result['series'][0]['values'][0] == sum(range(24))
+
+    def test_resample_weeks_start_on_monday(self, events):
+        indexed = ResamplingService.index_by_time(events, 'when')
+        query = ResampleQuery(time_column='when', value_columns=['value', 'label'], frequency='week', func='count')
+
+        result = ResamplingService.resample(indexed, query)
+
+        # 2024-01-01 is a Monday, the last two days fall in the next week
+        assert result['timestamps'] == ['2024-01-01', '2024-01-08']
+        assert result['series'][0]['values'] == [168, 72]
+        assert result['series'][1]['values'] == [168, 72]
+
+    def test_resample_keeps_empty_buckets(self):
+        df = pd.DataFrame({'when': ['2024-01-01', '2024-01-03'], 'value': [1.0, 2.0]})
+        indexed = ResamplingService.index_by_time(df, 'when')
+
+        avg = ResamplingService.resample(indexed, ResampleQuery(time_column='when', value_columns=['value']))
+        total = ResamplingService.resample(
+            indexed, ResampleQuery(time_column='when', value_columns=['value'], func='sum')
+        )
+
+        assert avg['series'][0]['values'] == [1.0, None, 2.0]
+        assert total['series'][0]['values'] == [1.0, 0.0, 2.0]
+
+    def test_resample_rejects_text_values(self, events):
+        indexed = ResamplingService.index_by_time(events, 'when')
+
+        with pytest.raises(ValueError, match="non-numeric"):
+            ResamplingService.resample(
+                indexed, ResampleQuery(time_column='when', value_columns=['label'], func='avg')
+            )
+
+    def test_resample_bounds_buckets(self):
+        df = pd.DataFrame({'when': ['1900-01-01', '2100-01-01'], 'value': [1.0, 2.0]})
+        indexed = ResamplingService.index_by_time(df, 'when')
+
+        with pytest.raises(ValueError, match="coarser frequency"):
+            ResamplingService.resample(
+                indexed, ResampleQuery(time_column='when', value_columns=['value'], frequency='hour')
+            )
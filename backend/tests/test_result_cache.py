@@ -0,0 +1,117 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from src.models import User, Project, File
+from src.services.result_cache import ResultCache, result_cache
+
+
+class TestResultCache:
+
+    def test_miss_then_hit(self):
+        cache = ResultCache(max_bytes=1024)
+
+        assert cache.get('hash', 'aggregate', {'group_by': ['a']}) is None
+        cache.put('hash', 'aggregate', {'group_by': ['a']}, {'data': [1, 2]})
+
+        assert cache.get('hash', 'aggregate', {'group_by': ['a']}) == {'data': [1, 2]}
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+    def test_key_ignores_spec_key_order(self):
+        cache = ResultCache(max_bytes=1024)
+        cache.put('hash', 'aggregate', {'a': 1, 'b': 2}, 'result')
+
+        assert cache.get('hash', 'aggregate', {'b': 2, 'a': 1}) == 'result'
+        assert cache.get('other-hash', 'aggregate', {'a': 1, 'b': 2}) is None
+        assert cache.get('hash', 'query', {'a': 1, 'b': 2}) is None
+
+    def test_key_includes_parse_hints(self):
+        cache = ResultCache(max_bytes=1024)
+        hints = {'encoding': 'utf-8', 'column_dtypes': {'code': 'string'}}
+        cache.put('hash', 'aggregate', {'a': 1}, 'as text', parse_hints=hints)
+
+        assert cache.get('hash', 'aggregate', {'a': 1}, dict(hints)) == 'as text'
+        assert cache.get('hash', 'aggregate', {'a': 1}, {'encoding': 'utf-8', 'column_dtypes': {'code': 'int64'}}) is None
+        assert cache.get('hash', 'aggregate', {'a': 1}) is None
+
+    def test_lru_eviction_by_bytes(self):
+        cache = ResultCache(max_bytes=25)
+
+        cache.put('h1', 'aggregate', {}, 'x' * 8)
+        cache.put('h2', 'aggregate', {}, 'x' * 8)
+        cache.get('h1', 'aggregate', {})
+        cache.put('h3', 'aggregate', {}, 'x' * 8)
+
+        assert cache.get('h2', 'aggregate', {}) is None
+        assert cache.get('h1', 'aggregate', {}) is not None
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_get_or_compute_tracks_savings(self):
+        cache = ResultCache(max_bytes=1024)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {'data': [1, 2, 3]}
+
+        cache.get_or_compute('hash', 'query', {'limit': 10}, compute)
+        cache.get_or_compute('hash', 'query', {'limit': 10}, compute)
+        cache.get_or_compute('hash', 'query', {'limit': 10}, compute)
+
+        stats = cache.get_stats()
+        assert len(calls) == 1
+        assert stats['hit_ratio'] == pytest.approx(2 / 3, abs=1e-4)
+        assert stats['bytes_saved'] == 2 * len('{"data": [1, 2, 3]}')
+        assert stats['compute_seconds_saved'] >= 0
+
+    def test_invalidate_by_content_hash(self):
+        cache = ResultCache(max_bytes=1024)
+        cache.put('h1', 'query', {'limit': 10}, 'a')
+        cache.put('h1', 'aggregate', {'group_by': ['x']}, 'b')
+        cache.put('h2', 'query', {'limit': 10}, 'c')
+
+        cache.invalidate('h1')
+
+        assert cache.get('h1', 'query', {'limit': 10}) is None
+        assert cache.get('h1', 'aggregate', {'group_by': ['x']}) is None
+        assert cache.get('h2', 'query', {'limit': 10}) == 'c'
+        assert cache.get_stats()['invalidations'] == 2
+        assert cache.get_stats()['current_bytes'] == len('"c"')
+
+
+class TestResultCacheInvalidation:
+
+    @pytest.fixture
+    def file(self, db: Session):
+        user = User(username="cacheuser", email="cache@example.com", password_hash="hash")
+        project = Project(name="Cache", owner=user)
+        file = File(
+            filename="data.csv", path="project/data.csv", size=10,
+            content_hash="old-hash", project=project, uploader=user
+        )
+        db.add(file)
+        db.commit()
+        return file
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        result_cache.clear()
+        yield
+        result_cache.clear()
+
+    def test_deleting_file_invalidates_results(self, db: Session, file):
+        result_cache.put('old-hash', 'query', {}, 'result')
+
+        db.delete(file)
+        db.commit()
+
+        assert result_cache.get('old-hash', 'query', {}) is None
+
+    def test_replacing_file_content_invalidates_results(self, db: Session, file):
+        result_cache.put('old-hash', 'query', {}, 'result')
+
+        file.content_hash = 'new-hash'
+        db.commit()
+
+        assert result_cache.get('old-hash', 'query', {}) is None
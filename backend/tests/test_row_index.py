@@ -0,0 +1,64 @@
+import os
+import tempfile
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from src.services.row_index import RowIndexService
+
+
+class TestRowIndexService:
+
+    @pytest.fixture
+    def csv_file(self):
+        df = pd.DataFrame({
+            'id': np.arange(2500),
+            'note': np.tile(['plain', 'with "quotes"', 'multi\nline', 'a,b'], 625)
+        })
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            df.to_csv(f, index=False)
+            temp_path = f.name
+
+        yield Path(temp_path), df
+        os.unlink(temp_path)
+
+    def test_index_skips_quoted_line_breaks(self, csv_file):
+        file_path, df = csv_file
+        index = RowIndexService.build_index(file_path, checkpoint_rows=1000)
+
+        assert index['total_rows'] == 2500
+        assert len(index['offsets']) == 3
+        assert index['columns'] == ['id', 'note']
+
+    @pytest.mark.parametrize('offset', [0, 999, 1000, 2490, 2500])
+    def test_read_rows_matches_full_parse(self, csv_file, offset):
+        file_path, df = csv_file
+        index = RowIndexService.build_index(file_path, checkpoint_rows=1000)
+
+        page = RowIndexService.read_rows(file_path, index, offset, 20)
+
+        expected = df.iloc[offset:offset + 20].reset_index(drop=True)
+        assert page['id'].tolist() == expected['id'].tolist()
+        assert page['note'].tolist() == expected['note'].tolist()
+
+    def test_blank_lines_and_unterminated_last_row(self, tmp_path):
+        file_path = tmp_path / 'rows.csv'
+        file_path.write_bytes(b'name,value\r\n\r\nx,1\r\ny,2\r\nz,3')
+
+        index = RowIndexService.build_index(file_path, checkpoint_rows=2)
+        page = RowIndexService.read_rows(file_path, index, 2, 10)
+
+        assert index['total_rows'] == 3
+        assert page['name'].tolist() == ['z']
+
+    def test_stale_index_is_rebuilt(self, csv_file, tmp_path):
+        file_path, _ = csv_file
+        index_path = tmp_path / 'rows.rowidx.json'
+        RowIndexService.get_or_build_index(file_path, index_path)
+
+        with open(file_path, 'a') as f:
+            f.write("2500,appended\n")
+
+        assert RowIndexService.load_index(index_path, file_path) is None
+        assert RowIndexService.get_or_build_index(file_path, index_path)['total_rows'] == 2501
@@ -0,0 +1,113 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.services.sampling import ReservoirSampler, SamplingService
+
+
+class TestReservoirSampler:
+
+    def test_keeps_everything_below_capacity(self):
+        df = pd.DataFrame({'value': range(50)})
+
+        sampler = ReservoirSampler(100)
+        for start in range(0, 50, 10):
+            sampler.update(df.iloc[start:start + 10])
+
+        sample = sampler.sample()
+        assert sampler.rows_seen == 50
+        assert sample['value'].tolist() == list(range(50))
+        assert sample.index.tolist() == list(range(50))
+
+    def test_sample_is_uniform(self):
+        df = pd.DataFrame({'value': np.arange(100_000)})
+
+        sampler = ReservoirSampler(5000, seed=1)
+        for start in range(0, 100_000, 2500):
+            sampler.update(df.iloc[start:start + 2500])
+
+        sample = sampler.sample()
+        assert len(sample) == 5000
+        assert sample['value'].is_unique
+        assert (sample.index == sample['value']).all()
+        # Every tenth of the stream is equally represented
+        counts = np.bincount(sample['value'] // 10_000)
+        assert counts.min() > 400 and counts.max() < 600
+
+    def test_consume_passes_chunks_through(self):
+        chunks = [pd.DataFrame({'value': range(i, i + 10)}) for i in range(0, 30, 10)]
+        sampler = ReservoirSampler(5)
+
+        assert sum(len(chunk) for chunk in sampler.consume(chunks)) == 30
+        assert sampler.rows_seen == 30
+        assert len(sampler.sample()) == 5
+
+
+class TestApproximateStatistics:
+
+    @pytest.fixture
+    def population(self):
+        rng = np.random.default_rng(0)
+        rows = 200_000
+        return pd.DataFrame({
+            'amount': rng.normal(100, 15, rows),
+            'category': rng.choice(['a', 'b', 'c'], rows, p=[0.5, 0.3, 0.2]),
+            'score': np.where(rng.random(rows) < 0.1, np.nan, rng.random(rows))
+        })
+
+    def test_intervals_cover_true_values(self, population):
+        sample = population.sample(5000, random_state=0)
+        profile = SamplingService.approximate_statistics(sample, len(population))
+
+        assert profile['approximate'] is True
+        assert profile['sample_rows'] == 5000
+        assert profile['total_rows'] == len(population)
+
+        amount = profile['columns']['amount']
+        low, high = amount['confidence_intervals']['mean']
+        assert low < population['amount'].mean() < high
+        low, high = amount['confidence_intervals']['median']
+        assert low <= population['amount'].median() <= high
+        assert 'histogram' not in amount
+
+        score = profile['columns']['score']
+        low, high = score['confidence_intervals']['missing_values']
+        assert low <= population['score'].isna().sum() <= high
+
+        category = profile['columns']['category']
+        low, high = category['confidence_intervals']['top_values']['a']
+        assert low <= (population['category'] == 'a').sum() <= high
+        assert category['unique_values'] == 3
+
+    def test_full_sample_is_exact(self, population):
+        head = population.head(1000)
+        profile = SamplingService.approximate_statistics(head, len(head), ['amount', 'score'])
+
+        amount = profile['columns']['amount']
+        assert amount['confidence_intervals']['mean'] == [amount['mean'], amount['mean']]
+        assert amount['unique_values'] == 1000
+        assert profile['columns']['score']['missing_values'] == head['score'].isna().sum()
+
+    def test_unknown_column(self, population):
+        with pytest.raises(ValueError, match="not found"):
+            SamplingService.approximate_statistics(population.head(10), 10, ['unknown'])
+
+    def test_sample_csv_roundtrip(self, population, tmp_path):
+        csv_path = tmp_path / 'data.csv'
+        population.head(20_000).to_csv(csv_path, index=False)
+
+        sample, rows = SamplingService.sample_csv(csv_path, size=1000)
+        assert rows == 20_000
+        assert len(sample) == 1000
+
+        sample_path = tmp_path / 'data.csv.sample.parquet'
+        assert SamplingService.write_sample(sample, rows, csv_path, sample_path) is True
+        cached, cached_rows = SamplingService.read_sample(sample_path, csv_path, ['amount'])
+        assert cached_rows == 20_000
+        assert list(cached.columns) == ['amount']
+        assert cached.index.tolist() == sample.index.tolist()
+
+        # A changed source makes the cached sample stale
+        with open(csv_path, 'a') as file:
+            file.write("1.0,a,0.5\n")
+        assert SamplingService.read_sample(sample_path, csv_path) is None
@@ -0,0 +1,75 @@
+import json
+import duckdb
+import pytest
+import pandas as pd
+
+from src.services.data_processing import DataProcessingService
+from src.services.sql_engine import SQLQueryService
+
+
+def run(datasets, sql, max_rows=100, timeout_seconds=10):
+    connection = SQLQueryService.connect(datasets, '256MB')
+    return [json.loads(line) for line in SQLQueryService.execute(connection, sql, max_rows, timeout_seconds)]
+
+
+class TestSQLQueryService:
+
+    @pytest.fixture
+    def datasets(self, tmp_path):
+        people = tmp_path / 'people.csv'
+        people.write_text("id;name\n1;John\n2;Jane\n3;Bob\n")
+
+        orders = tmp_path / 'orders.csv'
+        pd.DataFrame({'person_id': [1, 1, 2], 'amount': [10.5, 20.0, 7.25]}).to_csv(orders, index=False)
+        df, metadata = DataProcessingService.parse_csv_file(orders)
+        sidecar = tmp_path / 'orders.csv.parquet'
+        DataProcessingService.write_columnar_sidecar(df, metadata, orders, sidecar)
+
+        return {
+            'people': SQLQueryService.open_dataset(people),
+            'orders': SQLQueryService.open_dataset(orders, sidecar)
+        }
+
+    def test_view_name(self):
+        assert SQLQueryService.view_name('Sales 2024.csv', []) == 'sales_2024'
+        assert SQLQueryService.view_name('2024.csv', []) == 't_2024'
+        assert SQLQueryService.view_name('sales.csv', ['sales']) == 'sales_2'
+
+    def test_join_across_files(self, datasets):
+        lines = run(datasets, """
+            SELECT name, SUM(amount) AS total
+            FROM people JOIN orders ON people.id = orders.person_id
+            GROUP BY name ORDER BY name
+        """)
+
+        assert lines[0]['columns'] == ['name', 'total']
+        assert lines[1:3] == [{'name': 'Jane', 'total': 7.25}, {'name': 'John', 'total': 30.5}]
+        assert lines[-1]['row_count'] == 2
+        assert lines[-1]['truncated'] is False
+
+    def test_row_limit(self, datasets):
+        lines = run(datasets, "SELECT * FROM range(10000)", max_rows=5)
+
+        assert len(lines) == 7
+        assert lines[-1]['truncated'] is True
+
+    def test_timeout(self, datasets):
+        with pytest.raises(duckdb.InterruptException):
+            run(
+                datasets,
+                "SELECT SUM(a.range * b.range) FROM range(1000000) a, range(1000000) b",
+                timeout_seconds=0.2
+            )
+
+    @pytest.mark.parametrize('sql', [
+        "CREATE TABLE t AS SELECT 1",
+        "SELECT 1; DROP TABLE people",
+        "SELEC 1"
+    ])
+    def test_validate_sql_rejects(self, sql):
+        with pytest.raises(ValueError):
+            SQLQueryService.validate_sql(sql)
+
+    def test_file_system_access_is_disabled(self, datasets, tmp_path):
+        with pytest.raises(Exception, match="disabled"):
+            run(datasets, f"SELECT * FROM read_csv_auto('{tmp_path / 'people.csv'}')")
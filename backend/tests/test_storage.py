@@ -5,6 +5,7 @@ from pathlib import Path
 from fastapi import UploadFile
 import io
 import asyncio
+import hashlib
 
 from src.storage.local import LocalFileStorage
 
@@ -118,4 +119,25 @@ class TestLocalFileStorage:
         full_path = storage.get_full_path(file_path)
         
         assert full_path == storage.base_path / file_path
-        assert isinstance(full_path, Path)
\ No newline at end of file
+        assert isinstance(full_path, Path)
+
+    def test_get_content_hash(self, storage):
+        file_path = "project/file.csv"
+        full_path = storage.get_full_path(file_path)
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_bytes(b"name,age\nJohn,30\n")
+        
+        content_hash = storage.get_content_hash(file_path)
+        
+        assert content_hash == hashlib.sha256(b"name,age\nJohn,30\n").hexdigest()
+
+    def test_get_sidecar_path(self, storage):
+        sidecar_path = storage.get_sidecar_path("project/file.csv", "rowidx.json")
+
+        assert sidecar_path == str(Path("project") / storage.SIDECAR_DIRECTORY / "file.csv.rowidx.json")
+        assert storage.get_full_path(sidecar_path).parent.is_dir()
+
+    def test_generate_file_path_strips_directories(self, storage):
+        file_path = storage._generate_file_path("test-project-123", f"{storage.SIDECAR_DIRECTORY}/data.csv")
+
+        assert file_path == storage.base_path / "test-project-123" / "data.csv"
@@ -51,6 +51,7 @@ interface FilePreviewMetadata {
   column_types: Record<string, string>;
   has_missing_values: boolean;
   missing_values_per_column: Record<string, number>;
+  is_partial?: boolean;
 }
 
 export function DataPreview({ fileId, onClose }: DataPreviewProps) {
@@ -73,6 +74,9 @@ export function DataPreview({ fileId, onClose }: DataPreviewProps) {
       const response = await filesService.getFilePreview(fileId);
       setPreview(response.preview);
       setMetadata(response.metadata);
+      if (response.metadata.is_partial) {
+        loadFullMetadata();
+      }
     } catch (err) {
       setError('Failed to load file preview');
       console.error(err);
@@ -81,6 +85,15 @@ export function DataPreview({ fileId, onClose }: DataPreviewProps) {
     }
   };
 
+  const loadFullMetadata = async () => {
+    try {
+      const fullMetadata = await filesService.getFileMetadata(fileId);
+      setMetadata(fullMetadata);
+    } catch (err) {
+      console.error('Failed to load file metadata:', err);
+    }
+  };
+
   const loadColumnStats = async (column: string) => {
     try {
       setLoadingStats(true);
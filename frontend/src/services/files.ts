@@ -1,5 +1,5 @@
 import api from './api';
-import type { FileMetadata, FilePreviewResponse, ColumnStatistics } from '../types/file';
+import type { FileMetadata, FilePreviewResponse, DatasetMetadata, ColumnStatistics } from '../types/file';
 
 export const filesService = {
   async uploadFile(file: File, projectId: number): Promise<FileMetadata> {
@@ -65,6 +65,11 @@ export const filesService = {
     return response.data;
   },
 
+  async getFileMetadata(fileId: number): Promise<DatasetMetadata> {
+    const response = await api.get<DatasetMetadata>(`/files/${fileId}/metadata`);
+    return response.data;
+  },
+
   async getColumnStatistics(fileId: number, columnName: string): Promise<ColumnStatistics> {
     const response = await api.get<ColumnStatistics>(
       `/files/${fileId}/column-stats/${columnName}`
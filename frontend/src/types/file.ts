@@ -7,6 +7,19 @@ export interface FileMetadata {
   project_id: number;
 }
 
+export interface DatasetMetadata {
+  total_rows: number;
+  total_columns: number;
+  file_size_bytes: number;
+  encoding: string;
+  delimiter: string;
+  columns: string[];
+  column_types: Record<string, string>;
+  has_missing_values: boolean;
+  missing_values_per_column: Record<string, number>;
+  is_partial?: boolean;
+}
+
 export interface FilePreviewResponse {
   preview: {
     data: Record<string, any>[];
@@ -14,17 +27,7 @@ export interface FilePreviewResponse {
     preview_rows: number;
     total_rows: number;
   };
-  metadata: {
-    total_rows: number;
-    total_columns: number;
-    file_size_bytes: number;
-    encoding: string;
-    delimiter: string;
-    columns: string[];
-    column_types: Record<string, string>;
-    has_missing_values: boolean;
-    missing_values_per_column: Record<string, number>;
-  };
+  metadata: DatasetMetadata;
 }
 
 export interface ColumnStatistics {